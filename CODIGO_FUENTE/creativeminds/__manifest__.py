@@ -18,11 +18,32 @@
     ],
     'data': [ 
         'security/ir.model.access.csv',  # SIEMPRE primero la seguridad
+        'data/metricas_data.xml',        # Tareas programadas de la instantánea de métricas
+        'data/recordatorios_data.xml',   # Tarea programada de la cola de recordatorios
+        'data/notificaciones_data.xml',  # Ventana y tarea programada de los resúmenes de notificaciones
+        'data/capacidad_data.xml',       # Parámetros y tarea programada de la carga semanal
+        'data/riesgos_data.xml',         # Parámetro y tarea programada del escáner de vencimientos
+        'data/historico_kpi_data.xml',   # Retención y purga del histórico de indicadores
+        'data/busqueda_data.xml',        # Indexación inicial de la búsqueda de texto
+        'data/previsiones_data.xml',     # Tarea programada de las previsiones presupuestarias
+        'data/informes_data.xml',        # Caché y tarea programada de los informes PDF
+        'data/perfilado_data.xml',       # Parámetros del perfilado de métodos (desactivado por defecto)
         'views/views.xml',               # Principal vista consolidada
+        'views/riesgos_views.xml',       # Lista de vencimientos
+        'views/perfilado_views.xml',     # Informe y muestras de rendimiento
+        'views/busqueda_views.xml',      # Búsqueda de texto en proyectos, ideas y retroalimentación
+        'views/informes_views.xml',      # Cola de informes de métricas generados
+        'wizard/exportacion_wizard_views.xml',  # Asistente de exportación de la cartera
+        'wizard/importacion_wizard_views.xml',  # Asistente de importación masiva de tareas y recursos
         'views/templates.xml',           # Vistas para renderizado web
         'reports/reports.xml',           # Informes PDF o QWeb
     ],
-    'assets': {},
+    'assets': {
+        'web.assets_backend': [
+            'creativeminds/static/src/js/proyecto_kanban.js',   # Cabecera de columna del kanban de proyectos
+            'creativeminds/static/src/xml/proyecto_kanban.xml',
+        ],
+    },
     'installable': True,
     'application': True,
     'auto_install': False,
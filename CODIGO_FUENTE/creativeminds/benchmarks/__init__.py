@@ -0,0 +1,2 @@
+# Benchmarks de CreativeMinds.
+# No se importan al cargar el módulo: se ejecutan a mano desde un shell de Odoo (ver comun.py).
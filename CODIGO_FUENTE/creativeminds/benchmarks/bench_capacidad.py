@@ -0,0 +1,55 @@
+# Benchmark del motor de capacidad.
+#
+# Siembra una cartera de 100k tareas (5k empleados), asigna cada recurso a un empleado, reconstruye la tabla de
+# carga semanal y mide la búsqueda "quién tiene N horas libres entre dos fechas" y la actualización incremental
+# de la carga al cambiar las fechas de una tarea.
+#
+#     >>> from odoo.addons.creativeminds.benchmarks import bench_capacidad
+#     >>> bench_capacidad.ejecutar(env)
+from datetime import timedelta
+
+from odoo import fields
+
+from . import comun
+
+
+def ejecutar(env, n_tareas=100000, horas=40):
+    Carga = env['creativeminds.carga.semanal']
+    relacion = env['creativeminds.recurso']._fields['empleado_id']
+    try:
+        datos = comun.sembrar_cartera(env, n_tareas)
+        env.cr.execute(f"""
+            INSERT INTO {relacion.relation} ({relacion.column1}, {relacion.column2})
+            SELECT r.id, (%(empleados)s::int[])[1 + r.id %% cardinality(%(empleados)s::int[])]
+              FROM creativeminds_recurso r
+             WHERE r.proyecto_id = ANY(%(proyectos)s)
+        """, {'empleados': datos['empleados'], 'proyectos': datos['proyectos']})
+
+        with comun.medir(env) as reconstruccion:
+            Carga._recalcular_empleados()
+        env.cr.execute("SELECT COUNT(*) FROM creativeminds_carga_semanal")
+        filas = env.cr.fetchone()[0]
+
+        desde = fields.Date.today()
+        hasta = desde + timedelta(days=27)
+        with comun.medir(env) as busqueda:
+            disponibles = Carga.buscar_disponibles(horas, desde, hasta)
+
+        tarea = env['creativeminds.tarea'].search([('proyecto_id', 'in', datos['proyectos']), ('fecha_fin', '!=', False)], limit=1)
+        with comun.medir(env) as incremental:
+            tarea.write({'fecha_fin': tarea.fecha_fin + timedelta(days=7)})
+    finally:
+        comun.deshacer(env)
+
+    print(f"Empleados: {len(datos['empleados'])}, filas de carga: {filas}")
+    print(f"Reconstrucción completa   {reconstruccion['segundos']:>8.3f} s {reconstruccion['consultas']:>4} consultas")
+    print(f"Búsqueda de {horas} h libres   {busqueda['segundos'] * 1000:>8.2f} ms {busqueda['consultas']:>4} consultas "
+          f"({len(disponibles)} empleados)")
+    print(f"Cambio de una tarea       {incremental['segundos'] * 1000:>8.2f} ms {incremental['consultas']:>4} consultas")
+    return {
+        'filas': filas,
+        'reconstruccion': reconstruccion,
+        'busqueda': busqueda,
+        'incremental': incremental,
+        'disponibles': len(disponibles),
+    }
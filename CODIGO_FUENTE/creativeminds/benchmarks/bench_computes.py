@@ -0,0 +1,42 @@
+# Benchmark de los cálculos almacenados de progreso y costes de Proyecto.
+#
+# Siembra 10k proyectos (10 tareas por proyecto), fuerza el recálculo de porcentaje_progreso de todos ellos en
+# un único lote y muestra el tiempo y el número de consultas. Después comprueba con SQL que cada valor
+# almacenado coincide con el porcentaje de tareas completadas.
+#
+#     >>> from odoo.addons.creativeminds.benchmarks import bench_computes
+#     >>> bench_computes.ejecutar(env)
+from . import comun
+
+
+def ejecutar(env, n_proyectos=10000, tareas_por_proyecto=10):
+    Proyecto = env['creativeminds.proyecto']
+    try:
+        datos = comun.sembrar_cartera(env, n_proyectos * tareas_por_proyecto, tareas_por_proyecto=tareas_por_proyecto)
+        proyectos = Proyecto.browse(datos['proyectos'])
+
+        resultados = {}
+        for campo in ('porcentaje_progreso', 'costo_total_recursos', 'costo_total'):
+            with comun.medir(env) as medida:
+                env.add_to_compute(Proyecto._fields[campo], proyectos)
+                proyectos.flush_recordset([campo])
+            resultados[campo] = medida
+
+        env.cr.execute("""
+            SELECT COUNT(*)
+              FROM creativeminds_proyecto p
+              JOIN (SELECT proyecto_id,
+                           100.0 * COUNT(*) FILTER (WHERE estado = 'completada') / COUNT(*) AS progreso
+                      FROM creativeminds_tarea
+                  GROUP BY proyecto_id) t ON t.proyecto_id = p.id
+             WHERE p.id = ANY(%s) AND abs(p.porcentaje_progreso - t.progreso) > 1e-6
+        """, [datos['proyectos']])
+        incorrectos = env.cr.fetchone()[0]
+    finally:
+        comun.deshacer(env)
+
+    print(f"Proyectos recalculados: {len(datos['proyectos'])}")
+    for campo, medida in resultados.items():
+        print(f"  {campo:<22} {medida['segundos']:>8.3f} s {medida['consultas']:>6} consultas")
+    print(f"Progresos incorrectos: {incorrectos}")
+    return {'proyectos': len(datos['proyectos']), 'campos': resultados, 'incorrectos': incorrectos}
@@ -0,0 +1,89 @@
+# Benchmark de Proyecto.obtener_metricas.
+#
+# Siembra carteras de 1k, 10k y 100k tareas, comprueba que el cálculo agregado en base de datos devuelve el mismo
+# diccionario que la implementación original (metricas_orm) y muestra la mejora en tiempo y consultas.
+#
+#     >>> from odoo.addons.creativeminds.benchmarks import bench_metricas
+#     >>> bench_metricas.ejecutar(env)
+from odoo import fields
+
+from . import comun
+
+TAMANOS = (1000, 10000, 100000)
+
+
+# Implementación original de Proyecto.obtener_metricas, recorriendo los registros en Python.
+# Es la referencia con la que se comprueba que el cálculo agregado devuelve lo mismo.
+def metricas_orm(env):
+    proyectos = env['creativeminds.proyecto'].search([])  # Obtener todos los proyectos
+    tareas = env['creativeminds.tarea'].search([])  # Obtener todas las tareas
+    empleados = env['creativeminds.empleado'].search([])  # Obtener todos los empleados
+
+    # Métricas de proyectos
+    total_proyectos = len(proyectos)
+    proyectos_en_progreso = len(proyectos.filtered(lambda p: p.estado == 'en_progreso'))
+    proyectos_finalizados = len(proyectos.filtered(lambda p: p.estado == 'finalizado'))
+    proyectos_retrasados = len(proyectos.filtered(lambda p: p.fecha_fin and p.fecha_fin < fields.Date.today() and p.estado != 'finalizado'))
+
+    # Métricas de progreso
+    progreso_promedio = sum(proyecto.porcentaje_progreso for proyecto in proyectos) / total_proyectos if total_proyectos > 0 else 0
+
+    # Cálculo de presupuestos
+    presupuesto_total = sum(proyecto.presupuesto_estimado for proyecto in proyectos)
+    costo_actual_total = sum(proyecto.costo_total_recursos for proyecto in proyectos)
+    eficiencia_presupuestaria = (costo_actual_total / presupuesto_total * 100) if presupuesto_total > 0 else 0
+
+    # Métricas de tareas
+    total_tareas = len(tareas)
+    tareas_completadas = len(tareas.filtered(lambda t: t.estado == 'completada'))
+    tareas_pendientes = len(tareas.filtered(lambda t: t.estado == 'pendiente'))
+
+    # Métricas de empleados disponibles
+    empleados_disponibles = len(empleados.filtered(lambda e: e.disponibilidad == 'disponible'))
+
+    return {
+        'total_proyectos': total_proyectos,
+        'proyectos_en_progreso': proyectos_en_progreso,
+        'proyectos_finalizados': proyectos_finalizados,
+        'proyectos_retrasados': proyectos_retrasados,
+        'progreso_promedio': progreso_promedio,
+        'presupuesto_total': presupuesto_total,
+        'costo_actual_total': costo_actual_total,
+        'eficiencia_presupuestaria': eficiencia_presupuestaria,
+        'total_tareas': total_tareas,
+        'tareas_completadas': tareas_completadas,
+        'tareas_pendientes': tareas_pendientes,
+        'empleados_disponibles': empleados_disponibles,
+    }
+
+
+def ejecutar(env, tamanos=TAMANOS):
+    resultados = []
+    Proyecto = env['creativeminds.proyecto']
+    try:
+        for tamano in tamanos:
+            comun.sembrar_cartera(env, tamano)
+
+            with comun.medir(env) as original:
+                esperado = metricas_orm(env)
+            with comun.medir(env) as agregado:
+                obtenido = Proyecto.obtener_metricas()
+
+            errores = comun.diferencias(esperado, obtenido)
+            resultados.append({
+                'tamano': tamano,
+                'original': original,
+                'agregado': agregado,
+                'aceleracion': original['segundos'] / agregado['segundos'] if agregado['segundos'] else None,
+                'errores': errores,
+            })
+            comun.deshacer(env)
+    finally:
+        comun.deshacer(env)
+
+    print(f"{'tareas':>8} {'original (s)':>13} {'consultas':>9} {'agregado (s)':>13} {'consultas':>9} {'x':>7}  resultado")
+    for r in resultados:
+        print(f"{r['tamano']:>8} {r['original']['segundos']:>13.3f} {r['original']['consultas']:>9} "
+              f"{r['agregado']['segundos']:>13.3f} {r['agregado']['consultas']:>9} {r['aceleracion'] or 0:>7.1f}  "
+              f"{'OK' if not r['errores'] else '; '.join(r['errores'])}")
+    return resultados
@@ -0,0 +1,55 @@
+# Benchmark del motor de planificación (ruta crítica).
+#
+# Siembra un proyecto de 10k tareas en el que cada tarea depende de la anterior y de la que está 7 posiciones
+# atrás, y mide la planificación en frío (cálculo y guardado en caché), en caliente (lectura de la caché) y
+# tras cambiar la fecha de una tarea (invalidación y recálculo). Comprueba también que la duración calculada
+# coincide con la de una pasada independiente sobre la cadena.
+#
+#     >>> from odoo.addons.creativeminds.benchmarks import bench_planificacion
+#     >>> bench_planificacion.ejecutar(env)
+from datetime import timedelta
+
+from . import comun
+
+
+def ejecutar(env, n_tareas=10000):
+    try:
+        datos = comun.sembrar_cartera(env, n_tareas, tareas_por_proyecto=n_tareas)
+        proyecto = env['creativeminds.proyecto'].browse(datos['proyectos'][0])
+        env.cr.execute("""
+            INSERT INTO creativeminds_tarea_dependencia (tarea_id, predecesora_id, proyecto_id, desfase,
+                                                         create_uid, create_date, write_uid, write_date)
+            SELECT t.id, p.id, t.proyecto_id, 0, %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM (SELECT id, proyecto_id, ROW_NUMBER() OVER (ORDER BY id) AS n FROM creativeminds_tarea WHERE proyecto_id = %(proyecto)s) t
+              JOIN (SELECT id, ROW_NUMBER() OVER (ORDER BY id) AS n FROM creativeminds_tarea WHERE proyecto_id = %(proyecto)s) p
+                ON p.n IN (t.n - 1, t.n - 7)
+        """, {'uid': env.uid, 'proyecto': proyecto.id})
+        n_dependencias = env.cr.rowcount
+
+        with comun.medir(env) as frio:
+            planificacion = proyecto.obtener_planificacion()[proyecto.id]
+        with comun.medir(env) as caliente:
+            proyecto.obtener_planificacion()
+        tarea = env['creativeminds.tarea'].search([('proyecto_id', '=', proyecto.id)], limit=1)
+        tarea.fecha_fin = tarea.fecha_fin + timedelta(days=3)
+        with comun.medir(env) as tras_cambio:
+            replanificacion = proyecto.obtener_planificacion()[proyecto.id]
+
+        # Referencia: en la cadena i-1 todas las tareas van en serie, así que la duración es la suma de duraciones
+        env.cr.execute("""
+            SELECT SUM(GREATEST(COALESCE(fecha_fin - fecha_inicio + 1, 1), 1)) FROM creativeminds_tarea WHERE proyecto_id = %s
+        """, [proyecto.id])
+        esperada = env.cr.fetchone()[0]
+    finally:
+        comun.deshacer(env)
+
+    print(f"Tareas: {n_tareas}, dependencias: {n_dependencias}, críticas: {len(replanificacion['criticas'])}")
+    for nombre, medida in (('En frío', frio), ('En caliente', caliente), ('Tras cambiar una fecha', tras_cambio)):
+        print(f"  {nombre:<24} {medida['segundos'] * 1000:>9.2f} ms {medida['consultas']:>4} consultas")
+    print(f"Duración {replanificacion['duracion']} días (esperada {esperada}); antes del cambio {planificacion['duracion']}")
+    return {
+        'frio': frio,
+        'caliente': caliente,
+        'tras_cambio': tras_cambio,
+        'correcta': replanificacion['duracion'] == esperada,
+    }
@@ -0,0 +1,77 @@
+# Prueba de carga del panel JSON (/creativeminds/dashboard) contra una instancia local de Odoo.
+#
+# A diferencia del resto de benchmarks no se ejecuta en el shell de Odoo sino como script independiente:
+#
+#     python carga_dashboard.py --url http://localhost:8069 --db <base_de_datos> --login admin --password admin \
+#         --hilos 8 --peticiones 50
+#
+# Cada hilo abre su propia sesión y hace 'peticiones' llamadas; a partir de la segunda envía el ETag recibido,
+# así que mide tanto las respuestas completas (200) como las revalidaciones (304).
+import argparse
+import statistics
+import threading
+import time
+
+import requests
+
+
+def _sesion(url, db, login, password):
+    sesion = requests.Session()
+    respuesta = sesion.post(f"{url}/web/session/authenticate", json={
+        'jsonrpc': '2.0', 'method': 'call', 'params': {'db': db, 'login': login, 'password': password},
+    })
+    respuesta.raise_for_status()
+    if respuesta.json().get('error'):
+        raise RuntimeError(f"No se ha podido iniciar sesión: {respuesta.json()['error']}")
+    return sesion
+
+
+def _trabajador(args, resultados, bloqueo):
+    sesion = _sesion(args.url, args.db, args.login, args.password)
+    etag = None
+    for _i in range(args.peticiones):
+        cabeceras = {'If-None-Match': etag} if etag and not args.sin_cache else {}
+        inicio = time.perf_counter()
+        respuesta = sesion.get(f"{args.url}/creativeminds/dashboard", params={'limite': args.limite}, headers=cabeceras)
+        duracion = time.perf_counter() - inicio
+        etag = respuesta.headers.get('ETag', etag)
+        with bloqueo:
+            resultados.append((respuesta.status_code, duracion, len(respuesta.content)))
+
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(round(p / 100 * (len(valores) - 1))))] if valores else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del panel JSON de CreativeMinds")
+    parser.add_argument('--url', default='http://localhost:8069')
+    parser.add_argument('--db', required=True)
+    parser.add_argument('--login', default='admin')
+    parser.add_argument('--password', default='admin')
+    parser.add_argument('--hilos', type=int, default=4)
+    parser.add_argument('--peticiones', type=int, default=25, help="peticiones por hilo")
+    parser.add_argument('--limite', type=int, default=100, help="proyectos por página")
+    parser.add_argument('--sin-cache', action='store_true', help="no enviar If-None-Match")
+    args = parser.parse_args()
+
+    resultados, bloqueo = [], threading.Lock()
+    hilos = [threading.Thread(target=_trabajador, args=(args, resultados, bloqueo)) for _i in range(args.hilos)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    total = time.perf_counter() - inicio
+
+    print(f"{len(resultados)} peticiones en {total:.2f} s ({len(resultados) / total:.1f} peticiones/s)")
+    for estado in sorted({estado for estado, _d, _b in resultados}):
+        duraciones = [d * 1000 for e, d, _b in resultados if e == estado]
+        tamano = statistics.mean(b for e, _d, b in resultados if e == estado)
+        print(f"  HTTP {estado}: {len(duraciones):>5}  p50 {_percentil(duraciones, 50):8.1f} ms  "
+              f"p95 {_percentil(duraciones, 95):8.1f} ms  {tamano:,.0f} bytes de media")
+
+
+if __name__ == '__main__':
+    main()
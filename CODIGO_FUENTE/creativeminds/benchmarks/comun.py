@@ -0,0 +1,241 @@
+# Utilidades compartidas por los benchmarks de CreativeMinds.
+#
+# Los benchmarks se lanzan desde un shell de Odoo sobre una base de datos con el módulo instalado:
+#
+#     odoo-bin shell -d <base_de_datos> --addons-path=<ruta_addons>
+#     >>> from odoo.addons.creativeminds.benchmarks import bench_metricas
+#     >>> bench_metricas.ejecutar(env)
+#
+# Los datos se siembran directamente con SQL (generate_series) para poder llegar a cientos de miles de
+# filas en pocos segundos, y cada benchmark deshace la transacción al terminar: la base de datos queda
+# exactamente como estaba.
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_logger = logging.getLogger(__name__)
+
+ESTADOS_PROYECTO = ['planificacion', 'en_progreso', 'finalizado', 'detenido']
+ESTADOS_TAREA = ['pendiente', 'en_progreso', 'completada']
+PRIORIDADES = ['baja', 'media', 'alta']
+DISPONIBILIDADES = ['disponible', 'asignado', 'parcial', 'no_disponible']
+
+
+# Siembra una cartera sintética de n_tareas tareas repartidas en proyectos, con sus empleados y recursos.
+# Los valores se derivan del índice de cada fila, así que dos ejecuciones con el mismo tamaño generan los mismos datos.
+def sembrar_cartera(env, n_tareas, tareas_por_proyecto=10, tareas_por_empleado=20, recursos_por_proyecto=2):
+    env.flush_all()
+    cr = env.cr
+    n_proyectos = max(1, n_tareas // tareas_por_proyecto)
+    n_empleados = max(1, n_tareas // tareas_por_empleado)
+    parametros = {
+        'uid': env.uid,
+        'partner': env['res.partner'].create({'name': 'Benchmark CreativeMinds'}).id,
+        'estados_proyecto': ESTADOS_PROYECTO,
+        'estados_tarea': ESTADOS_TAREA,
+        'prioridades': PRIORIDADES,
+        'disponibilidades': DISPONIBILIDADES,
+    }
+
+    # Empleados (el DNI se genera a partir del índice para respetar la restricción de unicidad)
+    cr.execute("""
+        INSERT INTO creativeminds_empleado (partner_id, name, dni, disponibilidad, fecha_incorporacion,
+                                            create_uid, create_date, write_uid, write_date)
+        SELECT %(partner)s, 'Empleado benchmark ' || i, lpad((50000000 + i)::text, 8, '0') || 'B',
+               (%(disponibilidades)s::varchar[])[1 + i %% 4], CURRENT_DATE,
+               %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+          FROM generate_series(1, %(n)s) AS i
+        ON CONFLICT (dni) DO NOTHING
+        RETURNING id
+    """, dict(parametros, n=n_empleados))
+    empleados = [fila[0] for fila in cr.fetchall()]
+
+    # Proyectos (una parte con fecha de fin en el pasado para que existan proyectos retrasados)
+    cr.execute("""
+        INSERT INTO creativeminds_proyecto (nombre, estado, prioridad, fecha_inicio, fecha_fin, responsable_id,
+                                            presupuesto_estimado, costo_total_recursos, porcentaje_progreso,
+                                            costo_por_hora, horas_asignadas, costo_total,
+                                            create_uid, create_date, write_uid, write_date)
+        SELECT 'Proyecto benchmark ' || i,
+               (%(estados_proyecto)s::varchar[])[1 + i %% 4],
+               (%(prioridades)s::varchar[])[1 + i %% 3],
+               CURRENT_DATE - (i %% 400), CURRENT_DATE - (i %% 400) + 30 + (i %% 365),
+               (%(empleados)s::int[])[1 + i %% cardinality(%(empleados)s::int[])],
+               100000 + (i %% 50) * 1000, (i %% 37) * 250.5, (i %% 101)::float,
+               20 + i %% 30, 10 * (1 + i %% 20), (20 + i %% 30) * 10 * (1 + i %% 20),
+               %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+          FROM generate_series(1, %(n)s) AS i
+        RETURNING id
+    """, dict(parametros, n=n_proyectos, empleados=empleados))
+    proyectos = [fila[0] for fila in cr.fetchall()]
+
+    # Tareas, con fechas dentro de la ventana de su proyecto
+    cr.execute("""
+        INSERT INTO creativeminds_tarea (proyecto_id, nombre, estado, responsable_id, fecha_inicio, fecha_fin,
+                                         create_uid, create_date, write_uid, write_date)
+        SELECT p.id, 'Tarea benchmark ' || s.i,
+               (%(estados_tarea)s::varchar[])[1 + s.i %% 3],
+               (%(empleados)s::int[])[1 + s.i %% cardinality(%(empleados)s::int[])],
+               p.fecha_inicio + (s.i %% 10), p.fecha_inicio + (s.i %% 10) + 5,
+               %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+          FROM generate_series(0, %(n)s - 1) AS s(i)
+          JOIN creativeminds_proyecto p
+            ON p.id = (%(proyectos)s::int[])[1 + (s.i / %(por_proyecto)s) %% cardinality(%(proyectos)s::int[])]
+    """, dict(parametros, n=n_tareas, empleados=empleados, proyectos=proyectos, por_proyecto=tareas_por_proyecto))
+
+    # Recursos de cada proyecto
+    cr.execute("""
+        INSERT INTO creativeminds_recurso (proyecto_id, nombre, estado, costo_por_hora, horas_asignadas, costo_total,
+                                           fecha_inicio, fecha_fin, create_uid, create_date, write_uid, write_date)
+        SELECT p.id, 'Recurso benchmark ' || s.i, 'asignado',
+               25 + s.i %% 15, 8 * (1 + s.i %% 10), (25 + s.i %% 15) * 8 * (1 + s.i %% 10),
+               p.fecha_inicio, p.fecha_fin,
+               %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+          FROM generate_series(0, %(n)s - 1) AS s(i)
+          JOIN creativeminds_proyecto p
+            ON p.id = (%(proyectos)s::int[])[1 + (s.i / %(por_proyecto)s) %% cardinality(%(proyectos)s::int[])]
+    """, dict(parametros, n=n_proyectos * recursos_por_proyecto, proyectos=proyectos,
+              por_proyecto=recursos_por_proyecto))
+
+    env.invalidate_all()
+    return {
+        'empleados': empleados,
+        'proyectos': proyectos,
+        'n_tareas': n_tareas,
+        'n_recursos': n_proyectos * recursos_por_proyecto,
+    }
+
+
+# Siembra ideas para los proyectos dados y votos de los empleados dados para cada idea.
+def sembrar_ideas(env, proyectos, empleados, ideas_por_proyecto=2, votos_por_idea=20):
+    env.flush_all()
+    cr = env.cr
+    n_ideas = len(proyectos) * ideas_por_proyecto
+    parametros = {'uid': env.uid, 'proyectos': proyectos, 'empleados': empleados}
+    cr.execute("""
+        INSERT INTO creativeminds_idea (name, proyecto_id, creator_id, feasibility, impact,
+                                        create_uid, create_date, write_uid, write_date)
+        SELECT 'Idea benchmark ' || s.i,
+               (%(proyectos)s::int[])[1 + (s.i / %(por_proyecto)s) %% cardinality(%(proyectos)s::int[])],
+               (%(empleados)s::int[])[1 + s.i %% cardinality(%(empleados)s::int[])],
+               (1 + s.i %% 5)::text, (1 + (s.i * 7) %% 5)::text,
+               %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+          FROM generate_series(0, %(n)s - 1) AS s(i)
+        RETURNING id
+    """, dict(parametros, n=n_ideas, por_proyecto=ideas_por_proyecto))
+    ideas = [fila[0] for fila in cr.fetchall()]
+
+    cr.execute("""
+        INSERT INTO creativeminds_idea_vote (idea_id, empleado_id, score, create_uid, create_date, write_uid, write_date)
+        SELECT (%(ideas)s::int[])[1 + (s.i / %(por_idea)s) %% cardinality(%(ideas)s::int[])],
+               (%(empleados)s::int[])[1 + s.i %% cardinality(%(empleados)s::int[])],
+               1 + s.i %% 10,
+               %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+          FROM generate_series(0, %(n)s - 1) AS s(i)
+    """, dict(parametros, n=n_ideas * votos_por_idea, ideas=ideas, por_idea=votos_por_idea))
+
+    env.invalidate_all()
+    return {'ideas': ideas, 'n_votos': n_ideas * votos_por_idea}
+
+
+# Siembra equipos de miembros_por_equipo empleados consecutivos, con su número de miembros ya calculado.
+def sembrar_equipos(env, empleados, miembros_por_equipo=5):
+    env.flush_all()
+    cr = env.cr
+    relacion = env['creativeminds.equipo']._fields['empleado_id']
+    n_equipos = max(1, len(empleados) // miembros_por_equipo)
+    parametros = {'uid': env.uid, 'empleados': empleados, 'miembros': miembros_por_equipo}
+    cr.execute("""
+        INSERT INTO creativeminds_equipo (nombre, responsable_id, n_miembros, create_uid, create_date, write_uid, write_date)
+        SELECT 'Equipo benchmark ' || s.i, (%(empleados)s::int[])[1 + (s.i * %(miembros)s) %% cardinality(%(empleados)s::int[])],
+               %(miembros)s, %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+          FROM generate_series(0, %(n)s - 1) AS s(i)
+        RETURNING id
+    """, dict(parametros, n=n_equipos))
+    equipos = [fila[0] for fila in cr.fetchall()]
+    cr.execute(f"""
+        INSERT INTO {relacion.relation} ({relacion.column1}, {relacion.column2})
+        SELECT (%(equipos)s::int[])[1 + s.i / %(miembros)s],
+               (%(empleados)s::int[])[1 + s.i %% cardinality(%(empleados)s::int[])]
+          FROM generate_series(0, %(n)s - 1) AS s(i)
+        ON CONFLICT DO NOTHING
+    """, dict(parametros, equipos=equipos, n=n_equipos * miembros_por_equipo))
+    env.invalidate_all()
+    return {'equipos': equipos}
+
+
+# Siembra retroalimentaciones para los proyectos dados y acciones (con fecha límite futura) para cada una.
+def sembrar_feedback(env, proyectos, empleados, feedback_por_proyecto=2, acciones_por_feedback=3):
+    env.flush_all()
+    cr = env.cr
+    n_feedback = len(proyectos) * feedback_por_proyecto
+    parametros = {'uid': env.uid, 'proyectos': proyectos, 'empleados': empleados}
+    cr.execute("""
+        INSERT INTO creativeminds_feedback (proyecto_id, date, cliente, feedback_text, improvement_points, priority,
+                                            create_uid, create_date, write_uid, write_date)
+        SELECT (%(proyectos)s::int[])[1 + (s.i / %(por_proyecto)s) %% cardinality(%(proyectos)s::int[])],
+               CURRENT_DATE - (s.i %% 90), 'Cliente benchmark ' || (s.i %% 50),
+               '<p>Comentario benchmark ' || s.i || '</p>', 'Mejora benchmark ' || s.i, (s.i %% 5)::text,
+               %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+          FROM generate_series(0, %(n)s - 1) AS s(i)
+        RETURNING id
+    """, dict(parametros, n=n_feedback, por_proyecto=feedback_por_proyecto))
+    feedbacks = [fila[0] for fila in cr.fetchall()]
+
+    cr.execute("""
+        INSERT INTO creativeminds_feedback_action (feedback_id, action_text, assigned_to, due_date, status,
+                                                   create_uid, create_date, write_uid, write_date)
+        SELECT (%(feedbacks)s::int[])[1 + (s.i / %(por_feedback)s) %% cardinality(%(feedbacks)s::int[])],
+               'Acción benchmark ' || s.i,
+               (%(empleados)s::int[])[1 + s.i %% cardinality(%(empleados)s::int[])],
+               CURRENT_DATE + (s.i %% 60), (ARRAY['pending', 'in_progress', 'done'])[1 + s.i %% 3],
+               %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+          FROM generate_series(0, %(n)s - 1) AS s(i)
+    """, dict(parametros, n=n_feedback * acciones_por_feedback, feedbacks=feedbacks, por_feedback=acciones_por_feedback))
+
+    env.invalidate_all()
+    return {'feedbacks': feedbacks, 'n_acciones': n_feedback * acciones_por_feedback}
+
+
+# Deshace todo lo sembrado y limpia la caché del entorno.
+def deshacer(env):
+    env.cr.rollback()
+    env.clear()
+
+
+# Mide el tiempo de reloj y el número de consultas SQL ejecutadas dentro del bloque.
+# Arranca con la caché vacía para que la medida incluya la lectura de los datos.
+# Con memoria=True añade el pico de memoria de Python (tracemalloc), que ralentiza el bloque: no conviene
+# medir tiempo y memoria en la misma pasada.
+@contextmanager
+def medir(env, memoria=False):
+    env.flush_all()
+    env.invalidate_all()
+    medida = {}
+    if memoria:
+        tracemalloc.start()
+    consultas = env.cr.sql_log_count
+    inicio = time.perf_counter()
+    try:
+        yield medida
+    finally:
+        medida['segundos'] = time.perf_counter() - inicio
+        medida['consultas'] = env.cr.sql_log_count - consultas
+        if memoria:
+            medida['memoria_pico_kb'] = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+
+
+# Compara dos diccionarios de resultados admitiendo el error de redondeo propio de sumar flotantes en distinto orden.
+def diferencias(esperado, obtenido, tolerancia=1e-6):
+    errores = []
+    for clave in sorted(set(esperado) | set(obtenido)):
+        a, b = esperado.get(clave), obtenido.get(clave)
+        if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+            if abs(a - b) <= tolerancia * max(1.0, abs(a)):
+                continue
+        elif a == b:
+            continue
+        errores.append(f"{clave}: esperado {a!r}, obtenido {b!r}")
+    return errores
@@ -0,0 +1,190 @@
+# Banco de pruebas completo de CreativeMinds con resultados en JSON.
+#
+# Siembra una cartera sintética (proyectos, tareas, recursos, empleados, equipos, ideas con votos y feedback con
+# acciones) y mide las operaciones más usadas. Cada escenario se repite dentro de un punto de guardado que se
+# deshace al terminar, así que todas las repeticiones parten de los mismos datos. Para cada escenario se guardan
+# la mediana y el mínimo del tiempo, las consultas SQL y, en una pasada aparte, el pico de memoria de Python.
+#
+#     >>> from odoo.addons.creativeminds.benchmarks import ejecutar
+#     >>> ejecutar.ejecutar(env, n_tareas=20000, salida='/tmp/bench_actual.json')
+#     >>> ejecutar.comparar('/tmp/bench_base.json', '/tmp/bench_actual.json')
+#
+# En CI se lanza como test opcional (tests/test_benchmark.py):
+#     odoo-bin -d <bd> -u creativeminds --test-tags creativeminds_bench --stop-after-init
+import json
+import os
+import statistics
+import subprocess
+from datetime import datetime
+
+from odoo.exceptions import UserError, ValidationError
+
+from . import comun
+
+
+# ----------------------------------------------------------------------
+# Escenarios: cada uno prepara sus datos (sin medir) y devuelve la operación que se mide.
+# ----------------------------------------------------------------------
+
+def _crear_proyectos(env, datos, n=100):
+    valores = [{
+        'nombre': f'Proyecto nuevo benchmark {i}',
+        'responsable_id': datos['empleados'][i % len(datos['empleados'])],
+        'presupuesto_estimado': 100000,
+    } for i in range(n)]
+    return lambda: env['creativeminds.proyecto'].create(valores)
+
+
+def _duplicar_proyectos(env, datos, n=10):
+    proyectos = env['creativeminds.proyecto'].browse(datos['proyectos'][:n])
+    return proyectos.duplicar_proyecto
+
+
+def _obtener_metricas(env, datos):
+    return env['creativeminds.metrics.snapshot'].obtener_metricas
+
+
+def _resumen_proyecto(env, datos):
+    return env['creativeminds.proyecto'].browse(datos['proyectos'][0]).obtener_resumen_proyecto
+
+
+def _resumenes_proyectos(env, datos, n=100):
+    return env['creativeminds.proyecto'].browse(datos['proyectos'][:n]).obtener_resumenes_proyectos
+
+
+# Pasa a 'en_progreso' proyectos en planificación: dispara las reglas de validación del estado.
+def _transicion_estado(env, datos, n=100):
+    proyectos = env['creativeminds.proyecto'].search([
+        ('id', 'in', datos['proyectos']), ('estado', '=', 'planificacion'),
+    ], limit=n)
+    proyectos.write({'cliente': 'Cliente benchmark', 'descripcion': 'Proyecto sembrado para el benchmark.'})
+    return lambda: proyectos.write({'estado': 'en_progreso'})
+
+
+def _leer_puntuaciones(env, datos):
+    ideas = env['creativeminds.idea'].browse(datos['ideas'])
+    return lambda: ideas.read(['score', 'vote_count', 'ranking'])
+
+
+ESCENARIOS = {
+    'crear_proyectos': _crear_proyectos,
+    'duplicar_proyecto': _duplicar_proyectos,
+    'obtener_metricas': _obtener_metricas,
+    'obtener_resumen_proyecto': _resumen_proyecto,
+    'obtener_resumenes_proyectos': _resumenes_proyectos,
+    'transicion_estado': _transicion_estado,
+    'leer_puntuaciones_ideas': _leer_puntuaciones,
+}
+
+
+# ----------------------------------------------------------------------
+# Ejecución
+# ----------------------------------------------------------------------
+
+# Los datos sembrados se deshacen con un punto de guardado (no con un rollback), así que también puede
+# ejecutarse dentro de la transacción de un test.
+def ejecutar(env, n_tareas=10000, repeticiones=5, salida=None, escenarios=None):
+    resultados = {}
+    punto = env.cr.savepoint(flush=False)
+    try:
+        datos = comun.sembrar_cartera(env, n_tareas)
+        datos.update(comun.sembrar_equipos(env, datos['empleados']))
+        datos.update(comun.sembrar_ideas(env, datos['proyectos'], datos['empleados']))
+        datos.update(comun.sembrar_feedback(env, datos['proyectos'], datos['empleados']))
+        env.flush_all()
+        for nombre, preparar in ESCENARIOS.items():
+            if escenarios is None or nombre in escenarios:
+                resultados[nombre] = _medir_escenario(env, datos, preparar, repeticiones)
+    finally:
+        punto.close(rollback=True)
+        env.clear()
+
+    informe = {
+        'fecha': datetime.utcnow().isoformat(timespec='seconds'),
+        'commit': _commit_actual(),
+        'base_de_datos': env.cr.dbname,
+        'volumen': {
+            'tareas': n_tareas,
+            'proyectos': len(datos['proyectos']),
+            'empleados': len(datos['empleados']),
+            'equipos': len(datos['equipos']),
+            'ideas': len(datos['ideas']),
+            'votos': datos['n_votos'],
+            'feedbacks': len(datos['feedbacks']),
+            'acciones': datos['n_acciones'],
+        },
+        'repeticiones': repeticiones,
+        'escenarios': resultados,
+    }
+    if salida:
+        with open(salida, 'w') as fichero:
+            json.dump(informe, fichero, indent=2, sort_keys=True)
+
+    print(f"Cartera: {informe['volumen']}")
+    for nombre, resultado in resultados.items():
+        if 'error' in resultado:
+            print(f"  {nombre:<30} ERROR: {resultado['error']}")
+            continue
+        print(f"  {nombre:<30} {resultado['mediana_ms']:>10.2f} ms (mín. {resultado['minimo_ms']:.2f})"
+              f" {resultado['consultas']:>6} consultas {resultado['memoria_pico_kb']:>10.0f} KB")
+    return informe
+
+
+# Mide un escenario 'repeticiones' veces y una más con tracemalloc, deshaciendo los cambios tras cada pasada.
+def _medir_escenario(env, datos, preparar, repeticiones):
+    medidas = []
+    for pasada in range(repeticiones + 1):
+        punto = env.cr.savepoint(flush=False)
+        try:
+            operacion = preparar(env, datos)
+            with comun.medir(env, memoria=pasada == repeticiones) as medida:
+                operacion()
+                env.flush_all()  # Las escrituras pendientes forman parte del coste de la operación
+            medidas.append(medida)
+        except (UserError, ValidationError) as e:
+            return {'error': str(e)}
+        finally:
+            punto.close(rollback=True)
+            env.clear()
+    tiempos = [medida['segundos'] * 1000 for medida in medidas[:-1]]
+    return {
+        'mediana_ms': statistics.median(tiempos),
+        'minimo_ms': min(tiempos),
+        'consultas': medidas[0]['consultas'],
+        'memoria_pico_kb': medidas[-1]['memoria_pico_kb'],
+    }
+
+
+def _commit_actual():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(__file__),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Compara dos ficheros de resultados e imprime los escenarios que empeoran más que el umbral (en tiempo) o
+# que hacen más consultas. Devuelve la lista de regresiones.
+def comparar(fichero_base, fichero_actual, umbral=0.10):
+    with open(fichero_base) as fichero:
+        base = json.load(fichero)
+    with open(fichero_actual) as fichero:
+        actual = json.load(fichero)
+    if base['volumen'] != actual['volumen']:
+        print(f"Aviso: los volúmenes no coinciden ({base['volumen']} frente a {actual['volumen']})")
+    regresiones = []
+    print(f"{base.get('commit')} -> {actual.get('commit')}")
+    for nombre in sorted(set(base['escenarios']) & set(actual['escenarios'])):
+        antes, despues = base['escenarios'][nombre], actual['escenarios'][nombre]
+        if 'error' in antes or 'error' in despues:
+            print(f"  {nombre:<30} sin comparar (error en alguna ejecución)")
+            continue
+        variacion = despues['mediana_ms'] / antes['mediana_ms'] - 1 if antes['mediana_ms'] else 0.0
+        empeora = variacion > umbral or despues['consultas'] > antes['consultas']
+        if empeora:
+            regresiones.append(nombre)
+        print(f"  {nombre:<30} {antes['mediana_ms']:>9.2f} -> {despues['mediana_ms']:>9.2f} ms ({variacion:+.0%})"
+              f" {antes['consultas']:>5} -> {despues['consultas']:<5} consultas{'  REGRESIÓN' if empeora else ''}")
+    return regresiones
@@ -0,0 +1,102 @@
+# Verificación de los planes de consulta de los filtros más usados.
+#
+# Siembra una cartera de 100k tareas con ideas y votos, actualiza las estadísticas (ANALYZE) y comprueba:
+#   - con EXPLAIN, que cada consulta clave recorre un índice de su tabla y no hace un Seq Scan sobre ella;
+#   - con el contador de consultas del cursor, que la operación ORM equivalente no supera su presupuesto.
+# Sirve como control de regresión tras cambiar campos, dominios o índices: devuelve la lista de fallos,
+# vacía si todo está bien. Las mismas comprobaciones se ejecutan en CI con tests/test_indices.py.
+#
+#     >>> from odoo.addons.creativeminds.benchmarks import verificar_indices
+#     >>> verificar_indices.ejecutar(env)
+from odoo.tools import SQL
+
+from . import comun
+
+NODOS_INDICE = {'Index Scan', 'Index Only Scan', 'Bitmap Index Scan'}
+
+
+def _nodos(plan):
+    yield plan
+    for hijo in plan.get('Plans', []):
+        yield from _nodos(hijo)
+
+
+# Devuelve None si el plan usa un índice de la tabla, o la descripción del problema.
+def _revisar_plan(env, tabla, consulta):
+    env.cr.execute(SQL("EXPLAIN (FORMAT JSON) %s", consulta))
+    nodos = list(_nodos(env.cr.fetchone()[0][0]['Plan']))
+    if any(nodo['Node Type'] == 'Seq Scan' and nodo.get('Relation Name') == tabla for nodo in nodos):
+        return f"Seq Scan sobre {tabla}"
+    if not any(nodo['Node Type'] in NODOS_INDICE and nodo.get('Index Name', '').startswith(tabla) for nodo in nodos):
+        return f"ningún índice de {tabla} en el plan ({', '.join(nodo['Node Type'] for nodo in nodos)})"
+    return None
+
+
+# Siembra la cartera y evalúa cada comprobación sin deshacer nada: quien llama decide cuándo se deshacen los datos
+# (ejecutar con un rollback, tests/test_indices.py con la transacción del propio test).
+# Devuelve [{'nombre', 'plan', 'consultas', 'presupuesto', 'segundos'}]; 'plan' es None si el plan usa un índice.
+def comprobar(env, n_tareas=100000):
+    Proyecto = env['creativeminds.proyecto']
+    Tarea = env['creativeminds.tarea']
+    Voto = env['creativeminds.idea.vote']
+    datos = comun.sembrar_cartera(env, n_tareas)
+    ideas = comun.sembrar_ideas(env, datos['proyectos'], datos['empleados'])
+    # Distribución realista: casi todos los proyectos con la fecha de fin pasada ya están finalizados
+    env.cr.execute("""
+        UPDATE creativeminds_proyecto SET estado = 'finalizado'
+         WHERE id = ANY(%s) AND fecha_fin < CURRENT_DATE AND id %% 20 <> 0
+    """, [datos['proyectos']])
+    env.cr.execute("ANALYZE creativeminds_proyecto, creativeminds_tarea, creativeminds_idea_vote")
+    env.invalidate_all()
+
+    proyecto_id = datos['proyectos'][len(datos['proyectos']) // 2]
+    muestra_ideas = ideas['ideas'][:50]
+    dominio_tareas = [('proyecto_id', '=', proyecto_id)]
+    dominio_pendientes = [('proyecto_id', '=', proyecto_id), ('estado', '=', 'pendiente')]
+    comprobaciones = [
+        # (nombre, tabla, consulta SQL, operación ORM, presupuesto de consultas)
+        ('Tareas de un proyecto (ver_tareas)', 'creativeminds_tarea',
+         Tarea._search(dominio_tareas).select(),
+         lambda: Tarea.search_read(dominio_tareas, ['nombre', 'estado', 'responsable_id', 'fecha_fin']), 3),
+        ('Tareas pendientes de un proyecto', 'creativeminds_tarea',
+         Tarea._search(dominio_pendientes).select(),
+         lambda: Tarea.search_count(dominio_pendientes), 1),
+        ('Proyectos retrasados', 'creativeminds_proyecto',
+         Proyecto._search(Proyecto._dominio_retrasados()).select(),
+         lambda: Proyecto.search_count(Proyecto._dominio_retrasados()), 1),
+        ('Media de votos por idea', 'creativeminds_idea_vote',
+         SQL("SELECT idea_id, AVG(score) FROM creativeminds_idea_vote WHERE idea_id = ANY(%s) GROUP BY idea_id", muestra_ideas),
+         lambda: Voto._read_group([('idea_id', 'in', muestra_ideas)], ['idea_id'], ['score:avg']), 1),
+    ]
+    resultados = []
+    for nombre, tabla, consulta, operacion, presupuesto in comprobaciones:
+        problema_plan = _revisar_plan(env, tabla, consulta)
+        with comun.medir(env) as medida:
+            operacion()
+        resultados.append({
+            'nombre': nombre,
+            'plan': problema_plan,
+            'consultas': medida['consultas'],
+            'presupuesto': presupuesto,
+            'segundos': medida['segundos'],
+        })
+    return resultados
+
+
+def ejecutar(env, n_tareas=100000):
+    try:
+        resultados = comprobar(env, n_tareas)
+    finally:
+        comun.deshacer(env)
+
+    fallos = []
+    for resultado in resultados:
+        correcto = resultado['plan'] is None and resultado['consultas'] <= resultado['presupuesto']
+        print(f"{'OK   ' if correcto else 'FALLO'} {resultado['nombre']:<36} "
+              f"{resultado['consultas']:>3}/{resultado['presupuesto']} consultas {resultado['segundos'] * 1000:>8.2f} ms"
+              + (f"  [{resultado['plan']}]" if resultado['plan'] else ''))
+        if resultado['plan']:
+            fallos.append(f"{resultado['nombre']}: {resultado['plan']}")
+        if resultado['consultas'] > resultado['presupuesto']:
+            fallos.append(f"{resultado['nombre']}: {resultado['consultas']} consultas (presupuesto {resultado['presupuesto']})")
+    return fallos
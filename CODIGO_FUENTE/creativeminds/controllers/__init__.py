@@ -0,0 +1,2 @@
+from . import exportacion
+from . import dashboard
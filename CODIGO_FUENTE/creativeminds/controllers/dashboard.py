@@ -0,0 +1,87 @@
+from odoo import http, fields  # Importa los módulos necesarios de Odoo para definir rutas.
+from odoo.http import request  # Para acceder a la petición y construir la respuesta.
+from datetime import datetime, time, timezone  # Para calcular la fecha de última modificación.
+from werkzeug.http import http_date  # Para formatear la cabecera Last-Modified.
+import hashlib  # Para calcular el ETag.
+import json  # Para serializar la respuesta.
+
+
+class DashboardController(http.Controller):
+
+    # Señales de cambio del panel, todas sobre índices: (tabla, condición, contar filas).
+    # - Proyectos: write_date de sus propios campos (nombre, fechas...).
+    # - Instantánea de métricas: sus filas se reescriben con cada cambio de tareas, recursos y empleados disponibles,
+    #   y el recuento (una fila por proyecto) detecta los proyectos borrados, que no dejan write_date.
+    # - Tareas sin proyecto: no tienen fila en la instantánea (índice parcial, casi vacío).
+    _SENALES_PANEL = (
+        ('creativeminds_proyecto', 'TRUE', False),
+        ('creativeminds_metrics_snapshot', 'TRUE', True),
+        ('creativeminds_tarea', 'proyecto_id IS NULL', True),
+    )
+
+    # Panel de la cartera en JSON: métricas globales (instantánea) y resúmenes por proyecto, paginados por id.
+    # Responde 304 sin calcular nada si el cliente ya tiene la versión actual (If-None-Match / If-Modified-Since).
+    @http.route('/creativeminds/dashboard', type='http', auth='user', methods=['GET'])
+    def dashboard(self, limite=100, offset=0, **kwargs):
+        try:
+            limite, offset = int(limite), int(offset)
+        except (TypeError, ValueError):
+            return self._error("Los parámetros 'limite' y 'offset' deben ser números enteros.")
+        if limite < 1 or offset < 0:
+            return self._error("'limite' debe ser mayor que cero y 'offset' no puede ser negativo.")
+        limite = min(limite, 500)
+        ultima_modificacion, firma = self._version_datos()
+        etag = '"%s"' % hashlib.sha1(
+            f"{request.env.uid}:{limite}:{offset}:{ultima_modificacion.isoformat()}:{firma}".encode()
+        ).hexdigest()
+        cabeceras = [
+            ('ETag', etag),
+            ('Last-Modified', http_date(ultima_modificacion)),
+            ('Cache-Control', 'private, no-cache'),  # El navegador guarda la respuesta pero revalida siempre
+        ]
+        peticion = request.httprequest
+        if peticion.if_none_match:
+            no_modificado = peticion.if_none_match.contains(etag.strip('"'))
+        else:
+            desde = peticion.if_modified_since
+            no_modificado = bool(desde) and self._utc(desde) >= ultima_modificacion.replace(microsecond=0)
+        if no_modificado:
+            return request.make_response(b'', headers=cabeceras, status=304)
+
+        Proyecto = request.env['creativeminds.proyecto']
+        datos = {
+            'metricas': request.env['creativeminds.metrics.snapshot'].obtener_metricas(),
+            'proyectos': Proyecto.search([], limit=limite, offset=offset, order='id').obtener_resumenes_proyectos(),
+            'total_proyectos': Proyecto.search_count([]),
+            'generado': fields.Datetime.to_string(fields.Datetime.now()),
+        }
+        cuerpo = json.dumps(datos, separators=(',', ':'), default=str)
+        return request.make_response(cuerpo, headers=cabeceras + [('Content-Type', 'application/json; charset=utf-8')])
+
+    # Última modificación (UTC, con tzinfo) y firma de los datos del panel en una sola consulta.
+    # La medianoche de hoy actúa como mínimo porque los proyectos retrasados cambian con la fecha.
+    def _version_datos(self):
+        consulta = ' UNION ALL '.join(
+            f"SELECT MAX(write_date), {'COUNT(*)' if contar else 'NULL::bigint'} FROM {tabla} WHERE {condicion}"
+            for tabla, condicion, contar in self._SENALES_PANEL
+        )
+        request.env.flush_all()
+        request.env.cr.execute(consulta)
+        filas = request.env.cr.fetchall()
+        hoy = datetime.combine(fields.Date.today(), time.min)
+        ultima = max([hoy] + [maximo for maximo, _total in filas if maximo])
+        firma = ','.join(f"{maximo}:{total}" for maximo, total in filas)
+        return ultima.replace(tzinfo=timezone.utc), firma
+
+    # Respuesta 400 con el motivo en JSON.
+    @staticmethod
+    def _error(mensaje):
+        return request.make_response(
+            json.dumps({'error': mensaje}), headers=[('Content-Type', 'application/json; charset=utf-8')], status=400,
+        )
+
+    @staticmethod
+    def _utc(momento):
+        if momento.tzinfo is None:
+            return momento.replace(tzinfo=timezone.utc)
+        return momento.astimezone(timezone.utc)
@@ -0,0 +1,37 @@
+from odoo import http  # Importa el módulo http de Odoo para definir rutas.
+from odoo.http import request, content_disposition  # Para construir la respuesta de descarga.
+import os  # Para leer y borrar el fichero temporal de la exportación.
+
+
+class ExportacionController(http.Controller):
+
+    # Tamaño de los bloques con los que se envía el fichero al navegador.
+    _TAMANO_BLOQUE = 64 * 1024
+
+    # Descarga la exportación de la cartera. Los parámetros son los filtros del asistente de exportación.
+    @http.route('/creativeminds/exportar/proyectos', type='http', auth='user', methods=['GET'])
+    def exportar_proyectos(self, formato='csv', estado=None, prioridad=None, fecha_desde=None, fecha_hasta=None, **kwargs):
+        Exportacion = request.env['creativeminds.exportacion']
+        dominio = Exportacion._dominio_exportacion(estado=estado, prioridad=prioridad, fecha_desde=fecha_desde, fecha_hasta=fecha_hasta)
+        ruta = Exportacion.exportar(dominio, formato=formato)
+        tipos = {
+            'csv': 'text/csv; charset=utf-8',
+            'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        }
+        return request.make_response(self._leer_y_borrar(ruta), headers=[
+            ('Content-Type', tipos[formato]),
+            ('Content-Length', str(os.path.getsize(ruta))),
+            ('Content-Disposition', content_disposition(f'cartera_proyectos.{formato}')),
+        ])
+
+    # Envía el fichero por bloques y lo borra al terminar, aunque el cliente corte la descarga.
+    def _leer_y_borrar(self, ruta):
+        try:
+            with open(ruta, 'rb') as fichero:
+                while True:
+                    bloque = fichero.read(self._TAMANO_BLOQUE)
+                    if not bloque:
+                        break
+                    yield bloque
+        finally:
+            os.unlink(ruta)
@@ -1,2 +1,15 @@
-
-from . import models
\ No newline at end of file
+from . import models
+from . import metricas
+from . import ir_attachment
+from . import recordatorios
+from . import notificaciones
+from . import exportacion
+from . import importacion
+from . import capacidad
+from . import planificacion
+from . import riesgos
+from . import historico_kpi
+from . import busqueda
+from . import previsiones
+from . import informes
+from . import perfilado
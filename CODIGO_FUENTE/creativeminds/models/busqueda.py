@@ -0,0 +1,228 @@
+from odoo import models, fields, api  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
+from odoo.tools import html2plaintext  # Para indexar el texto de los campos HTML sin etiquetas.
+from markupsafe import Markup, escape  # Para devolver los fragmentos resaltados sin abrir la puerta a HTML ajeno.
+import logging  # Para registrar información y errores en el log de Odoo.
+
+_logger = logging.getLogger(__name__)
+
+# Modelos indexados: campo del título, campos de contenido y campo del proyecto.
+_FUENTES = {
+    'creativeminds.proyecto': ('nombre', ['descripcion', 'riesgos', 'hitos', 'comentarios'], 'id'),
+    'creativeminds.idea': ('name', ['description', 'pros', 'cons'], 'proyecto_id'),
+    'creativeminds.feedback': ('cliente', ['feedback_text', 'improvement_points'], 'proyecto_id'),
+}
+
+# Delimitadores de ts_headline: caracteres de control que no aparecen en el texto y se sustituyen tras escaparlo.
+_INICIO_RESALTADO, _FIN_RESALTADO = '\x02', '\x03'
+
+
+class Busqueda(models.Model):
+    _name = 'creativeminds.busqueda'
+    _description = 'Índice de Búsqueda de Texto'
+    _rec_name = 'titulo'
+    _order = 'res_model, res_id'
+    _log_access = False  # Tabla derivada: la mantienen los hooks de los modelos indexados por SQL
+
+    res_model = fields.Selection([
+        ('creativeminds.proyecto', 'Proyecto'),
+        ('creativeminds.idea', 'Idea'),
+        ('creativeminds.feedback', 'Retroalimentación'),
+    ], string='Origen', required=True, readonly=True)
+    res_id = fields.Integer(string='ID del Registro', required=True, readonly=True)
+    # Sin cascada: las ideas y retroalimentaciones sobreviven a su proyecto (la fila del proyecto la quita su unlink)
+    proyecto_id = fields.Many2one('creativeminds.proyecto', string='Proyecto', ondelete='set null', readonly=True, index=True)
+    titulo = fields.Char(string='Título', readonly=True, index='trigram')  # Búsqueda aproximada (errores de escritura)
+    contenido = fields.Text(string='Contenido', readonly=True, prefetch=False)  # Texto plano de todos los campos
+    consulta = fields.Char(string='Texto', compute='_compute_consulta', search='_search_consulta')  # Solo para buscar desde la vista
+
+    _sql_constraints = [
+        ('registro_unico', 'UNIQUE(res_model, res_id)', "El registro ya está indexado."),
+    ]
+
+    def init(self):
+        # El vector de búsqueda lo calcula PostgreSQL: el título pesa más (A) que el contenido (B).
+        self.env.cr.execute("""
+            ALTER TABLE creativeminds_busqueda ADD COLUMN IF NOT EXISTS documento tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('spanish', COALESCE(titulo, '')), 'A')
+                 || setweight(to_tsvector('spanish', COALESCE(contenido, '')), 'B')
+                ) STORED
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS creativeminds_busqueda_documento_idx
+                ON creativeminds_busqueda USING GIN (documento)
+        """)
+
+    def _compute_consulta(self):
+        self.consulta = False
+
+    def _search_consulta(self, operator, value):
+        if operator not in ('ilike', '=') or not value:
+            return [('id', '!=', False)]
+        return [('id', 'in', [resultado['id'] for resultado in self.buscar(value, limite=1000, fragmentos=False)])]
+
+    # ------------------------------------------------------------------
+    # Mantenimiento del índice
+    # ------------------------------------------------------------------
+
+    # Indexa (o reindexa) los registros dados de uno de los modelos de _FUENTES con una lectura y un upsert.
+    @api.model
+    def _indexar(self, registros):
+        registros = registros.filtered(lambda r: isinstance(r.id, int))
+        if not registros:
+            return
+        campo_titulo, campos, campo_proyecto = _FUENTES[registros._name]
+        html = {campo for campo in campos if registros._fields[campo].type == 'html'}
+        filas = registros.sudo().read([campo_titulo] + campos + ([] if campo_proyecto == 'id' else [campo_proyecto]), load=False)
+        titulos, contenidos, proyectos = [], [], []
+        for fila in filas:
+            textos = [html2plaintext(fila[campo]) if campo in html else fila[campo] for campo in campos if fila[campo]]
+            titulos.append(fila[campo_titulo] or registros._description)
+            contenidos.append('\n'.join(textos))
+            proyectos.append(fila['id'] if campo_proyecto == 'id' else fila[campo_proyecto] or None)
+        self.env.cr.execute("""
+            INSERT INTO creativeminds_busqueda (res_model, res_id, titulo, contenido, proyecto_id)
+            SELECT %s, res_id, titulo, contenido, proyecto_id
+              FROM unnest(%s::int[], %s::varchar[], %s::text[], %s::int[]) AS f(res_id, titulo, contenido, proyecto_id)
+            ON CONFLICT (res_model, res_id) DO UPDATE
+               SET titulo = EXCLUDED.titulo, contenido = EXCLUDED.contenido, proyecto_id = EXCLUDED.proyecto_id
+        """, [registros._name, [fila['id'] for fila in filas], titulos, contenidos, proyectos])
+        self.invalidate_model()
+
+    @api.model
+    def _desindexar(self, modelo, ids):
+        if ids:
+            self.env.cr.execute("DELETE FROM creativeminds_busqueda WHERE res_model = %s AND res_id = ANY(%s)", [modelo, list(ids)])
+            self.invalidate_model()
+
+    # Reconstruye el índice completo por lotes (instalación, o tras cargar datos directamente por SQL).
+    @api.model
+    def reindexar(self, tamano_lote=1000):
+        self.env.cr.execute("TRUNCATE creativeminds_busqueda")
+        for modelo in _FUENTES:
+            Modelo = self.env[modelo].sudo().with_context(active_test=False)
+            ids = Modelo.search([], order='id').ids
+            for inicio in range(0, len(ids), tamano_lote):
+                lote = Modelo.browse(ids[inicio:inicio + tamano_lote])
+                self._indexar(lote)
+                lote.invalidate_recordset()
+            _logger.info("Búsqueda: %s registros de %s indexados", len(ids), modelo)
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    # Busca 'texto' (sintaxis de buscador web: comillas, OR, -palabra) en todos los modelos indexados y devuelve los
+    # resultados por relevancia: [{'id', 'res_model', 'res_id', 'titulo', 'proyecto_id', 'relevancia', 'fragmento'}].
+    # Si la búsqueda de texto completo no encuentra nada, recurre a la similitud de trigramas con el título.
+    # Solo se devuelven registros que el usuario puede leer.
+    @api.model
+    def buscar(self, texto, limite=20, modelos=None, fragmentos=True):
+        if not texto or not texto.strip():
+            return []
+        self.env.cr.execute(f"""
+            SELECT r.id, r.res_model, r.res_id, r.titulo, r.proyecto_id, r.relevancia,
+                   {"ts_headline('spanish', b.contenido, r.consulta, %(opciones)s)" if fragmentos else 'NULL'}
+              FROM (SELECT b.id, b.res_model, b.res_id, b.titulo, b.proyecto_id, q.consulta,
+                           ts_rank_cd(b.documento, q.consulta) AS relevancia
+                      FROM creativeminds_busqueda b, websearch_to_tsquery('spanish', %(texto)s) AS q(consulta)
+                     WHERE b.documento @@ q.consulta
+                       AND (%(todos)s OR b.res_model = ANY(%(modelos)s))
+                  ORDER BY relevancia DESC, b.id
+                     LIMIT %(limite)s) r
+              JOIN creativeminds_busqueda b ON b.id = r.id
+          ORDER BY r.relevancia DESC, r.id
+        """, {
+            'texto': texto,
+            'todos': not modelos,
+            'modelos': list(modelos or []),
+            'limite': limite,
+            'opciones': f"StartSel={_INICIO_RESALTADO}, StopSel={_FIN_RESALTADO}, MaxFragments=2, MaxWords=25, MinWords=8",
+        })
+        filas = self.env.cr.fetchall()
+        if not filas and self.env.registry.has_trigram:
+            self.env.cr.execute("""
+                SELECT id, res_model, res_id, titulo, proyecto_id, similarity(titulo, %(texto)s), NULL
+                  FROM creativeminds_busqueda
+                 WHERE titulo %% %(texto)s
+                   AND (%(todos)s OR res_model = ANY(%(modelos)s))
+              ORDER BY similarity(titulo, %(texto)s) DESC, id
+                 LIMIT %(limite)s
+            """, {'texto': texto, 'todos': not modelos, 'modelos': list(modelos or []), 'limite': limite})
+            filas = self.env.cr.fetchall()
+        return self._filtrar_accesibles([{
+            'id': id_,
+            'res_model': res_model,
+            'res_id': res_id,
+            'titulo': titulo,
+            'proyecto_id': proyecto_id,
+            'relevancia': relevancia,
+            'fragmento': self._resaltar(fragmento) if fragmento else False,
+        } for id_, res_model, res_id, titulo, proyecto_id, relevancia, fragmento in filas])
+
+    # Descarta los resultados de registros que el usuario no puede leer (una búsqueda por modelo).
+    @api.model
+    def _filtrar_accesibles(self, resultados):
+        accesibles = set()
+        for modelo in {resultado['res_model'] for resultado in resultados}:
+            Modelo = self.env[modelo]
+            if not Modelo.check_access_rights('read', raise_exception=False):
+                continue
+            ids = [resultado['res_id'] for resultado in resultados if resultado['res_model'] == modelo]
+            accesibles.update((modelo, res_id) for res_id in Modelo.search([('id', 'in', ids)]).ids)
+        return [resultado for resultado in resultados if (resultado['res_model'], resultado['res_id']) in accesibles]
+
+    @staticmethod
+    def _resaltar(fragmento):
+        return Markup(str(escape(fragmento)).replace(_INICIO_RESALTADO, '<b>').replace(_FIN_RESALTADO, '</b>'))
+
+    # Abre el registro de origen.
+    def action_abrir_origen(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self.res_model,
+            'res_id': self.res_id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
+
+
+# Hooks de los modelos indexados: se reindexa al crear, al escribir un campo indexado y se desindexa al borrar.
+class BusquedaIndexable(models.AbstractModel):
+    _name = 'creativeminds.busqueda.indexable'
+    _description = 'Registro Indexado en la Búsqueda de Texto'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        registros = super(BusquedaIndexable, self).create(vals_list)
+        self.env['creativeminds.busqueda'].sudo()._indexar(registros)
+        return registros
+
+    def write(self, vals):
+        res = super(BusquedaIndexable, self).write(vals)
+        campo_titulo, campos, campo_proyecto = _FUENTES[self._name]
+        if vals.keys() & {campo_titulo, campo_proyecto, *campos}:
+            self.env['creativeminds.busqueda'].sudo()._indexar(self)
+        return res
+
+    def unlink(self):
+        ids = self.ids
+        res = super(BusquedaIndexable, self).unlink()
+        self.env['creativeminds.busqueda'].sudo()._desindexar(self._name, ids)
+        return res
+
+
+class ProyectoBusqueda(models.Model):
+    _name = 'creativeminds.proyecto'
+    _inherit = ['creativeminds.proyecto', 'creativeminds.busqueda.indexable']
+
+
+class IdeaBusqueda(models.Model):
+    _name = 'creativeminds.idea'
+    _inherit = ['creativeminds.idea', 'creativeminds.busqueda.indexable']
+
+
+class FeedbackBusqueda(models.Model):
+    _name = 'creativeminds.feedback'
+    _inherit = ['creativeminds.feedback', 'creativeminds.busqueda.indexable']
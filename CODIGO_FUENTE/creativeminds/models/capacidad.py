@@ -0,0 +1,252 @@
+from odoo import models, fields, api  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
+from datetime import timedelta  # Para calcular los lunes de las semanas.
+import logging  # Para registrar información y errores en el log de Odoo.
+
+_logger = logging.getLogger(__name__)
+
+
+class CargaSemanal(models.Model):
+    _name = 'creativeminds.carga.semanal'
+    _description = 'Carga Semanal de los Empleados'
+    _order = 'empleado_id, semana'
+    _log_access = False  # Tabla derivada: se reescribe por SQL y no necesita columnas de auditoría
+
+    empleado_id = fields.Many2one('creativeminds.empleado', string='Empleado', required=True, ondelete='cascade', readonly=True)
+    semana = fields.Date(string='Semana', required=True, readonly=True)  # Lunes de la semana
+    horas_recursos = fields.Float(string='Horas de Recursos', readonly=True)  # Horas de los recursos asignados
+    horas_tareas = fields.Float(string='Horas de Tareas', readonly=True)  # Estimación de las tareas abiertas
+    horas_totales = fields.Float(string='Horas Totales', readonly=True)
+
+    _sql_constraints = [
+        ('empleado_semana_unica', 'UNIQUE(empleado_id, semana)', "Solo puede haber una fila de carga por empleado y semana."),
+    ]
+
+    def init(self):
+        # Las búsquedas de capacidad filtran primero por rango de semanas y después agrupan por empleado.
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS creativeminds_carga_semanal_semana_empleado_idx
+                ON creativeminds_carga_semanal (semana, empleado_id) INCLUDE (horas_totales)
+        """)
+
+    # ------------------------------------------------------------------
+    # Configuración
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _horas_tarea_dia(self):
+        # Las tareas no tienen horas propias: cada día de una tarea abierta se estima con esta carga.
+        return float(self.env['ir.config_parameter'].sudo().get_param('creativeminds.capacidad.horas_tarea_dia', 2.0))
+
+    @api.model
+    def _sincronizar_disponibilidad_activa(self):
+        return self.env['ir.config_parameter'].sudo().get_param('creativeminds.capacidad.sincronizar_disponibilidad') == 'True'
+
+    # ------------------------------------------------------------------
+    # Mantenimiento incremental
+    # ------------------------------------------------------------------
+
+    # Consulta (sin el SELECT final) que reparte por semanas las asignaciones que cumplen los filtros dados, condiciones
+    # SQL sobre los recursos (r) y las tareas (t). Las horas de cada recurso se reparten a partes iguales entre sus
+    # empleados y, como las de las tareas abiertas, se distribuyen entre las semanas de su periodo en proporción a los
+    # días de cada semana. Los recursos sin fechas usan las de su proyecto; las asignaciones sin periodo no se pueden
+    # situar y se ignoran.
+    @api.model
+    def _consulta_repartidas(self, filtro_recursos, filtro_tareas):
+        relacion = self.env['creativeminds.recurso']._fields['empleado_id']
+        return f"""
+            WITH asignaciones AS (
+                SELECT rel.{relacion.column2} AS empleado_id,
+                       COALESCE(r.fecha_inicio, p.fecha_inicio) AS inicio,
+                       COALESCE(r.fecha_fin, p.fecha_fin) AS fin,
+                       COALESCE(r.horas_asignadas, 0)
+                           / (SELECT COUNT(*) FROM {relacion.relation} todos_rel WHERE todos_rel.{relacion.column1} = r.id) AS horas,
+                       TRUE AS es_recurso
+                  FROM creativeminds_recurso r
+                  JOIN {relacion.relation} rel ON rel.{relacion.column1} = r.id
+             LEFT JOIN creativeminds_proyecto p ON p.id = r.proyecto_id
+                 WHERE r.estado IS DISTINCT FROM 'completado'
+                   AND {filtro_recursos}
+             UNION ALL
+                SELECT t.responsable_id, t.fecha_inicio, t.fecha_fin,
+                       %(horas_tarea_dia)s * (t.fecha_fin - t.fecha_inicio + 1), FALSE
+                  FROM creativeminds_tarea t
+                 WHERE t.responsable_id IS NOT NULL
+                   AND t.estado IS DISTINCT FROM 'completada'
+                   AND {filtro_tareas}
+            ), repartidas AS (
+                SELECT a.empleado_id, s.semana::date AS semana, a.es_recurso,
+                       a.horas * (LEAST(a.fin, s.semana::date + 6) - GREATEST(a.inicio, s.semana::date) + 1)
+                           / (a.fin - a.inicio + 1) AS horas
+                  FROM asignaciones a
+            CROSS JOIN LATERAL generate_series(date_trunc('week', a.inicio), date_trunc('week', a.fin), interval '1 week') AS s(semana)
+                 WHERE a.inicio IS NOT NULL AND a.fin IS NOT NULL AND a.inicio <= a.fin
+            )
+        """
+
+    # Escribe en la base de datos solo los campos que lee _consulta_repartidas.
+    @api.model
+    def _flush_asignaciones(self):
+        self.env['creativeminds.recurso'].flush_model(['empleado_id', 'proyecto_id', 'fecha_inicio', 'fecha_fin', 'horas_asignadas', 'estado'])
+        self.env['creativeminds.proyecto'].flush_model(['fecha_inicio', 'fecha_fin'])
+        self.env['creativeminds.tarea'].flush_model(['responsable_id', 'fecha_inicio', 'fecha_fin', 'estado'])
+
+    # Reconstruye las filas de los empleados dados (todos si empleados es None) en una sola sentencia.
+    @api.model
+    def _recalcular_empleados(self, empleados=None):
+        if empleados is not None:
+            empleados = empleados.exists()
+            if not empleados:
+                return
+        self._flush_asignaciones()
+        relacion = self.env['creativeminds.recurso']._fields['empleado_id']
+        todos = empleados is None
+        parametros = {
+            'todos': todos,
+            'empleados': [] if todos else empleados.ids,
+            'horas_tarea_dia': self._horas_tarea_dia(),
+        }
+        self.env.cr.execute("""
+            DELETE FROM creativeminds_carga_semanal WHERE %(todos)s OR empleado_id = ANY(%(empleados)s)
+        """, parametros)
+        self.env.cr.execute(self._consulta_repartidas(
+            f"(%(todos)s OR rel.{relacion.column2} = ANY(%(empleados)s))",
+            "(%(todos)s OR t.responsable_id = ANY(%(empleados)s))",
+        ) + """
+            INSERT INTO creativeminds_carga_semanal (empleado_id, semana, horas_recursos, horas_tareas, horas_totales)
+            SELECT empleado_id, semana,
+                   COALESCE(SUM(horas) FILTER (WHERE es_recurso), 0),
+                   COALESCE(SUM(horas) FILTER (WHERE NOT es_recurso), 0),
+                   SUM(horas)
+              FROM repartidas
+          GROUP BY empleado_id, semana
+        """, parametros)
+        self.invalidate_model()
+        if self._sincronizar_disponibilidad_activa():
+            self._sincronizar_disponibilidad(empleados)
+
+    # ------------------------------------------------------------------
+    # Mantenimiento incremental (llamado desde create/write/unlink de Recurso, Tarea y Proyecto)
+    # ------------------------------------------------------------------
+
+    # Horas que aportan los recursos y tareas dados a cada semana: {(empleado_id, semana): (horas_recursos, horas_tareas)}.
+    # Los hooks la llaman antes y después del cambio y pasan ambos resultados a _aplicar_cambio.
+    @api.model
+    def _contribuciones(self, recursos=None, tareas=None):
+        recursos_ids = [recurso_id for recurso_id in (recursos.ids if recursos else []) if isinstance(recurso_id, int)]
+        tareas_ids = [tarea_id for tarea_id in (tareas.ids if tareas else []) if isinstance(tarea_id, int)]
+        if not recursos_ids and not tareas_ids:
+            return {}
+        self._flush_asignaciones()
+        self.env.cr.execute(self._consulta_repartidas('r.id = ANY(%(recursos)s)', 't.id = ANY(%(tareas)s)') + """
+            SELECT empleado_id, semana,
+                   COALESCE(SUM(horas) FILTER (WHERE es_recurso), 0),
+                   COALESCE(SUM(horas) FILTER (WHERE NOT es_recurso), 0)
+              FROM repartidas
+          GROUP BY empleado_id, semana
+        """, {'recursos': recursos_ids, 'tareas': tareas_ids, 'horas_tarea_dia': self._horas_tarea_dia()})
+        return {(empleado_id, semana): (horas_recursos, horas_tareas) for empleado_id, semana, horas_recursos, horas_tareas in self.env.cr.fetchall()}
+
+    # Suma a las filas de carga la diferencia entre dos resultados de _contribuciones con un upsert por semana
+    # (campo = campo + delta). Solo se tocan las semanas que cambian; las que se quedan sin horas se borran.
+    @api.model
+    def _aplicar_cambio(self, antes, despues):
+        deltas = []
+        for empleado_id, semana in antes.keys() | despues.keys():
+            recursos_antes, tareas_antes = antes.get((empleado_id, semana), (0.0, 0.0))
+            recursos_despues, tareas_despues = despues.get((empleado_id, semana), (0.0, 0.0))
+            delta_recursos, delta_tareas = recursos_despues - recursos_antes, tareas_despues - tareas_antes
+            if round(delta_recursos, 6) or round(delta_tareas, 6):
+                deltas.append((empleado_id, semana, delta_recursos, delta_tareas))
+        if not deltas:
+            return
+        empleados, semanas, horas_recursos, horas_tareas = (list(columna) for columna in zip(*deltas))
+        # El JOIN descarta los empleados borrados en la misma transacción (sus filas ya se han ido por cascada).
+        self.env.cr.execute("""
+            INSERT INTO creativeminds_carga_semanal (empleado_id, semana, horas_recursos, horas_tareas, horas_totales)
+            SELECT d.empleado_id, d.semana, d.horas_recursos, d.horas_tareas, d.horas_recursos + d.horas_tareas
+              FROM unnest(%s::int[], %s::date[], %s::float8[], %s::float8[]) AS d(empleado_id, semana, horas_recursos, horas_tareas)
+              JOIN creativeminds_empleado e ON e.id = d.empleado_id
+            ON CONFLICT (empleado_id, semana) DO UPDATE
+               SET horas_recursos = creativeminds_carga_semanal.horas_recursos + EXCLUDED.horas_recursos,
+                   horas_tareas = creativeminds_carga_semanal.horas_tareas + EXCLUDED.horas_tareas,
+                   horas_totales = creativeminds_carga_semanal.horas_totales + EXCLUDED.horas_totales
+        """, [empleados, semanas, horas_recursos, horas_tareas])
+        self.env.cr.execute("""
+            DELETE FROM creativeminds_carga_semanal c
+             USING unnest(%s::int[], %s::date[]) AS d(empleado_id, semana)
+             WHERE c.empleado_id = d.empleado_id AND c.semana = d.semana
+               AND abs(c.horas_recursos) < 1e-6 AND abs(c.horas_tareas) < 1e-6
+        """, [empleados, semanas])
+        self.invalidate_model()
+        if self._sincronizar_disponibilidad_activa():
+            self._sincronizar_disponibilidad(self.env['creativeminds.empleado'].browse(list(set(empleados))).exists())
+
+    # Reconstrucción completa diaria: corrige cualquier desviación y aplica los cambios de configuración.
+    @api.model
+    def _cron_reconstruir(self):
+        self._recalcular_empleados()
+        _logger.info("Capacidad: tabla de carga semanal reconstruida (%s filas)", self.search_count([]))
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    # Devuelve los empleados con al menos 'horas' libres entre dos fechas, de más a menos horas libres.
+    # La capacidad es capacidad_semanal por cada semana del rango (semanas completas, de lunes a domingo).
+    @api.model
+    def buscar_disponibles(self, horas, fecha_desde, fecha_hasta, limite=None):
+        fecha_desde, fecha_hasta = fields.Date.to_date(fecha_desde), fields.Date.to_date(fecha_hasta)
+        primera = fecha_desde - timedelta(days=fecha_desde.weekday())
+        ultima = fecha_hasta - timedelta(days=fecha_hasta.weekday())
+        n_semanas = (ultima - primera).days // 7 + 1
+        self.env['creativeminds.empleado'].flush_model(['capacidad_semanal', 'name'])
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT e.id, e.name, e.capacidad_semanal * %(semanas)s - COALESCE(c.horas, 0) AS libres
+              FROM creativeminds_empleado e
+         LEFT JOIN (SELECT empleado_id, SUM(horas_totales) AS horas
+                      FROM creativeminds_carga_semanal
+                     WHERE semana BETWEEN %(primera)s AND %(ultima)s
+                  GROUP BY empleado_id) c ON c.empleado_id = e.id
+             WHERE e.capacidad_semanal * %(semanas)s - COALESCE(c.horas, 0) >= %(horas)s
+          ORDER BY libres DESC, e.id
+             LIMIT %(limite)s
+        """, {'semanas': n_semanas, 'primera': primera, 'ultima': ultima, 'horas': horas, 'limite': limite})
+        return [
+            {'empleado_id': empleado_id, 'nombre': nombre, 'horas_libres': libres}
+            for empleado_id, nombre, libres in self.env.cr.fetchall()
+        ]
+
+    # Porcentaje de ocupación de la semana actual de cada empleado: {empleado_id: porcentaje}.
+    @api.model
+    def obtener_ocupacion_actual(self, empleados):
+        hoy = fields.Date.context_today(self)
+        lunes = hoy - timedelta(days=hoy.weekday())
+        cargas = {
+            empleado.id: horas
+            for empleado, horas in self._read_group(
+                [('empleado_id', 'in', empleados.ids), ('semana', '=', lunes)], ['empleado_id'], ['horas_totales:sum'],
+            )
+        }
+        return {
+            empleado.id: (100.0 * cargas.get(empleado.id, 0.0) / empleado.capacidad_semanal) if empleado.capacidad_semanal else 100.0
+            for empleado in empleados
+        }
+
+    # Deriva 'disponibilidad' de la ocupación de la semana actual. 'No disponible' se reserva a las
+    # ausencias y se respeta siempre; el resto pasa a disponible (sin carga), parcial o asignado (100% o más).
+    @api.model
+    def _sincronizar_disponibilidad(self, empleados=None):
+        Empleado = self.env['creativeminds.empleado']
+        dominio = [('disponibilidad', '!=', 'no_disponible')]
+        if empleados is not None:
+            dominio.append(('id', 'in', empleados.ids))
+        empleados = Empleado.search(dominio)
+        por_valor = {}
+        for empleado_id, ocupacion in self.obtener_ocupacion_actual(empleados).items():
+            valor = 'disponible' if ocupacion <= 0 else 'parcial' if ocupacion < 100 else 'asignado'
+            por_valor.setdefault(valor, []).append(empleado_id)
+        for valor, ids in por_valor.items():
+            cambiar = Empleado.browse(ids).filtered(lambda e: e.disponibilidad != valor)
+            if cambiar:
+                cambiar.write({'disponibilidad': valor})
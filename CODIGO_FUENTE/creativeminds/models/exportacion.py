@@ -0,0 +1,171 @@
+from odoo import models, api  # Importa los módulos necesarios de Odoo.
+from odoo.exceptions import UserError  # Para generar errores personalizados en Odoo.
+from collections import defaultdict  # Para agrupar tareas y recursos por proyecto.
+import csv  # Para escribir la exportación en formato CSV.
+import os  # Para gestionar el fichero temporal de la exportación.
+import tempfile  # Para crear el fichero temporal donde se escribe la exportación.
+import logging  # Para registrar información y errores en el log de Odoo.
+
+try:
+    import xlsxwriter  # Dependencia opcional: solo es necesaria para exportar a XLSX.
+except ImportError:
+    xlsxwriter = None
+
+_logger = logging.getLogger(__name__)
+
+
+class Exportacion(models.AbstractModel):
+    _name = 'creativeminds.exportacion'
+    _description = 'Exportación de la Cartera de Proyectos'
+
+    # Número de proyectos que se leen por lote; tareas y recursos se leen por lote de proyectos.
+    _TAMANO_LOTE = 500
+    # Límite de filas de una hoja XLSX.
+    _MAX_FILAS_XLSX = 1048576
+
+    # Columnas del fichero: una fila por proyecto seguida de las filas de sus tareas y recursos.
+    _COLUMNAS = [
+        ('tipo', 'Tipo'),
+        ('proyecto', 'Proyecto'),
+        ('nombre', 'Nombre'),
+        ('estado', 'Estado'),
+        ('prioridad', 'Prioridad'),
+        ('responsable', 'Responsable'),
+        ('fecha_inicio', 'Fecha de Inicio'),
+        ('fecha_fin', 'Fecha de Finalización'),
+        ('horas_asignadas', 'Horas Asignadas'),
+        ('costo_por_hora', 'Costo por Hora'),
+        ('costo_total', 'Costo Total'),
+        ('presupuesto_estimado', 'Presupuesto Estimado'),
+        ('costo_total_recursos', 'Costo Total de Recursos'),
+        ('porcentaje_progreso', 'Porcentaje de Progreso'),
+    ]
+
+    # Campos leídos de cada modelo (search_read, nunca registros completos).
+    _CAMPOS_PROYECTO = [
+        'nombre', 'estado', 'prioridad', 'responsable_id', 'fecha_inicio', 'fecha_fin', 'horas_asignadas',
+        'costo_por_hora', 'costo_total', 'presupuesto_estimado', 'costo_total_recursos', 'porcentaje_progreso',
+    ]
+    _CAMPOS_TAREA = ['proyecto_id', 'nombre', 'estado', 'responsable_id', 'fecha_inicio', 'fecha_fin']
+    _CAMPOS_RECURSO = ['proyecto_id', 'nombre', 'estado', 'fecha_inicio', 'fecha_fin', 'horas_asignadas', 'costo_por_hora', 'costo_total']
+
+    # Construye el dominio de proyectos a partir de los filtros de la exportación.
+    # El rango de fechas se aplica sobre la fecha de inicio del proyecto.
+    @api.model
+    def _dominio_exportacion(self, estado=None, prioridad=None, fecha_desde=None, fecha_hasta=None):
+        dominio = []
+        if estado:
+            dominio.append(('estado', '=', estado))
+        if prioridad:
+            dominio.append(('prioridad', '=', prioridad))
+        if fecha_desde:
+            dominio.append(('fecha_inicio', '>=', fecha_desde))
+        if fecha_hasta:
+            dominio.append(('fecha_inicio', '<=', fecha_hasta))
+        return dominio
+
+    # Generador de filas. Recorre los proyectos por lotes de tamaño fijo con paginación por id
+    # (sin OFFSET), lee tareas y recursos de todo el lote en una consulta por modelo y vacía
+    # la caché del entorno tras cada lote para que la memoria no crezca con la cartera.
+    @api.model
+    def _filas_exportacion(self, dominio, tamano_lote=None):
+        tamano_lote = tamano_lote or self._TAMANO_LOTE
+        Proyecto = self.env['creativeminds.proyecto']
+        etiquetas = {
+            'proyecto': dict(Proyecto._fields['estado'].selection),
+            'tarea': dict(self.env['creativeminds.tarea']._fields['estado'].selection),
+            'recurso': dict(self.env['creativeminds.recurso']._fields['estado'].selection),
+            'prioridad': dict(Proyecto._fields['prioridad'].selection),
+        }
+        ultimo_id = 0
+        while True:
+            proyectos = Proyecto.search_read(list(dominio) + [('id', '>', ultimo_id)], self._CAMPOS_PROYECTO, limit=tamano_lote, order='id')
+            if not proyectos:
+                return
+            ultimo_id = proyectos[-1]['id']
+            ids = [proyecto['id'] for proyecto in proyectos]
+            tareas = defaultdict(list)
+            for tarea in self.env['creativeminds.tarea'].search_read([('proyecto_id', 'in', ids)], self._CAMPOS_TAREA, order='id'):
+                tareas[tarea['proyecto_id'][0]].append(tarea)
+            recursos = defaultdict(list)
+            for recurso in self.env['creativeminds.recurso'].search_read([('proyecto_id', 'in', ids)], self._CAMPOS_RECURSO, order='id'):
+                recursos[recurso['proyecto_id'][0]].append(recurso)
+
+            for proyecto in proyectos:
+                nombre = proyecto['nombre']
+                yield self._fila('Proyecto', nombre, proyecto, etiquetas['proyecto'], etiquetas['prioridad'])
+                for tarea in tareas[proyecto['id']]:
+                    yield self._fila('Tarea', nombre, tarea, etiquetas['tarea'])
+                for recurso in recursos[proyecto['id']]:
+                    yield self._fila('Recurso', nombre, recurso, etiquetas['recurso'])
+            self.env.invalidate_all()
+
+    # Convierte un diccionario de search_read en una fila con el orden de _COLUMNAS.
+    @api.model
+    def _fila(self, tipo, proyecto, valores, estados, prioridades=None):
+        fila = []
+        for columna, _etiqueta in self._COLUMNAS:
+            if columna == 'tipo':
+                valor = tipo
+            elif columna == 'proyecto':
+                valor = proyecto
+            elif columna == 'estado':
+                valor = estados.get(valores.get('estado'), '')
+            elif columna == 'prioridad':
+                valor = prioridades.get(valores.get('prioridad'), '') if prioridades else ''
+            else:
+                valor = valores.get(columna, '')
+                if isinstance(valor, tuple):  # Many2one: (id, nombre)
+                    valor = valor[1]
+            fila.append('' if valor is False or valor is None else valor)
+        return fila
+
+    # Exporta los proyectos del dominio (con sus tareas y recursos) a un fichero temporal y devuelve su ruta.
+    # Quien llama es responsable de borrar el fichero cuando ya no lo necesite.
+    @api.model
+    def exportar(self, dominio=None, formato='csv', tamano_lote=None):
+        if formato not in ('csv', 'xlsx'):
+            raise UserError(f"Formato de exportación no soportado: {formato}")
+        if formato == 'xlsx' and xlsxwriter is None:
+            raise UserError("La exportación a XLSX requiere la librería xlsxwriter.")
+        descriptor, ruta = tempfile.mkstemp(prefix='creativeminds_cartera_', suffix=f'.{formato}')
+        os.close(descriptor)
+        filas = self._filas_exportacion(dominio or [], tamano_lote)
+        try:
+            total = getattr(self, f'_escribir_{formato}')(ruta, filas)
+        except Exception:
+            os.unlink(ruta)
+            raise
+        _logger.info("Exportación de cartera: %s filas escritas en %s", total, ruta)
+        return ruta
+
+    @api.model
+    def _escribir_csv(self, ruta, filas):
+        total = 0
+        with open(ruta, 'w', newline='', encoding='utf-8-sig') as fichero:  # BOM para que Excel detecte UTF-8
+            escritor = csv.writer(fichero)
+            escritor.writerow([etiqueta for _columna, etiqueta in self._COLUMNAS])
+            for fila in filas:
+                escritor.writerow(fila)
+                total += 1
+        return total
+
+    # constant_memory hace que xlsxwriter vuelque cada fila a disco en cuanto se completa.
+    @api.model
+    def _escribir_xlsx(self, ruta, filas):
+        libro = xlsxwriter.Workbook(ruta, {
+            'constant_memory': True,
+            'tmpdir': os.path.dirname(ruta),
+            'default_date_format': 'yyyy-mm-dd',
+        })
+        try:
+            hoja = libro.add_worksheet('Cartera')
+            hoja.write_row(0, 0, [etiqueta for _columna, etiqueta in self._COLUMNAS], libro.add_format({'bold': True}))
+            total = 0
+            for total, fila in enumerate(filas, start=1):
+                if total >= self._MAX_FILAS_XLSX:
+                    raise UserError("La exportación supera el máximo de filas de una hoja XLSX. Utilice el formato CSV o aplique filtros.")
+                hoja.write_row(total, 0, fila)
+        finally:
+            libro.close()
+        return total
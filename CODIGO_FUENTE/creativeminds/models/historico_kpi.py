@@ -0,0 +1,146 @@
+from odoo import models, fields, api  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
+from datetime import timedelta  # Para elegir la granularidad de las series y purgar las muestras antiguas.
+import logging  # Para registrar información y errores en el log de Odoo.
+
+_logger = logging.getLogger(__name__)
+
+# Agregados que se mantienen, de la más gruesa a la más fina: granularidad, unidad de date_trunc y ancho mínimo en días.
+_GRANULARIDADES = [('mes', 'month', 28), ('semana', 'week', 7), ('dia', 'day', 1)]
+
+
+class KPIMuestra(models.Model):
+    _name = 'creativeminds.kpi.muestra'
+    _description = 'Histórico de Valores de los Indicadores'
+    _order = 'kpi_id, fecha'
+    _log_access = False  # Solo se añaden filas: tres columnas y sin columnas de auditoría para millones de muestras
+
+    kpi_id = fields.Many2one('creativeminds.kpi', string='Indicador', required=True, ondelete='cascade', readonly=True)
+    fecha = fields.Datetime(string='Fecha', required=True, readonly=True)
+    valor = fields.Float(string='Valor', readonly=True)
+
+    def init(self):
+        # Las series leen las muestras de un indicador por rango de fechas.
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS creativeminds_kpi_muestra_kpi_fecha_idx
+                ON creativeminds_kpi_muestra (kpi_id, fecha) INCLUDE (valor)
+        """)
+
+    # Añade una muestra con el valor actual de cada indicador y actualiza sus agregados diario, semanal y mensual,
+    # todo en una sola sentencia. Los agregados se acumulan (recuento, suma, mínimo, máximo, último valor), así que
+    # nunca hay que releer las muestras.
+    @api.model
+    def _registrar(self, indicadores):
+        indicadores = indicadores.filtered(lambda k: isinstance(k.id, int))
+        if not indicadores:
+            return
+        self.env.cr.execute("""
+            WITH nuevas AS (
+                INSERT INTO creativeminds_kpi_muestra (kpi_id, fecha, valor)
+                SELECT kpi_id, now() at time zone 'UTC', valor
+                  FROM unnest(%s::int[], %s::float8[]) AS m(kpi_id, valor)
+             RETURNING kpi_id, fecha, valor
+            )
+            INSERT INTO creativeminds_kpi_agregado (kpi_id, granularidad, periodo, n, suma, minimo, maximo, ultimo, ultima_fecha)
+            SELECT n.kpi_id, g.granularidad, date_trunc(g.unidad, n.fecha)::date,
+                   COUNT(*), SUM(n.valor), MIN(n.valor), MAX(n.valor),
+                   (ARRAY_AGG(n.valor ORDER BY n.fecha DESC))[1], MAX(n.fecha)
+              FROM nuevas n
+        CROSS JOIN (VALUES ('dia', 'day'), ('semana', 'week'), ('mes', 'month')) AS g(granularidad, unidad)
+          GROUP BY n.kpi_id, g.granularidad, date_trunc(g.unidad, n.fecha)
+            ON CONFLICT (kpi_id, granularidad, periodo) DO UPDATE
+               SET n = creativeminds_kpi_agregado.n + EXCLUDED.n,
+                   suma = creativeminds_kpi_agregado.suma + EXCLUDED.suma,
+                   minimo = LEAST(creativeminds_kpi_agregado.minimo, EXCLUDED.minimo),
+                   maximo = GREATEST(creativeminds_kpi_agregado.maximo, EXCLUDED.maximo),
+                   ultimo = CASE WHEN EXCLUDED.ultima_fecha >= creativeminds_kpi_agregado.ultima_fecha
+                                 THEN EXCLUDED.ultimo ELSE creativeminds_kpi_agregado.ultimo END,
+                   ultima_fecha = GREATEST(creativeminds_kpi_agregado.ultima_fecha, EXCLUDED.ultima_fecha)
+        """, [indicadores.ids, [indicador.valor or 0.0 for indicador in indicadores]])
+        self.env['creativeminds.kpi.agregado'].invalidate_model()
+
+    # Tarea programada: borra las muestras más antiguas que creativeminds.kpi.dias_muestras días (0 = conservarlas).
+    # Los agregados no se tocan, así que las series largas siguen completas.
+    @api.model
+    def _cron_purgar(self):
+        dias = int(self.env['ir.config_parameter'].sudo().get_param('creativeminds.kpi.dias_muestras', 0))
+        if dias <= 0:
+            return
+        self.env.cr.execute(
+            "DELETE FROM creativeminds_kpi_muestra WHERE fecha < %s",
+            [fields.Datetime.now() - timedelta(days=dias)],
+        )
+        _logger.info("Histórico de indicadores: %s muestras purgadas", self.env.cr.rowcount)
+
+
+class KPIAgregado(models.Model):
+    _name = 'creativeminds.kpi.agregado'
+    _description = 'Agregados del Histórico de los Indicadores'
+    _order = 'kpi_id, granularidad, periodo'
+    _log_access = False  # Tabla derivada: la mantiene creativeminds.kpi.muestra por SQL
+
+    kpi_id = fields.Many2one('creativeminds.kpi', string='Indicador', required=True, ondelete='cascade', readonly=True)
+    granularidad = fields.Selection([
+        ('dia', 'Día'),
+        ('semana', 'Semana'),
+        ('mes', 'Mes'),
+    ], string='Granularidad', required=True, readonly=True)
+    periodo = fields.Date(string='Periodo', required=True, readonly=True)  # Primer día del periodo
+    n = fields.Integer(string='Muestras', readonly=True)
+    suma = fields.Float(string='Suma', readonly=True)
+    minimo = fields.Float(string='Mínimo', readonly=True)
+    maximo = fields.Float(string='Máximo', readonly=True)
+    ultimo = fields.Float(string='Último Valor', readonly=True)
+    ultima_fecha = fields.Datetime(string='Fecha del Último Valor', readonly=True)
+
+    # La clave única es también el índice de las consultas de series (indicador, granularidad, rango de periodos).
+    _sql_constraints = [
+        ('agregado_unico', 'UNIQUE(kpi_id, granularidad, periodo)', "Solo puede haber un agregado por indicador y periodo."),
+    ]
+
+
+class KPIHistorico(models.Model):
+    _inherit = 'creativeminds.kpi'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        indicadores = super(KPIHistorico, self).create(vals_list)
+        self.env['creativeminds.kpi.muestra'].sudo()._registrar(indicadores)
+        return indicadores
+
+    def write(self, vals):
+        res = super(KPIHistorico, self).write(vals)
+        if 'valor' in vals:
+            self.env['creativeminds.kpi.muestra'].sudo()._registrar(self)
+        return res
+
+    # Serie temporal de los indicadores entre dos fechas: {kpi_id: {'granularidad', 'puntos'}}.
+    # La resolución pedida es el rango dividido entre 'puntos'; se usa el agregado más grueso que no supere esa
+    # resolución y solo se leen las muestras cuando se pide más detalle que un día.
+    def obtener_serie(self, desde, hasta, puntos=200):
+        desde, hasta = fields.Datetime.to_datetime(desde), fields.Datetime.to_datetime(hasta)
+        resolucion = (hasta - desde) / max(1, puntos)
+        elegida = next((g for g in _GRANULARIDADES if timedelta(days=g[2]) <= resolucion), None)
+        series = {indicador.id: {'granularidad': elegida[0] if elegida else 'muestra', 'puntos': []} for indicador in self}
+        if elegida is None:
+            self.env.cr.execute("""
+                SELECT kpi_id, fecha, valor
+                  FROM creativeminds_kpi_muestra
+                 WHERE kpi_id = ANY(%s) AND fecha BETWEEN %s AND %s
+              ORDER BY kpi_id, fecha
+            """, [self.ids, desde, hasta])
+            for kpi_id, fecha, valor in self.env.cr.fetchall():
+                series[kpi_id]['puntos'].append({'fecha': fecha, 'valor': valor})
+            return series
+        granularidad, unidad, _dias = elegida
+        self.env.cr.execute("""
+            SELECT kpi_id, periodo, n, suma / NULLIF(n, 0), minimo, maximo, ultimo
+              FROM creativeminds_kpi_agregado
+             WHERE kpi_id = ANY(%s) AND granularidad = %s
+               AND periodo BETWEEN date_trunc(%s, %s::timestamp)::date AND %s::date
+          ORDER BY kpi_id, periodo
+        """, [self.ids, granularidad, unidad, desde, hasta])
+        for kpi_id, periodo, n, media, minimo, maximo, ultimo in self.env.cr.fetchall():
+            series[kpi_id]['puntos'].append({
+                'periodo': periodo, 'muestras': n, 'media': media, 'minimo': minimo, 'maximo': maximo, 'ultimo': ultimo,
+            })
+        return series
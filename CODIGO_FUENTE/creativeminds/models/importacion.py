@@ -0,0 +1,203 @@
+from odoo import models, fields, api  # Importa los módulos necesarios de Odoo.
+from odoo.exceptions import UserError  # Para generar errores personalizados en Odoo.
+from collections import defaultdict  # Para agrupar los valores de relaciones que hay que resolver.
+from datetime import date  # Para reconocer las celdas de fecha de los ficheros XLSX.
+import csv  # Para leer ficheros CSV.
+import io  # Para leer el contenido del fichero desde memoria.
+import time  # Para medir el rendimiento de la importación.
+import logging  # Para registrar información y errores en el log de Odoo.
+
+try:
+    import openpyxl  # Dependencia opcional: solo es necesaria para importar ficheros XLSX.
+except ImportError:
+    openpyxl = None
+
+_logger = logging.getLogger(__name__)
+
+
+class Importacion(models.AbstractModel):
+    _name = 'creativeminds.importacion'
+    _description = 'Importación Masiva de Tareas y Recursos'
+
+    # Número de filas que se crean en cada llamada a create.
+    _TAMANO_LOTE = 500
+
+    # Columnas admitidas por modelo (nombres técnicos de los campos).
+    _COLUMNAS = {
+        'creativeminds.tarea': ['nombre', 'descripcion', 'proyecto_id', 'responsable_id', 'fecha_inicio', 'fecha_fin', 'estado'],
+        'creativeminds.recurso': ['nombre', 'proyecto_id', 'costo_por_hora', 'horas_asignadas', 'fecha_inicio', 'fecha_fin', 'estado'],
+    }
+    # Campo por el que se buscan los registros relacionados cuando la celda no es un id.
+    _CAMPO_BUSQUEDA = {
+        'creativeminds.proyecto': 'nombre',
+        'creativeminds.empleado': 'name',
+    }
+
+    # Importa un fichero CSV o XLSX. La primera fila contiene los nombres técnicos de las columnas.
+    @api.model
+    def importar_fichero(self, modelo, contenido, nombre_fichero, tamano_lote=None):
+        return self.importar(modelo, self._leer_fichero(contenido, nombre_fichero), tamano_lote=tamano_lote)
+
+    @api.model
+    def _leer_fichero(self, contenido, nombre_fichero):
+        if (nombre_fichero or '').lower().endswith('.xlsx'):
+            if openpyxl is None:
+                raise UserError("La importación de ficheros XLSX requiere la librería openpyxl.")
+            libro = openpyxl.load_workbook(io.BytesIO(contenido), read_only=True, data_only=True)
+            filas = libro.active.iter_rows(values_only=True)
+            cabecera = [str(celda).strip() if celda is not None else '' for celda in next(filas, [])]
+            return [dict(zip(cabecera, fila)) for fila in filas if any(celda not in (None, '') for celda in fila)]
+        texto = contenido.decode('utf-8-sig')
+        return [fila for fila in csv.DictReader(io.StringIO(texto)) if any(fila.values())]
+
+    # API principal. filas es una lista de diccionarios {columna: valor}. Devuelve un resumen con los
+    # registros creados, los errores por fila (numeradas como en la hoja, contando la cabecera) y las filas por segundo.
+    @api.model
+    def importar(self, modelo, filas, tamano_lote=None):
+        if modelo not in self._COLUMNAS:
+            raise UserError(f"El modelo {modelo} no admite importación masiva.")
+        tamano_lote = tamano_lote or self._TAMANO_LOTE
+        inicio = time.perf_counter()
+        filas = list(filas)
+
+        # 1. Validación previa de todas las filas: las erróneas se descartan antes de tocar la base de datos
+        valores, errores = self._validar_filas(modelo, filas)
+
+        # 2. Creación por lotes; el recálculo de campos dependientes se hace una vez al final de cada lote
+        Modelo = self.env[modelo].with_context(tracking_disable=True)
+        creados = Modelo.browse()
+        for i in range(0, len(valores), tamano_lote):
+            lote = valores[i:i + tamano_lote]
+            try:
+                with self.env.cr.savepoint():
+                    registros = Modelo.create([vals for _num, vals in lote])
+                    self.env.flush_all()
+                creados |= registros
+            except Exception:
+                # El lote ha fallado: se repite fila a fila para aislar las erróneas
+                registros, errores_lote = self._crear_fila_a_fila(Modelo, lote)
+                creados |= registros
+                errores.extend(errores_lote)
+
+        segundos = time.perf_counter() - inicio
+        resultado = {
+            'modelo': modelo,
+            'filas': len(filas),
+            'creados': len(creados),
+            'ids': creados.ids,
+            'errores': sorted(errores, key=lambda error: error['fila']),
+            'segundos': round(segundos, 3),
+            'filas_por_segundo': round(len(filas) / segundos, 1) if segundos else 0.0,
+        }
+        _logger.info("Importación %s: %s filas, %s creadas, %s errores, %s filas/s",
+                     modelo, resultado['filas'], resultado['creados'], len(errores), resultado['filas_por_segundo'])
+        return resultado
+
+    @api.model
+    def _crear_fila_a_fila(self, Modelo, lote):
+        creados = Modelo.browse()
+        errores = []
+        for num_fila, vals in lote:
+            try:
+                with self.env.cr.savepoint():
+                    registro = Modelo.create(vals)
+                    self.env.flush_all()
+                creados |= registro
+            except Exception as e:
+                errores.append({'fila': num_fila, 'mensaje': str(e)})
+        return creados, errores
+
+    # Convierte y valida todas las filas. Devuelve la lista de (número de fila, valores) válidos y la lista de errores.
+    @api.model
+    def _validar_filas(self, modelo, filas):
+        Modelo = self.env[modelo]
+        columnas = self._COLUMNAS[modelo]
+        relaciones = self._resolver_relaciones(Modelo, columnas, filas)
+        valores, errores = [], []
+        for num_fila, fila in enumerate(filas, start=2):  # La fila 1 es la cabecera
+            vals, mensajes = {}, []
+            for columna in columnas:
+                celda = fila.get(columna)
+                if celda is None or (isinstance(celda, str) and not celda.strip()):
+                    continue
+                try:
+                    vals[columna] = self._convertir(Modelo._fields[columna], celda, relaciones)
+                except (TypeError, ValueError) as e:
+                    mensajes.append(f"{columna}: {e}")
+            desconocidas = [columna for columna in fila if columna and columna not in columnas]
+            if desconocidas:
+                mensajes.append(f"Columnas no admitidas: {', '.join(desconocidas)}")
+            if not vals.get('nombre'):
+                mensajes.append("El nombre es obligatorio.")
+            if vals.get('fecha_inicio') and vals.get('fecha_fin') and vals['fecha_inicio'] > vals['fecha_fin']:
+                mensajes.append("La fecha de inicio no puede ser posterior a la fecha de finalización.")
+            if mensajes:
+                errores.append({'fila': num_fila, 'mensaje': ' '.join(mensajes)})
+            else:
+                valores.append((num_fila, vals))
+        return valores, errores
+
+    # Resuelve en bloque los valores de las columnas Many2one: una búsqueda por modelo relacionado.
+    # Devuelve {(comodelo, valor de la celda): id}; los nombres repetidos en destino no se resuelven.
+    @api.model
+    def _resolver_relaciones(self, Modelo, columnas, filas):
+        pendientes = defaultdict(set)
+        for columna in columnas:
+            campo = Modelo._fields[columna]
+            if campo.type == 'many2one':
+                pendientes[campo.comodel_name].update(
+                    self._clave_celda(fila[columna]) for fila in filas if fila.get(columna) not in (None, '')
+                )
+        relaciones = {}
+        for comodelo, celdas in pendientes.items():
+            ids = {int(celda) for celda in celdas if celda.isdigit()}
+            for id_existente in self.env[comodelo].browse(ids).exists().ids:
+                relaciones[(comodelo, str(id_existente))] = id_existente
+            nombres = [celda for celda in celdas if not celda.isdigit()]
+            if nombres:
+                campo_busqueda = self._CAMPO_BUSQUEDA[comodelo]
+                encontrados = defaultdict(list)
+                for registro in self.env[comodelo].search_read([(campo_busqueda, 'in', nombres)], [campo_busqueda]):
+                    encontrados[registro[campo_busqueda]].append(registro['id'])
+                for nombre, ids_nombre in encontrados.items():
+                    relaciones[(comodelo, nombre)] = ids_nombre[0] if len(ids_nombre) == 1 else None
+        return relaciones
+
+    # Texto con el que se busca una celda de relación (las hojas XLSX devuelven los ids como 12.0).
+    @api.model
+    def _clave_celda(self, celda):
+        if isinstance(celda, float) and celda.is_integer():
+            celda = int(celda)
+        return str(celda).strip()
+
+    @api.model
+    def _convertir(self, campo, celda, relaciones):
+        if campo.type in ('char', 'text'):
+            return str(celda).strip()
+        if campo.type == 'float':
+            try:
+                return float(str(celda).replace(',', '.'))
+            except ValueError:
+                raise ValueError(f"'{celda}' no es un número.")
+        if campo.type == 'date':
+            # Las hojas XLSX pueden devolver números (p. ej. fechas en formato serie de Excel): solo se admiten textos y fechas
+            if not isinstance(celda, (str, date)):
+                raise ValueError(f"'{celda}' no es una fecha válida (AAAA-MM-DD).")
+            try:
+                return fields.Date.to_date(celda if not isinstance(celda, str) else celda.strip()[:10])
+            except (TypeError, ValueError):
+                raise ValueError(f"'{celda}' no es una fecha válida (AAAA-MM-DD).")
+        if campo.type == 'selection':
+            texto = str(celda).strip().lower()
+            for clave, etiqueta in campo.selection:
+                if texto in (clave, etiqueta.lower()):
+                    return clave
+            raise ValueError(f"'{celda}' no es un valor válido.")
+        if campo.type == 'many2one':
+            clave = (campo.comodel_name, self._clave_celda(celda))
+            if clave not in relaciones:
+                raise ValueError(f"'{celda}' no existe.")
+            if relaciones[clave] is None:
+                raise ValueError(f"'{celda}' es ambiguo: hay varios registros con ese nombre.")
+            return relaciones[clave]
+        raise ValueError("tipo de campo no soportado.")
@@ -0,0 +1,159 @@
+from odoo import models, fields, api  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
+from datetime import timedelta  # Para caducar los informes antiguos.
+import hashlib  # Para la clave de caché de cada informe.
+import json  # Para guardar los datos de entrada del informe.
+import logging  # Para registrar información y errores en el log de Odoo.
+
+_logger = logging.getLogger(__name__)
+
+
+class InformeTrabajo(models.Model):
+    _name = 'creativeminds.informe.trabajo'
+    _description = 'Cola de Informes de Métricas'
+    _order = 'id desc'
+
+    estado = fields.Selection([
+        ('pendiente', 'Pendiente'),
+        ('hecho', 'Generado'),
+        ('error', 'Error'),
+    ], string='Estado', default='pendiente', required=True, readonly=True, index=True)
+    agrupacion = fields.Selection([
+        ('ninguna', 'Sin secciones'),
+        ('proyecto', 'Por proyecto'),
+        ('cliente', 'Por cliente'),
+    ], string='Secciones', default='ninguna', required=True, readonly=True)
+    clave = fields.Char(string='Clave', readonly=True, index=True)  # Hash de los datos de entrada: informes idénticos comparten PDF
+    datos = fields.Text(string='Datos', readonly=True, prefetch=False)  # Entrada exacta del informe (JSON)
+    adjunto_id = fields.Many2one('ir.attachment', string='PDF', readonly=True, ondelete='set null')
+    fecha_generacion = fields.Datetime(string='Generado el', readonly=True)
+    error = fields.Text(string='Error', readonly=True)
+
+    # ------------------------------------------------------------------
+    # Petición
+    # ------------------------------------------------------------------
+
+    # Encola un informe de métricas. Si ya existe un PDF generado con los mismos datos se devuelve al momento, y si
+    # hay uno idéntico en cola no se encola otro. Devuelve la acción para el usuario (descarga o aviso).
+    @api.model
+    def encolar(self, proyectos=None, agrupacion='ninguna'):
+        datos = self._datos_informe(proyectos, agrupacion)
+        clave = hashlib.sha256(json.dumps(
+            {'informe': 'creativeminds.report_metricas', 'agrupacion': agrupacion, 'datos': datos},
+            sort_keys=True, default=str,
+        ).encode()).hexdigest()
+        existente = self.sudo().search([
+            ('clave', '=', clave), ('estado', 'in', ['pendiente', 'hecho']),
+        ], order='id desc', limit=1)
+        if existente.estado == 'hecho' and existente.adjunto_id:
+            return existente.action_descargar()
+        if not existente:
+            existente = self.sudo().create({'agrupacion': agrupacion, 'clave': clave, 'datos': json.dumps(datos, default=str)})
+            self.env.ref('creativeminds.ir_cron_generar_informes')._trigger()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': "Informe de Métricas",
+                'message': "El informe se está generando. Lo encontrarás en Informes de Métricas > Informes Generados.",
+                'type': 'info',
+                'next': {'type': 'ir.actions.act_window_close'},
+            },
+        }
+
+    # Datos del informe: métricas globales y, según la agrupación, una sección por proyecto o por cliente.
+    # Las secciones salen de los resúmenes por lotes de los proyectos (tres consultas en total, sin consultas por sección).
+    @api.model
+    def _datos_informe(self, proyectos, agrupacion):
+        datos = {'metrics': self.env['creativeminds.metrics.snapshot'].obtener_metricas(), 'secciones': []}
+        if agrupacion == 'ninguna':
+            return datos
+        Proyecto = self.env['creativeminds.proyecto']
+        proyectos = proyectos if proyectos else Proyecto.search([], order='id')
+        resumenes = proyectos.obtener_resumenes_proyectos()
+        if agrupacion == 'proyecto':
+            datos['secciones'] = [self._seccion(resumen['nombre'], [resumen]) for resumen in resumenes]
+            return datos
+        clientes = {fila['id']: fila['cliente'] or "Sin cliente" for fila in proyectos.read(['cliente'])}
+        por_cliente = {}
+        for resumen in resumenes:
+            por_cliente.setdefault(clientes[resumen['id']], []).append(resumen)
+        datos['secciones'] = [self._seccion(cliente, por_cliente[cliente]) for cliente in sorted(por_cliente)]
+        return datos
+
+    @api.model
+    def _seccion(self, titulo, resumenes):
+        return {
+            'titulo': titulo,
+            'proyectos': len(resumenes),
+            'progreso': sum(resumen['progreso'] or 0.0 for resumen in resumenes) / len(resumenes),
+            'presupuesto_estimado': sum(resumen['presupuesto']['estimado'] for resumen in resumenes),
+            'presupuesto_actual': sum(resumen['presupuesto']['actual'] for resumen in resumenes),
+            'tareas_total': sum(resumen['tareas']['total'] for resumen in resumenes),
+            'tareas_completadas': sum(resumen['tareas']['completadas'] for resumen in resumenes),
+            'tareas_pendientes': sum(resumen['tareas']['pendientes'] for resumen in resumenes),
+        }
+
+    def action_descargar(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/web/content/{self.adjunto_id.id}?download=true',
+            'target': 'self',
+        }
+
+    # ------------------------------------------------------------------
+    # Generación en segundo plano
+    # ------------------------------------------------------------------
+
+    # Tarea programada: genera los informes pendientes de uno en uno y confirma cada uno, para que un error o un
+    # tiempo agotado no obligue a repetir los anteriores. Las filas se reservan con SKIP LOCKED, así que varios
+    # procesos pueden vaciar la cola a la vez sin generar dos veces el mismo informe.
+    @api.model
+    def _cron_generar(self, limite=10):
+        for _i in range(limite):
+            self.env.cr.execute("""
+                SELECT id FROM creativeminds_informe_trabajo
+                 WHERE estado = 'pendiente'
+              ORDER BY id
+                 LIMIT 1
+                   FOR UPDATE SKIP LOCKED
+            """)
+            fila = self.env.cr.fetchone()
+            if not fila:
+                break
+            self.browse(fila[0])._generar()
+            self.env.cr.commit()
+        self._purgar()
+
+    def _generar(self):
+        self.ensure_one()
+        try:
+            with self.env.cr.savepoint():
+                # Otro trabajo con la misma clave puede haberse generado mientras este esperaba en la cola
+                generado = self.search([('clave', '=', self.clave), ('estado', '=', 'hecho'), ('adjunto_id', '!=', False)], limit=1)
+                adjunto = generado.adjunto_id
+                if not adjunto:
+                    contenido, _tipo = self.env['ir.actions.report']._render_qweb_pdf(
+                        'creativeminds.report_metricas', res_ids=[], data=json.loads(self.datos),
+                    )
+                    adjunto = self.env['ir.attachment'].create({
+                        'name': f"Informe_Metricas_{fields.Date.context_today(self)}.pdf",
+                        'raw': contenido,
+                        'mimetype': 'application/pdf',
+                        'res_model': self._name,
+                        'res_id': self.id,
+                    })
+                self.write({'estado': 'hecho', 'adjunto_id': adjunto.id, 'fecha_generacion': fields.Datetime.now(), 'error': False})
+        except Exception as e:
+            _logger.exception("No se ha podido generar el informe de métricas %s", self.id)
+            self.write({'estado': 'error', 'error': str(e)})
+
+    # Borra los trabajos (y sus PDF) de más de creativeminds.informes.dias_cache días.
+    @api.model
+    def _purgar(self):
+        dias = int(self.env['ir.config_parameter'].sudo().get_param('creativeminds.informes.dias_cache', 30))
+        antiguos = self.search([('create_date', '<', fields.Datetime.now() - timedelta(days=dias)), ('estado', '!=', 'pendiente')])
+        if antiguos:
+            adjuntos = antiguos.adjunto_id
+            antiguos.unlink()
+            adjuntos.filtered(lambda a: not self.search_count([('adjunto_id', '=', a.id)])).unlink()
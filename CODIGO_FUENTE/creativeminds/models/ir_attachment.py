@@ -0,0 +1,89 @@
+from odoo import models  # Importa los módulos necesarios de Odoo para extender modelos.
+
+
+class IrAttachment(models.Model):
+    _inherit = 'ir.attachment'
+
+    # Campos de metadatos que se copian tal cual; el contenido se enlaza después directamente en la base de datos.
+    _CAMPOS_COPIA_POR_REFERENCIA = [
+        'name', 'description', 'res_model', 'res_field', 'res_id', 'company_id',
+        'type', 'url', 'public', 'mimetype', 'index_content',
+    ]
+
+    # Copia los adjuntos de self sin leer ni volver a codificar su contenido. Cada copia apunta al mismo fichero
+    # del filestore (store_fname, direccionado por checksum) o recibe el mismo db_datas mediante un UPDATE en SQL.
+    # valores_lista contiene, en el mismo orden que self, los valores que cambian en cada copia (p. ej. res_id).
+    def _copiar_por_referencia(self, valores_lista):
+        if not self:
+            return self.browse()
+        datos = {dato['id']: dato for dato in self.read(self._CAMPOS_COPIA_POR_REFERENCIA, load=False)}
+        copias = self.create([
+            dict({campo: datos[adjunto.id][campo] for campo in self._CAMPOS_COPIA_POR_REFERENCIA}, **valores)
+            for adjunto, valores in zip(self, valores_lista)
+        ])
+        copias.flush_recordset()
+        self.env.cr.execute("""
+            UPDATE ir_attachment AS copia
+               SET store_fname = origen.store_fname,
+                   db_datas = origen.db_datas,
+                   checksum = origen.checksum,
+                   file_size = origen.file_size,
+                   mimetype = origen.mimetype
+              FROM unnest(%s::int[], %s::int[]) AS par(copia_id, origen_id)
+              JOIN ir_attachment AS origen ON origen.id = par.origen_id
+             WHERE copia.id = par.copia_id
+        """, [copias.ids, self.ids])
+        copias.invalidate_recordset()
+        return copias
+
+    # Resumen del espacio que ahorran los adjuntos del módulo al compartir fichero en el filestore.
+    # El filestore está direccionado por checksum: el mismo contenido (copias por referencia o subidas repetidas)
+    # se guarda una sola vez. Los adjuntos guardados en la base de datos (db_datas) cuentan siempre como propios.
+    def _informe_almacenamiento(self):
+        feedback = self.env['creativeminds.feedback']._fields['attachment_ids']
+        proyecto = self.env['creativeminds.proyecto']._fields['archivos_adicionales']
+        self.flush_model()
+        self.env.cr.execute(f'''
+            WITH adjuntos AS (
+                SELECT id, store_fname, COALESCE(file_size, 0) AS file_size
+                  FROM ir_attachment
+                 WHERE res_model LIKE 'creativeminds.%%'
+                    OR id IN (SELECT "{feedback.column2}" FROM "{feedback.relation}")
+                    OR id IN (SELECT "{proyecto.column2}" FROM "{proyecto.relation}")
+            ), ficheros AS (
+                SELECT store_fname, COUNT(*) AS adjuntos, MAX(file_size) AS file_size
+                  FROM adjuntos
+                 WHERE store_fname IS NOT NULL
+              GROUP BY store_fname
+            )
+            SELECT (SELECT COUNT(*) FROM adjuntos),
+                   (SELECT COUNT(*) FROM ficheros),
+                   (SELECT COUNT(*) FROM ficheros WHERE adjuntos > 1),
+                   (SELECT COALESCE(SUM(file_size), 0) FROM adjuntos),
+                   (SELECT COALESCE(SUM(file_size), 0) FROM ficheros)
+                 + (SELECT COALESCE(SUM(file_size), 0) FROM adjuntos WHERE store_fname IS NULL)
+        ''')
+        adjuntos, ficheros, compartidos, bytes_logicos, bytes_fisicos = self.env.cr.fetchone()
+        return {
+            'adjuntos': adjuntos,
+            'ficheros': ficheros,
+            'ficheros_compartidos': compartidos,
+            'bytes_logicos': bytes_logicos,  # Lo que ocuparían si cada adjunto tuviera su propia copia
+            'bytes_fisicos': bytes_fisicos,  # Lo que ocupan realmente
+            'bytes_ahorrados': bytes_logicos - bytes_fisicos,
+        }
+
+    # Muestra el informe de almacenamiento como notificación (acción de servidor del menú de informes).
+    def action_informe_almacenamiento(self):
+        informe = self.sudo()._informe_almacenamiento()
+        mensaje = (
+            f"{informe['adjuntos']} adjuntos en {informe['ficheros']} ficheros "
+            f"({informe['ficheros_compartidos']} compartidos). "
+            f"Ocupan {informe['bytes_fisicos'] / 1048576:.1f} MB de {informe['bytes_logicos'] / 1048576:.1f} MB: "
+            f"se ahorran {informe['bytes_ahorrados'] / 1048576:.1f} MB."
+        )
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {'title': "Almacenamiento de Adjuntos", 'message': mensaje, 'sticky': True, 'type': 'info'},
+        }
@@ -0,0 +1,220 @@
+from odoo import models, fields, api  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
+import logging  # Para registrar información y errores en el log de Odoo.
+
+_logger = logging.getLogger(__name__)
+
+# Campos de la cartera y de tareas: se mantienen por proyecto y los totales se suman al leer.
+CAMPOS_CARTERA = (
+    'total_proyectos', 'proyectos_en_progreso', 'proyectos_finalizados',
+    'suma_progreso', 'presupuesto_total', 'costo_actual_total',
+)
+CAMPOS_TAREAS = ('total_tareas', 'tareas_completadas', 'tareas_pendientes')
+
+
+class MetricsSnapshot(models.Model):
+    _name = 'creativeminds.metrics.snapshot'
+    _description = 'Instantánea de Métricas de la Cartera'
+    _rec_name = 'proyecto_id'
+
+    # Una fila por proyecto y una fila global (sin proyecto) que solo guarda los contadores de empleados
+    proyecto_id = fields.Many2one('creativeminds.proyecto', string='Proyecto', ondelete='cascade', readonly=True)  # Vacío en la fila global
+
+    # Métricas de proyectos
+    total_proyectos = fields.Integer(string='Total Proyectos', readonly=True)
+    proyectos_en_progreso = fields.Integer(string='Proyectos en Progreso', readonly=True)
+    proyectos_finalizados = fields.Integer(string='Proyectos Finalizados', readonly=True)
+    suma_progreso = fields.Float(string='Suma de Progreso', readonly=True)  # El promedio se obtiene al leer dividiendo entre total_proyectos
+    presupuesto_total = fields.Float(string='Presupuesto Total', readonly=True)
+    costo_actual_total = fields.Float(string='Costo Actual Total', readonly=True)
+
+    # Métricas de tareas
+    total_tareas = fields.Integer(string='Total Tareas', readonly=True)
+    tareas_completadas = fields.Integer(string='Tareas Completadas', readonly=True)
+    tareas_pendientes = fields.Integer(string='Tareas Pendientes', readonly=True)
+
+    # Métricas de empleados (solo en la fila global)
+    empleados_disponibles = fields.Integer(string='Empleados Disponibles', readonly=True)
+
+    fecha_reconciliacion = fields.Datetime(string='Última Reconciliación', readonly=True)
+
+    # Restricción SQL: una sola fila por proyecto.
+    _sql_constraints = [
+        ('proyecto_unico', 'UNIQUE(proyecto_id)', "Solo puede existir una instantánea por proyecto."),
+    ]
+
+    def init(self):
+        # UNIQUE(proyecto_id) admite varios NULL, así que la unicidad de la fila global se asegura con un índice parcial.
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS creativeminds_metrics_snapshot_global_unico
+                ON creativeminds_metrics_snapshot ((proyecto_id IS NULL)) WHERE proyecto_id IS NULL
+        """)
+        # El panel de la cartera usa la última modificación de la instantánea como versión de sus datos.
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS creativeminds_metrics_snapshot_write_date_idx
+                ON creativeminds_metrics_snapshot (write_date)
+        """)
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    # Devuelve las métricas de la cartera con las mismas claves que Proyecto.obtener_metricas.
+    # Los totales se suman al leer sobre las filas por proyecto: así ninguna escritura toca una fila compartida por
+    # toda la cartera. Las tareas sin proyecto no tienen fila y se cuentan aparte (índice de proyecto_id).
+    # Los proyectos retrasados dependen de la fecha actual, así que no se pueden mantener por deltas: se cuentan al leer.
+    @api.model
+    def obtener_metricas(self):
+        fila = self._fila_global()
+        if not fila:
+            fila = self._reconciliar()
+        self.env['creativeminds.tarea'].flush_model(['proyecto_id', 'estado'])
+        totales = self._sumar_filas()
+        self.env.cr.execute("""
+            SELECT COUNT(*),
+                   COUNT(*) FILTER (WHERE estado = 'completada'),
+                   COUNT(*) FILTER (WHERE estado = 'pendiente')
+              FROM creativeminds_tarea
+             WHERE proyecto_id IS NULL
+        """)
+        for campo, sin_proyecto in zip(CAMPOS_TAREAS, self.env.cr.fetchone()):
+            totales[campo] += sin_proyecto
+        total_proyectos = totales['total_proyectos']
+        Proyecto = self.env['creativeminds.proyecto']
+        proyectos_retrasados = Proyecto.search_count(Proyecto._dominio_retrasados())
+        return {
+            'total_proyectos': total_proyectos,
+            'proyectos_en_progreso': totales['proyectos_en_progreso'],
+            'proyectos_finalizados': totales['proyectos_finalizados'],
+            'proyectos_retrasados': proyectos_retrasados,
+            'progreso_promedio': totales['suma_progreso'] / total_proyectos if total_proyectos > 0 else 0,
+            'presupuesto_total': totales['presupuesto_total'],
+            'costo_actual_total': totales['costo_actual_total'],
+            'eficiencia_presupuestaria': (totales['costo_actual_total'] / totales['presupuesto_total'] * 100) if totales['presupuesto_total'] > 0 else 0,
+            'total_tareas': totales['total_tareas'],
+            'tareas_completadas': totales['tareas_completadas'],
+            'tareas_pendientes': totales['tareas_pendientes'],
+            'empleados_disponibles': fila.empleados_disponibles,
+        }
+
+    @api.model
+    def _fila_global(self):
+        return self.sudo().search([('proyecto_id', '=', False)], limit=1)
+
+    # ------------------------------------------------------------------
+    # Actualización incremental (llamada desde create/write/unlink de Proyecto, Tarea, Recurso y Empleado)
+    # ------------------------------------------------------------------
+
+    # Suma los deltas indicados a los contadores de empleados de la fila global con un UPDATE atómico (campo = campo + delta).
+    # Solo lo usan las altas, bajas y cambios de disponibilidad de los empleados, que son poco frecuentes.
+    @api.model
+    def _aplicar_delta_global(self, deltas):
+        deltas = {campo: valor for campo, valor in deltas.items() if valor}
+        if not deltas:
+            return
+        fila = self._fila_global()
+        if not fila:
+            # Sin fila global no hay sobre qué aplicar el delta: se reconstruye desde cero con el estado actual.
+            self._reconciliar()
+            return
+        asignaciones = ', '.join(f'{campo} = {campo} + %s' for campo in deltas)
+        self.env.cr.execute(
+            f"UPDATE creativeminds_metrics_snapshot SET {asignaciones}, write_date = now() at time zone 'UTC' WHERE id = %s",
+            [*deltas.values(), fila.id],
+        )
+        fila.invalidate_recordset(list(deltas))
+
+    # Vuelve a calcular las filas de los proyectos indicados. Cada escritura bloquea solo las filas de sus proyectos.
+    @api.model
+    def _refrescar_proyectos(self, proyectos):
+        ids = [proyecto_id for proyecto_id in proyectos.ids if proyecto_id]
+        if ids:
+            self._escribir_filas(ids)
+
+    # Suma las filas por proyecto: los totales de la cartera y de sus tareas.
+    @api.model
+    def _sumar_filas(self):
+        columnas = ', '.join(f'COALESCE(SUM({campo}), 0)' for campo in CAMPOS_CARTERA + CAMPOS_TAREAS)
+        self.env.cr.execute(f"SELECT {columnas} FROM creativeminds_metrics_snapshot WHERE proyecto_id IS NOT NULL")
+        return dict(zip(CAMPOS_CARTERA + CAMPOS_TAREAS, self.env.cr.fetchone()))
+
+    # Inserta o actualiza en una sola sentencia las filas de los proyectos indicados a partir de sus datos y de sus tareas.
+    @api.model
+    def _escribir_filas(self, ids):
+        self.env['creativeminds.proyecto'].flush_model(['estado', 'porcentaje_progreso', 'presupuesto_estimado', 'costo_total_recursos'])
+        self.env['creativeminds.tarea'].flush_model(['proyecto_id', 'estado'])
+        self.env.cr.execute("""
+            INSERT INTO creativeminds_metrics_snapshot (
+                proyecto_id, total_proyectos, proyectos_en_progreso, proyectos_finalizados, suma_progreso,
+                presupuesto_total, costo_actual_total, total_tareas, tareas_completadas, tareas_pendientes,
+                empleados_disponibles, create_uid, create_date, write_uid, write_date)
+            SELECT p.id, 1, (p.estado = 'en_progreso')::int, (p.estado = 'finalizado')::int,
+                   COALESCE(p.porcentaje_progreso, 0), COALESCE(p.presupuesto_estimado, 0), COALESCE(p.costo_total_recursos, 0),
+                   COALESCE(t.total, 0), COALESCE(t.completadas, 0), COALESCE(t.pendientes, 0),
+                   0, %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM creativeminds_proyecto p
+              LEFT JOIN (
+                    SELECT proyecto_id,
+                           COUNT(*) AS total,
+                           COUNT(*) FILTER (WHERE estado = 'completada') AS completadas,
+                           COUNT(*) FILTER (WHERE estado = 'pendiente') AS pendientes
+                      FROM creativeminds_tarea
+                     WHERE proyecto_id = ANY(%(ids)s)
+                  GROUP BY proyecto_id
+              ) t ON t.proyecto_id = p.id
+             WHERE p.id = ANY(%(ids)s)
+            ON CONFLICT (proyecto_id) DO UPDATE SET
+                total_proyectos = EXCLUDED.total_proyectos,
+                proyectos_en_progreso = EXCLUDED.proyectos_en_progreso,
+                proyectos_finalizados = EXCLUDED.proyectos_finalizados,
+                suma_progreso = EXCLUDED.suma_progreso,
+                presupuesto_total = EXCLUDED.presupuesto_total,
+                costo_actual_total = EXCLUDED.costo_actual_total,
+                total_tareas = EXCLUDED.total_tareas,
+                tareas_completadas = EXCLUDED.tareas_completadas,
+                tareas_pendientes = EXCLUDED.tareas_pendientes,
+                write_uid = EXCLUDED.write_uid,
+                write_date = EXCLUDED.write_date
+        """, {'ids': ids, 'uid': self.env.uid})
+        self.invalidate_model()
+
+    # ------------------------------------------------------------------
+    # Reconciliación completa
+    # ------------------------------------------------------------------
+
+    # Reconstruye todas las filas desde las tablas de origen y corrige cualquier desviación acumulada.
+    @api.model
+    def _reconciliar(self):
+        cr = self.env.cr
+        self.env.flush_all()
+        anterior = self._fila_global()
+        valores_anteriores = dict(self._sumar_filas(), empleados_disponibles=anterior.empleados_disponibles) if anterior else {}
+
+        # Filas por proyecto
+        cr.execute("DELETE FROM creativeminds_metrics_snapshot WHERE proyecto_id NOT IN (SELECT id FROM creativeminds_proyecto)")
+        cr.execute("SELECT id FROM creativeminds_proyecto")
+        self._escribir_filas([fila[0] for fila in cr.fetchall()])
+
+        # Fila global: contadores de empleados
+        cr.execute("SELECT COUNT(*) FROM creativeminds_empleado WHERE disponibilidad = 'disponible'")
+        valores = dict(self._sumar_filas(), empleados_disponibles=cr.fetchone()[0])
+
+        if anterior:
+            desviaciones = {
+                campo: (valores_anteriores[campo], valores[campo])
+                for campo in valores_anteriores
+                if round(valores_anteriores[campo] - valores[campo], 6)
+            }
+            if desviaciones:
+                _logger.warning("Instantánea de métricas desviada, se corrige: %s", desviaciones)
+            anterior.write({'empleados_disponibles': valores['empleados_disponibles'], 'fecha_reconciliacion': fields.Datetime.now()})
+            return anterior
+        return self.sudo().create({
+            'proyecto_id': False,
+            'empleados_disponibles': valores['empleados_disponibles'],
+            'fecha_reconciliacion': fields.Datetime.now(),
+        })
+
+    # Tarea programada que reconcilia periódicamente la instantánea.
+    @api.model
+    def _cron_reconciliar(self):
+        self._reconciliar()
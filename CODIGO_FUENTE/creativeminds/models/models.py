@@ -1,15 +1,32 @@
-from odoo import models, fields, api  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
+from odoo import models, fields, api, tools  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
 from odoo.exceptions import ValidationError  # Importa la excepción ValidationError para manejar errores de validación.
 from datetime import date  # Importa el módulo date para trabajar con fechas.
 import re  # Importa el módulo re para trabajar con expresiones regulares.
 from dateutil.relativedelta import relativedelta  # Para realizar operaciones con fechas, como sumar o restar periodos.
 from odoo.exceptions import UserError  # Para generar errores personalizados en Odoo.
+from odoo.tools import SQL, clean_context, float_compare  # Para consultas SQL compuestas, limpiar el contexto al crear registros derivados y comparar decimales.
 import logging # Para registrar información y errores en el log de Odoo.
+from collections import defaultdict  # Para acumular recuentos agrupados por proyecto.
 
 # Configuramos el logger para poder registrar información y errores
 
 _logger = logging.getLogger(__name__)
 
+
+# Cuenta, en una sola consulta agrupada sobre la tabla de relación, las filas de un Many2many
+# para cada registro guardado de 'registros'. Devuelve {id: recuento}.
+def _contar_relacion(registros, nombre_campo):
+    campo = registros._fields[nombre_campo]
+    ids = [id_ for id_ in registros._ids if isinstance(id_, int)]
+    if not ids:
+        return {}
+    registros.flush_model([nombre_campo])
+    registros.env.cr.execute(SQL(
+        "SELECT %s, COUNT(*) FROM %s WHERE %s = ANY(%s) GROUP BY %s",
+        SQL.identifier(campo.column1), SQL.identifier(campo.relation), SQL.identifier(campo.column1), ids, SQL.identifier(campo.column1),
+    ))
+    return dict(registros.env.cr.fetchall())
+
 class Proyecto(models.Model):
     _name = 'creativeminds.proyecto'  # Nombre técnico del modelo en Odoo.
     _description = 'Proyecto'  # Descripción del modelo.
@@ -28,14 +45,17 @@ class Proyecto(models.Model):
 
     @api.depends('costo_por_hora', 'horas_asignadas')
     def _calcular_costo_total(self):
-        # Calcula el costo total del proyecto como el producto de costo por hora y horas asignadas
-        self.costo_total = self.costo_por_hora * self.horas_asignadas
+        # Calcula el costo total de cada proyecto como el producto de costo por hora y horas asignadas
+        for proyecto in self:
+            proyecto.costo_total = proyecto.costo_por_hora * proyecto.horas_asignadas
 
-    @api.constrains('costo_por_hora', 'horas_asignadas')
+    # Regla: el costo por hora y las horas asignadas deben ser valores positivos
     def _verificar_costo_y_horas(self):
-        # Verifica que el costo por hora y las horas asignadas sean valores positivos
-        if self.costo_por_hora < 0 or self.horas_asignadas < 0:
-            raise ValidationError("El costo por hora y las horas asignadas deben ser valores positivos.")
+        return [
+            self._infraccion(record, "El costo por hora y las horas asignadas deben ser valores positivos.")
+            for record in self
+            if record.costo_por_hora < 0 or record.horas_asignadas < 0
+        ]
    
     # Campos relacionados con el estado y seguimiento del proyecto
     estado = fields.Selection([  # Estado del proyecto
@@ -43,18 +63,21 @@ class Proyecto(models.Model):
         ('en_progreso', 'En progreso'),
         ('finalizado', 'Finalizado'),
         ('detenido', 'Detenido'),
-    ], string='Estado del Proyecto', default='planificacion', tracking=True)
+    ], string='Estado del Proyecto', default='planificacion', index=True, tracking=True,
+        group_expand='_expandir_estados')  # El kanban muestra todas las columnas, aunque estén vacías
+    # El tracking deja el cambio en el historial como nota interna (ver _track_subtype); a los seguidores se les
+    # avisa con el resumen agrupado del notificador (ver write)
     
     porcentaje_progreso = fields.Float(  # Porcentaje de progreso calculado
         string='Porcentaje de Progreso',
         compute='_calcular_progreso',
         store=True,
-        tracking=True
-    )
+        group_operator='avg',  # Al agrupar se muestra el progreso medio, no la suma
+    )  # Sin tracking: los cambios se notifican agrupados por el notificador (creativeminds.notificacion)
     
     # Fechas del proyecto
     fecha_inicio = fields.Date(string='Fecha de Inicio')  # Fecha de inicio del proyecto
-    fecha_fin = fields.Date(string='Fecha de Finalización')  # Fecha de finalización del proyecto
+    fecha_fin = fields.Date(string='Fecha de Finalización', index=True)  # Fecha de finalización del proyecto
     
     # Prioridad y responsables
     prioridad = fields.Selection([  # Nivel de prioridad del proyecto
@@ -70,11 +93,13 @@ class Proyecto(models.Model):
         tracking=True
     )
 
-    @api.constrains('responsable_id')
+    # Regla: fuera de planificación el proyecto necesita un responsable
     def _verificar_responsable(self):
-        for record in self:
-            if record.estado not in ['planificacion'] and not record.responsable_id:
-                raise ValidationError("Debe asignar un responsable antes de cambiar el estado del proyecto.")
+        return [
+            self._infraccion(record, "Debe asignar un responsable antes de cambiar el estado del proyecto.")
+            for record in self
+            if record.estado not in ['planificacion'] and not record.responsable_id
+        ]
 
     
    
@@ -87,26 +112,44 @@ class Proyecto(models.Model):
 
     @api.depends('recursos_ids.costo_total')
     def _calcular_costo_total_recursos(self):
-        # Calcula el costo total de los recursos asignados al proyecto
-        self.costo_total_recursos = sum(self.recursos_ids.mapped('costo_total'))
+        # Calcula el costo total de los recursos de todos los proyectos con una sola consulta agrupada.
+        # Los proyectos aún no guardados (formularios en edición) suman los recursos que tienen en memoria.
+        guardados = self.filtered(lambda p: isinstance(p.id, int))
+        costos = {}
+        if guardados:
+            costos = {
+                proyecto.id: costo
+                for proyecto, costo in self.env['creativeminds.recurso']._read_group(
+                    [('proyecto_id', 'in', guardados.ids)], ['proyecto_id'], ['costo_total:sum'],
+                )
+            }
+        for proyecto in self:
+            if proyecto in guardados:
+                proyecto.costo_total_recursos = costos.get(proyecto.id) or 0.0
+            else:
+                proyecto.costo_total_recursos = sum(proyecto.recursos_ids.mapped('costo_total'))
 
-    @api.constrains('presupuesto_estimado', 'costo_total_recursos')
+    # Regla: el costo total de los recursos no puede exceder el presupuesto estimado
     def _verificar_presupuesto(self):
-        # Verifica que el costo total de los recursos no exceda el presupuesto estimado
-        if self.costo_total_recursos > self.presupuesto_estimado:
-            raise ValidationError(
-                f"El costo total de recursos ({self.costo_total_recursos}) "
-                f"excede el presupuesto estimado ({self.presupuesto_estimado})"
+        return [
+            self._infraccion(
+                record,
+                f"El costo total de recursos ({record.costo_total_recursos}) "
+                f"excede el presupuesto estimado ({record.presupuesto_estimado})"
             )
+            for record in self
+            if record.costo_total_recursos > record.presupuesto_estimado
+        ]
 
     # Relaciones con tareas e indicadores
     tareas_ids = fields.One2many('creativeminds.tarea', 'proyecto_id', string='Tareas')  # Tareas asociadas al proyecto
     indicadores_ids = fields.One2many('creativeminds.kpi', 'proyecto_id', string='Indicadores de Desempeño')  # Indicadores de desempeño asociados al proyecto
 
     # Archivos y documentación
-    imagen_proyecto = fields.Binary(string='Imagen del Proyecto', attachment=True)  # Imagen del proyecto
+    # Los binarios nunca se precargan con el resto del registro: solo se leen al abrir el formulario o descargarlos
+    imagen_proyecto = fields.Binary(string='Imagen del Proyecto', attachment=True, prefetch=False)  # Imagen del proyecto
     imagen_filename = fields.Char(string='Nombre del archivo de imagen')  # Nombre del archivo de imagen
-    documentacion_tecnica = fields.Binary(string='Documentación Técnica', attachment=True)  # Documentación técnica del proyecto
+    documentacion_tecnica = fields.Binary(string='Documentación Técnica', attachment=True, prefetch=False)  # Documentación técnica del proyecto
     documentacion_filename = fields.Char(string='Nombre del archivo de documentación')  # Nombre del archivo de documentación
 
     # Archivos adicionales
@@ -128,73 +171,234 @@ class Proyecto(models.Model):
     # Configuración para recordatorios automáticos
     recordatorios_automaticos = fields.Boolean(string='Activar Recordatorios Automáticos')
 
-    # Verificación de fechas del proyecto
-    @api.constrains('fecha_inicio', 'fecha_fin')
+    # Regla: la fecha de inicio no puede ser posterior a la fecha de finalización
     def _verificar_fechas_proyecto(self):
-        # Asegura que la fecha de inicio no sea posterior a la fecha de finalización
-        if self.fecha_inicio and self.fecha_fin and self.fecha_inicio > self.fecha_fin:
-            raise ValidationError("La fecha de inicio no puede ser posterior a la fecha de finalización.")
+        return [
+            self._infraccion(record, "La fecha de inicio no puede ser posterior a la fecha de finalización.")
+            for record in self
+            if record.fecha_inicio and record.fecha_fin and record.fecha_inicio > record.fecha_fin
+        ]
 
-    @api.constrains('presupuesto_estimado')
+    # Regla: el presupuesto estimado debe ser positivo y suficiente para los recursos y tareas
     def _verificar_presupuesto_estimado(self):
-        # Verifica que el presupuesto estimado sea válido y suficiente para los recursos y tareas
-        if self.presupuesto_estimado <= 0:
-            raise ValidationError("El presupuesto estimado debe ser mayor que cero.")
-        num_recursos = len(self.recursos_ids)
-        num_tareas = len(self.tareas_ids)
-        presupuesto_requerido = (num_recursos * 500) + (num_tareas * 200)  # Estimación de presupuesto requerido
-        if (num_recursos > 0 or num_tareas > 0) and self.presupuesto_estimado < presupuesto_requerido:
-            raise ValidationError(
-                f"El presupuesto ({self.presupuesto_estimado}) es insuficiente. "
-                f"Se requieren al menos {round(presupuesto_requerido, 2)} para cubrir recursos y tareas."
+        errores = []
+        num_recursos = self._contar_por_proyecto('creativeminds.recurso')
+        num_tareas = self._contar_por_proyecto('creativeminds.tarea')
+        for record in self:
+            if record.presupuesto_estimado <= 0:
+                errores.append(self._infraccion(record, "El presupuesto estimado debe ser mayor que cero."))
+                continue
+            presupuesto_requerido = (num_recursos[record.id] * 500) + (num_tareas[record.id] * 200)  # Estimación de presupuesto requerido
+            if presupuesto_requerido > 0 and record.presupuesto_estimado < presupuesto_requerido:
+                errores.append(self._infraccion(
+                    record,
+                    f"El presupuesto ({record.presupuesto_estimado}) es insuficiente. "
+                    f"Se requieren al menos {round(presupuesto_requerido, 2)} para cubrir recursos y tareas."
+                ))
+        return errores
+
+    # Reglas de validación del proyecto y campos que disparan cada una (equivalen a los antiguos @api.constrains).
+    _REGLAS_VALIDACION = {
+        '_verificar_costo_y_horas': ('costo_por_hora', 'horas_asignadas'),
+        '_verificar_responsable': ('responsable_id',),
+        '_verificar_presupuesto': ('presupuesto_estimado', 'costo_total_recursos'),
+        '_verificar_fechas_proyecto': ('fecha_inicio', 'fecha_fin'),
+        '_verificar_presupuesto_estimado': ('presupuesto_estimado',),
+        '_verificar_campos_importantes': ('descripcion', 'cliente', 'responsable_id'),
+        '_verificar_campos_planificacion': ('riesgos', 'hitos'),
+        '_verificar_recursos_minimos': ('recursos_ids',),
+        '_verificar_fechas_y_tareas': ('fecha_inicio', 'fecha_fin', 'estado', 'tareas_ids'),
+    }
+
+    # Capa de validación por lotes: cuando se escriben los campos de una regla, la regla se evalúa para todo el
+    # lote con consultas agrupadas (en lugar de registro a registro) y todas las infracciones se notifican juntas.
+    def _validate_fields(self, field_names, excluded_names=()):
+        campos = set(field_names)
+        excluidos = set(excluded_names)
+        reglas = [
+            regla for regla, disparadores in self._REGLAS_VALIDACION.items()
+            if not campos.isdisjoint(disparadores) and excluidos.isdisjoint(disparadores)
+        ]
+        if reglas:
+            self._validar_lote(reglas)
+        return super(Proyecto, self)._validate_fields(field_names, excluded_names)
+
+    # Evalúa las reglas indicadas sobre todos los registros y lanza un único error con todas las infracciones.
+    def _validar_lote(self, reglas):
+        errores = []
+        for regla in reglas:
+            errores.extend(getattr(self, regla)())
+        if errores:
+            raise ValidationError("\n".join(dict.fromkeys(errores)))  # Sin repetir mensajes idénticos
+
+    # Mensaje de una infracción; en validaciones de varios proyectos se indica a cuál corresponde.
+    def _infraccion(self, record, mensaje):
+        return f"{record.nombre}: {mensaje}" if len(self) > 1 else mensaje
+
+    # Número de registros del modelo indicado por proyecto del lote, con una sola consulta agrupada.
+    def _contar_por_proyecto(self, modelo):
+        return defaultdict(int, {
+            proyecto.id: cantidad
+            for proyecto, cantidad in self.env[modelo]._read_group(
+                [('proyecto_id', 'in', self.ids)], ['proyecto_id'], ['__count'],
             )
+        })
 
-    # Sobrescribimos el método 'create' para agregar lógica adicional al crear un proyecto.
-    @api.model
-    def create(self, valores):
-        if 'responsable_id' not in valores or not valores['responsable_id']:
-            raise ValidationError("Es necesario asignar un responsable al proyecto.")
-        
-        proyecto = super(Proyecto, self).create(valores) # Crear el proyecto como se haría normalmente.
+    # Sobrescribimos el método 'create' para agregar lógica adicional al crear proyectos (admite varios a la vez).
+    @api.model_create_multi
+    def create(self, vals_list):
+        for valores in vals_list:
+            if 'responsable_id' not in valores or not valores['responsable_id']:
+                raise ValidationError("Es necesario asignar un responsable al proyecto.")
+
+        proyectos = super(Proyecto, self).create(vals_list) # Crear los proyectos como se haría normalmente.
         # Si los recordatorios automáticos están activados y el proyecto tiene un responsable asignado,
-        # se crea una tarea inicial y se envía un recordatorio.
-        if proyecto.recordatorios_automaticos and proyecto.responsable_id:
-            self.env['creativeminds.tarea'].create({
+        # se crea una tarea inicial (todas en una sola llamada) y se encola un recordatorio, que enviará la tarea programada.
+        con_recordatorio = proyectos.filtered(lambda p: p.recordatorios_automaticos and p.responsable_id)
+        if con_recordatorio:
+            self.env['creativeminds.tarea'].create([{
                 'nombre': f'Tarea inicial de proyecto: {proyecto.nombre}',# Nombre de la tarea inicial.
                 'proyecto_id': proyecto.id,  # Asociamos la tarea al proyecto.
                 'responsable_id': proyecto.responsable_id.id,  # Asignamos al responsable del proyecto.
                 'estado': 'pendiente',  # La tarea está pendiente al principio.
-            })
-            self.enviar_recordatorio(proyecto)  # Enviamos un recordatorio al responsable.
-        return proyecto  # Devolvemos el proyecto creado.
+            } for proyecto in con_recordatorio])
+            self.env['creativeminds.recordatorio'].sudo()._encolar(con_recordatorio)  # Encolamos un recordatorio al responsable.
+        self.env['creativeminds.metrics.snapshot'].sudo()._refrescar_proyectos(proyectos)  # Actualizamos la instantánea de métricas.
+        for campo in self._INDICADORES_AUTOMATICOS:  # Creamos los indicadores automáticos con su primera muestra.
+            proyectos._actualizar_indicadores(campo)
+        return proyectos  # Devolvemos los proyectos creados.
+
+    def init(self):
+        # Índice compuesto para los filtros por estado y fecha de fin (proyectos retrasados, tableros por estado).
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS creativeminds_proyecto_estado_fecha_fin_idx
+                ON creativeminds_proyecto (estado, fecha_fin)
+        """)
+
+    # Estados en los que el proyecto sigue abierto. El filtro de retrasados usa 'in' en lugar de
+    # '!= finalizado' para que PostgreSQL pueda recorrer el índice (estado, fecha_fin); los proyectos sin estado
+    # se incluyen aparte con 'estado IS NULL' (también sale del índice), igual que los incluía '!= finalizado'.
+    _ESTADOS_ABIERTOS = ['planificacion', 'en_progreso', 'detenido']
+
+    @api.model
+    def _dominio_retrasados(self):
+        return [
+            '|', ('estado', '=', False), ('estado', 'in', self._ESTADOS_ABIERTOS),
+            ('fecha_fin', '<', fields.Date.today()),
+        ]
+
+    # Los mensajes de tracking se publican como nota interna: quedan en el historial del proyecto pero no se
+    # notifican a los seguidores, que ya reciben los cambios de estado en el resumen del notificador.
+    def _track_subtype(self, init_values):
+        self.ensure_one()
+        if 'estado' in init_values:
+            return self.env.ref('mail.mt_note')
+        return super(Proyecto, self)._track_subtype(init_values)
+
+    # Campos del proyecto que alteran sus métricas cuando se escriben.
+    _CAMPOS_METRICAS = {'estado', 'presupuesto_estimado', 'tareas_ids', 'recursos_ids'}
+
+    # Sobrescribimos 'write' para trasladar a la instantánea de métricas los cambios del proyecto
+    # y registrar los cambios de estado en el notificador.
+    def write(self, valores):
+        estados_anteriores = {proyecto.id: proyecto.estado for proyecto in self} if 'estado' in valores else {}
+        Carga = self.env['creativeminds.carga.semanal'].sudo()
+        recursos = self.env['creativeminds.recurso']
+        if 'fecha_inicio' in valores or 'fecha_fin' in valores:  # Los recursos sin fechas propias usan las del proyecto
+            recursos = self.recursos_ids.filtered(lambda r: not r.fecha_inicio or not r.fecha_fin)
+        carga_anterior = Carga._contribuciones(recursos=recursos) if recursos else {}
+        res = super(Proyecto, self).write(valores)
+        if self._CAMPOS_METRICAS.intersection(valores):
+            self.env['creativeminds.metrics.snapshot'].sudo()._refrescar_proyectos(self)
+        if recursos:
+            Carga._aplicar_cambio(carga_anterior, Carga._contribuciones(recursos=recursos))
+        if estados_anteriores:
+            self.env['creativeminds.notificacion'].sudo()._registrar('estado', [
+                (proyecto, estados_anteriores[proyecto.id], proyecto.estado)
+                for proyecto in self
+                if proyecto.estado != estados_anteriores[proyecto.id]
+            ])
+        return res
+
+    # Campos calculados cuyos cambios se trasladan al indicador automático (creativeminds.kpi con esa métrica) del
+    # proyecto, que guarda cada valor en su histórico. Los indicadores se crean con el proyecto; el nombre es solo la
+    # etiqueta inicial y el usuario puede cambiarlo.
+    _INDICADORES_AUTOMATICOS = {
+        'porcentaje_progreso': 'Progreso del Proyecto',
+        'costo_total_recursos': 'Costo Total de Recursos',
+    }
+
+    # Los cambios de progreso y de coste se producen al recalcular el campo (no pasan por el write del proyecto), así
+    # que los registran los create/write/unlink de tareas y recursos: guardan antes el valor de cada proyecto con
+    # _valores_indicador y, una vez escrito el cambio, llaman a _registrar_cambios_indicador. Leer el campo entonces
+    # lo recalcula fuera del flush, así que las notificaciones y los indicadores se escriben como cualquier otro registro.
+    def _valores_indicador(self, campo):
+        return {proyecto.id: proyecto[campo] for proyecto in self if isinstance(proyecto.id, int)}
+
+    @api.model
+    def _registrar_cambios_indicador(self, campo, anteriores):
+        cambiados = self.browse(list(anteriores)).exists().filtered(
+            lambda proyecto: float_compare(anteriores[proyecto.id], proyecto[campo], precision_digits=2)
+        )
+        if not cambiados:
+            return
+        if campo == 'porcentaje_progreso' and not self.env.context.get('mail_notrack'):
+            self.env['creativeminds.notificacion'].sudo()._registrar('progreso', [
+                (proyecto, anteriores[proyecto.id], proyecto.porcentaje_progreso) for proyecto in cambiados
+            ])
+        cambiados._actualizar_indicadores(campo)
+
+    # Sobrescribimos 'unlink' para recalcular el número de proyectos de sus empleados
+    # (las filas de la instantánea de métricas se borran por cascada) y descontar de la carga semanal los recursos
+    # sin fechas propias: siguen existiendo (proyecto_id pasa a NULL), pero ya no tienen periodo en el que situarse.
+    def unlink(self):
+        empleados = self.empleado_id
+        Carga = self.env['creativeminds.carga.semanal'].sudo()
+        recursos = self.recursos_ids.filtered(lambda r: not r.fecha_inicio or not r.fecha_fin)
+        carga_anterior = Carga._contribuciones(recursos=recursos) if recursos else {}
+        res = super(Proyecto, self).unlink()
+        empleados.exists()._recalcular_pertenencias(['n_proyectos'])
+        if recursos:
+            Carga._aplicar_cambio(carga_anterior, Carga._contribuciones(recursos=recursos.exists()))
+        return res
     
     # Método que actualiza el indicador de progreso del proyecto.
     def actualizar_progreso_indicador(self):
-        # Buscamos el indicador específico relacionado con el progreso del proyecto.
-        indicador = self.env['creativeminds.indicador'].search([
-            ('proyecto_id', '=', self.id),
-            ('nombre', '=', 'Progreso del Proyecto')
-        ], limit=1)
-        if indicador:  # Si el indicador existe, actualizamos su valor.
-            indicador.write({'valor': self.porcentaje_progreso})
+        self._actualizar_indicadores('porcentaje_progreso')
         return True
 
-    # Método que envía una notificación al responsable del proyecto sobre el cambio de estado o progreso.
-    def enviar_notificacion_proyecto(self, tipo_notificacion='estado'):
-        if not self.responsable_id:  # Si no hay responsable, no se envía notificación.
+    # Copia el valor del campo en el indicador automático de cada proyecto, creándolo si aún no existe (proyectos
+    # anteriores a los indicadores automáticos o indicadores borrados a mano). Se escribe una vez por valor distinto,
+    # no por indicador (los progresos suelen repetirse: 0, 50, 100...).
+    def _actualizar_indicadores(self, campo):
+        proyectos = self.filtered(lambda p: isinstance(p.id, int))
+        if not proyectos:
             return
-        # Determinamos el asunto de la notificación según el tipo.
-        asunto = f"Cambio de Estado: Proyecto {self.nombre}" if tipo_notificacion == 'estado' else f"Actualización de Progreso: Proyecto {self.nombre}"
-        # Construimos el mensaje de notificación en formato HTML.
-        mensaje = f"<p>Hola {self.responsable_id.name},</p>"
-        mensaje += f"<p>El estado del proyecto <b>{self.nombre}</b> ha cambiado a <b>{dict(self._fields['estado'].selection).get(self.estado)}</b>.</p>"
-        mensaje += f"<p>Progreso actual: {round(self.porcentaje_progreso, 2)}%</p>"
-        # Enviamos el mensaje por correo utilizando el sistema de mensajes de Odoo.
-        self.message_post(
-            body=mensaje,
-            subject=asunto,
-            partner_ids=[self.responsable_id.partner_id.id]  # Enviamos el mensaje al partner del responsable.
-        )
+        KPI = self.env['creativeminds.kpi'].sudo()
+        indicadores = KPI.search([('proyecto_id', 'in', proyectos.ids), ('metrica', '=', campo)])
+        KPI.create([{
+            'proyecto_id': proyecto.id,
+            'nombre': self._INDICADORES_AUTOMATICOS[campo],
+            'metrica': campo,
+            'valor': proyecto[campo],
+        } for proyecto in proyectos - indicadores.proyecto_id])
+        por_valor = defaultdict(lambda: self.env['creativeminds.kpi'].sudo())
+        for indicador in indicadores:
+            valor = indicador.proyecto_id[campo]
+            if float_compare(indicador.valor, valor, precision_digits=2):
+                por_valor[valor] |= indicador
+        for valor, grupo in por_valor.items():
+            grupo.write({'valor': valor})
+
+    # Método que solicita una notificación manual del estado o progreso actual del proyecto.
+    # No publica nada directamente: el evento pasa por el notificador, que lo agrupa con el resto
+    # de cambios del proyecto y lo incluye en el resumen del responsable.
+    def enviar_notificacion_proyecto(self, tipo_notificacion='estado'):
+        proyectos = self.filtered('responsable_id')  # Sin responsable no hay destinatario.
+        campo = 'estado' if tipo_notificacion == 'estado' else 'porcentaje_progreso'
+        self.env['creativeminds.notificacion'].sudo()._registrar(tipo_notificacion, [
+            (proyecto, False, proyecto[campo]) for proyecto in proyectos
+        ])
 
     # Método que envía un recordatorio al responsable del proyecto sobre las tareas pendientes.
     def enviar_recordatorio(self, proyecto):
@@ -214,54 +418,150 @@ class Proyecto(models.Model):
             partner_ids=[proyecto.responsable_id.partner_id.id]  # Enviamos el mensaje al partner del responsable.
         )
         # Creamos una actividad para el responsable para asegurarnos de que se realice el seguimiento de las tareas pendientes.
-        actividad_tipo = self.env.ref('mail.mail_activity_data_todo')
-        modelo_id = self.env['ir.model']._get_id('creativeminds.proyecto')
+        # El tipo de actividad y el modelo se resuelven una sola vez por proceso (ambos están en caché).
         self.env['mail.activity'].create({
-            'activity_type_id': actividad_tipo.id,
-            'res_model_id': modelo_id,
+            'activity_type_id': self._id_tipo_actividad_recordatorio(),
+            'res_model_id': self.env['ir.model']._get_id('creativeminds.proyecto'),
             'res_id': proyecto.id,
-            'user_id': proyecto.responsable_id.id,
+            # La actividad se asigna al usuario del contacto del responsable (o al usuario actual si no tiene).
+            'user_id': proyecto.responsable_id.partner_id.user_ids[:1].id or self.env.uid,
             'summary': f"Recordatorio: {proyecto.nombre} - Tareas pendientes",
             'note': f"Este es un recordatorio para que revises las tareas pendientes del proyecto {proyecto.nombre}.",
         })
 
-    # Método que calcula el porcentaje de progreso del proyecto basado en las tareas completadas.
+    # Identificador del tipo de actividad "Por hacer" usado en los recordatorios, guardado en caché.
+    @api.model
+    @tools.ormcache()
+    def _id_tipo_actividad_recordatorio(self):
+        return self.env.ref('mail.mail_activity_data_todo').id
+
+    # Método que calcula el porcentaje de progreso de los proyectos basado en las tareas completadas.
+    # Los recuentos de todos los proyectos del lote salen de una sola consulta agrupada por proyecto y estado.
     @api.depends('tareas_ids.estado')
     def _calcular_progreso(self):
-        total_tareas = len(self.tareas_ids)  # Contamos el total de tareas.
-        tareas_completadas = len(self.tareas_ids.filtered(lambda t: t.estado == 'completada'))
-        # Calculamos el progreso como el porcentaje de tareas completadas.
-        self.porcentaje_progreso = (tareas_completadas / total_tareas * 100) if total_tareas > 0 else 0.0
+        guardados = self.filtered(lambda p: isinstance(p.id, int))
+        totales = defaultdict(int)
+        completadas = defaultdict(int)
+        if guardados:
+            for proyecto, estado, cantidad in self.env['creativeminds.tarea']._read_group(
+                [('proyecto_id', 'in', guardados.ids)], ['proyecto_id', 'estado'], ['__count'],
+            ):
+                totales[proyecto.id] += cantidad
+                if estado == 'completada':
+                    completadas[proyecto.id] += cantidad
+        for proyecto in self:
+            if proyecto in guardados:
+                total_tareas = totales[proyecto.id]
+                tareas_completadas = completadas[proyecto.id]
+            else:  # Proyecto en edición: contamos las tareas en memoria.
+                total_tareas = len(proyecto.tareas_ids)
+                tareas_completadas = len(proyecto.tareas_ids.filtered(lambda t: t.estado == 'completada'))
+            # Calculamos el progreso como el porcentaje de tareas completadas.
+            proyecto.porcentaje_progreso = (tareas_completadas / total_tareas * 100) if total_tareas > 0 else 0.0
  
+    @api.model
+    def _expandir_estados(self, estados, domain, order):
+        return [clave for clave, _etiqueta in self._fields['estado'].selection]
+
+    # Agregados por columna del kanban (estado) calculados en una sola consulta agrupada: número de proyectos,
+    # presupuesto sumado y progreso medio. Los pinta la cabecera de columna de static/src/js/proyecto_kanban.js.
+    @api.model
+    def obtener_agregados_kanban(self, dominio=None):
+        grupos = {
+            estado: (total, presupuesto, progreso)
+            for estado, total, presupuesto, progreso in self._read_group(
+                dominio or [], ['estado'], ['__count', 'presupuesto_estimado:sum', 'porcentaje_progreso:avg'],
+            )
+        }
+        agregados = []
+        for estado, etiqueta in self._fields['estado'].selection:
+            total, presupuesto, progreso = grupos.get(estado, (0, 0.0, 0.0))
+            agregados.append({
+                'estado': estado,
+                'etiqueta': etiqueta,
+                'proyectos': total,
+                'presupuesto': presupuesto or 0.0,
+                'progreso_medio': progreso or 0.0,
+            })
+        return agregados
+
     # Método que obtiene un resumen detallado del proyecto.
     def obtener_resumen_proyecto(self):
         self.ensure_one()  # Aseguramos que solo haya un registro.
-        return {
-            'nombre': self.nombre,
-            'estado': self.estado,
-            'progreso': self.porcentaje_progreso,
-            'presupuesto': {
-                'estimado': self.presupuesto_estimado,
-                'actual': self.costo_total_recursos,
-                'disponible': self.presupuesto_estimado - self.costo_total_recursos
-            },
-            'tareas': {
-                'total': len(self.tareas_ids),
-                'completadas': len(self.tareas_ids.filtered(lambda t: t.estado == 'completada')),
-                'en_progreso': len(self.tareas_ids.filtered(lambda t: t.estado == 'en_progreso')),
-                'pendientes': len(self.tareas_ids.filtered(lambda t: t.estado == 'pendiente'))
-            }
+        return self.obtener_resumenes_proyectos()[0]
+
+    # Resúmenes de todos los proyectos de self, en el mismo orden, con tres consultas en total sea cual sea
+    # el número de proyectos: lectura de los proyectos, recuento de tareas por estado y costes de recursos.
+    # Pensado para RPC/JSON: la portada de la cartera pide cientos de resúmenes en una sola llamada.
+    def obtener_resumenes_proyectos(self):
+        if not self:
+            return []
+        tareas = defaultdict(lambda: defaultdict(int))
+        for proyecto, estado, cantidad in self.env['creativeminds.tarea']._read_group(
+            [('proyecto_id', 'in', self.ids)], ['proyecto_id', 'estado'], ['__count'],
+        ):
+            tareas[proyecto.id][estado] += cantidad
+        recursos = {
+            proyecto.id: (costo or 0.0, cantidad)
+            for proyecto, costo, cantidad in self.env['creativeminds.recurso']._read_group(
+                [('proyecto_id', 'in', self.ids)], ['proyecto_id'], ['costo_total:sum', '__count'],
+            )
         }
+        resumenes = []
+        for proyecto in self.read(['nombre', 'estado', 'porcentaje_progreso', 'presupuesto_estimado']):
+            por_estado = tareas[proyecto['id']]
+            costo_actual, n_recursos = recursos.get(proyecto['id'], (0.0, 0))
+            presupuesto = proyecto['presupuesto_estimado'] or 0.0
+            resumenes.append({
+                'id': proyecto['id'],
+                'nombre': proyecto['nombre'],
+                'estado': proyecto['estado'],
+                'progreso': proyecto['porcentaje_progreso'],
+                'presupuesto': {
+                    'estimado': presupuesto,
+                    'actual': costo_actual,
+                    'disponible': presupuesto - costo_actual,
+                },
+                'recursos': n_recursos,
+                'tareas': {
+                    'total': sum(por_estado.values()),
+                    'completadas': por_estado['completada'],
+                    'en_progreso': por_estado['en_progreso'],
+                    'pendientes': por_estado['pendiente'],
+                },
+            })
+        return resumenes
 
     def duplicar_proyecto(self):
         """
-        Función para duplicar un proyecto existente.
-        No requiere argumentos adicionales ya que opera sobre el registro actual (self).
+        Función para duplicar uno o varios proyectos existentes.
+        No requiere argumentos adicionales ya que opera sobre los registros actuales (self).
         """
+        nuevos_proyectos = self._duplicar_en_lote()
+
+        # Mostrar el formulario del nuevo proyecto, o la lista si se han duplicado varios
+        if len(nuevos_proyectos) == 1:
+            return {
+                'name': 'Proyecto Duplicado',
+                'type': 'ir.actions.act_window',
+                'res_model': 'creativeminds.proyecto',
+                'view_mode': 'form',
+                'res_id': nuevos_proyectos.id,
+                'target': 'current',
+            }
+        return {
+            'name': 'Proyectos Duplicados',
+            'type': 'ir.actions.act_window',
+            'res_model': 'creativeminds.proyecto',
+            'view_mode': 'tree,form',
+            'domain': [('id', 'in', nuevos_proyectos.ids)],
+            'target': 'current',
+        }
+
+    # Valores de la copia de un proyecto. Los binarios no se leen aquí: sus adjuntos se copian por referencia.
+    def _valores_duplicado(self):
         self.ensure_one()
-        
-        # Crear una copia del proyecto actual
-        valores = {
+        return {
             'nombre': self.nombre + ' (Copia)',
             'estado': 'planificacion',
             'empleado_id': [(6, 0, self.empleado_id.ids)],  # Preservar relaciones many2many
@@ -279,111 +579,173 @@ class Proyecto(models.Model):
             'dependencias': self.dependencias,
             'comentarios': self.comentarios,
             'recordatorios_automaticos': self.recordatorios_automaticos,
-            'imagen_proyecto': self.imagen_proyecto,
-            'documentacion_tecnica': self.documentacion_tecnica,
+            'imagen_filename': self.imagen_filename,
+            'documentacion_filename': self.documentacion_filename,
             'archivos_adicionales': [(6, 0, self.archivos_adicionales.ids)],  # Copiar archivos adicionales
         }
-        
-        # Crear nuevo proyecto con los valores copiados
-        nuevo_proyecto = self.create(valores)
-        
+
+    # Motor de duplicación: recoge el subárbol de todos los proyectos de self y crea cada modelo con una sola llamada
+    # a create (proyectos, tareas, recursos, ideas, votos, feedbacks, acciones y adjuntos).
+    def _duplicar_en_lote(self):
+        if not self:
+            return self.browse()
+        # Sin claves default_* del contexto, que podrían imponerse a los valores copiados (p. ej. default_feedback_id).
+        env = self.with_context(clean_context(self.env.context)).env
+        Adjunto = env['ir.attachment'].sudo()
+
+        # Crear los nuevos proyectos con los valores copiados
+        nuevos_proyectos = env['creativeminds.proyecto'].create([proyecto._valores_duplicado() for proyecto in self])
+        proyecto_nuevo = dict(zip(self.ids, nuevos_proyectos.ids))
+
+        # Copiar la imagen y la documentación técnica (adjuntos de campos binarios) sin leer su contenido
+        binarios = Adjunto.search([
+            ('res_model', '=', self._name),
+            ('res_id', 'in', self.ids),
+            ('res_field', 'in', ['imagen_proyecto', 'documentacion_tecnica']),
+        ])
+        binarios._copiar_por_referencia([{'res_id': proyecto_nuevo[adjunto.res_id]} for adjunto in binarios])
+        nuevos_proyectos.invalidate_recordset(['imagen_proyecto', 'documentacion_tecnica'])
+
         # Duplicar las tareas asociadas
-        for tarea in self.tareas_ids:
-            tarea_valores = {
-                'proyecto_id': nuevo_proyecto.id,
-                'nombre': tarea.nombre,
-                'descripcion': tarea.descripcion,
-                'responsable_id': tarea.responsable_id.id if tarea.responsable_id else False,
-                'fecha_inicio': tarea.fecha_inicio,
-                'fecha_fin': tarea.fecha_fin,
-                'estado': 'pendiente',  # Las tareas duplicadas comienzan como pendientes
-            }
-            self.env['creativeminds.tarea'].create(tarea_valores)
-        
+        tareas = self.tareas_ids
+        nuevas_tareas = env['creativeminds.tarea'].create([{
+            'proyecto_id': proyecto_nuevo[tarea.proyecto_id.id],
+            'nombre': tarea.nombre,
+            'descripcion': tarea.descripcion,
+            'responsable_id': tarea.responsable_id.id if tarea.responsable_id else False,
+            'fecha_inicio': tarea.fecha_inicio,
+            'fecha_fin': tarea.fecha_fin,
+            'estado': 'pendiente',  # Las tareas duplicadas comienzan como pendientes
+        } for tarea in tareas])
+        tarea_nueva = dict(zip(tareas.ids, nuevas_tareas.ids))
+
+        # Duplicar las dependencias entre tareas, para que la copia tenga la misma ruta crítica
+        env['creativeminds.tarea.dependencia'].create([{
+            'tarea_id': tarea_nueva[dependencia.tarea_id.id],
+            'predecesora_id': tarea_nueva[dependencia.predecesora_id.id],
+            'desfase': dependencia.desfase,
+        } for dependencia in tareas.dependencia_ids])
+
         # Duplicar los recursos asignados
-        for recurso in self.recursos_ids:
-            recurso_valores = {
-                'proyecto_id': nuevo_proyecto.id,
-                'nombre': recurso.nombre,
-                'empleado_id': [(6, 0, recurso.empleado_id.ids)] if recurso.empleado_id else [],
-                'costo_por_hora': recurso.costo_por_hora,
-                'horas_asignadas': recurso.horas_asignadas,
-                'fecha_inicio': recurso.fecha_inicio,
-                'fecha_fin': recurso.fecha_fin,
-                'estado': 'borrador',  # Los recursos duplicados comienzan como borrador
-            }
-            self.env['creativeminds.recurso'].create(recurso_valores)
-    
-        # Duplicar las ideas asociadas al proyecto
-        for idea in self.idea_ids:
-            nueva_idea = idea.copy({'proyecto_id': nuevo_proyecto.id})
-            
-            # Duplicar los votos asociados a cada idea
-            for voto in idea.vote_ids:
-                voto.copy({'idea_id': nueva_idea.id})
-
-        # Duplicar los feedbacks asociados al proyecto
-        for feedback in self.feedback_ids:
-            nuevo_feedback = feedback.copy({'proyecto_id': nuevo_proyecto.id})
-            
-            # Duplicar las acciones de feedback asociadas
-            for accion in feedback.action_items:
-                accion.copy({'feedback_id': nuevo_feedback.id})
-            
-            # Duplicar los archivos adjuntos asociados a la retroalimentación
+        env['creativeminds.recurso'].create([{
+            'proyecto_id': proyecto_nuevo[recurso.proyecto_id.id],
+            'nombre': recurso.nombre,
+            'empleado_id': [(6, 0, recurso.empleado_id.ids)] if recurso.empleado_id else [],
+            'costo_por_hora': recurso.costo_por_hora,
+            'horas_asignadas': recurso.horas_asignadas,
+            'fecha_inicio': recurso.fecha_inicio,
+            'fecha_fin': recurso.fecha_fin,
+            'estado': 'borrador',  # Los recursos duplicados comienzan como borrador
+        } for recurso in self.recursos_ids])
+
+        # Duplicar las ideas asociadas a los proyectos y los votos de cada idea
+        ideas = self.idea_ids
+        nuevas_ideas = env['creativeminds.idea'].create([
+            idea.copy_data({'proyecto_id': proyecto_nuevo[idea.proyecto_id.id]})[0] for idea in ideas
+        ])
+        idea_nueva = dict(zip(ideas.ids, nuevas_ideas.ids))
+        env['creativeminds.idea.vote'].create([
+            voto.copy_data({'idea_id': idea_nueva[voto.idea_id.id]})[0] for voto in ideas.vote_ids
+        ])
+
+        # Duplicar los feedbacks asociados a los proyectos y sus acciones
+        feedbacks = self.feedback_ids
+        nuevos_feedbacks = env['creativeminds.feedback'].create([
+            feedback.copy_data({'proyecto_id': proyecto_nuevo[feedback.proyecto_id.id], 'attachment_ids': []})[0]
+            for feedback in feedbacks
+        ])
+        feedback_nuevo = dict(zip(feedbacks.ids, nuevos_feedbacks.ids))
+        env['creativeminds.feedback.action'].create([
+            accion.copy_data({'feedback_id': feedback_nuevo[accion.feedback_id.id]})[0] for accion in feedbacks.action_items
+        ])
+
+        # Duplicar los archivos adjuntos de cada retroalimentación (por referencia) y enlazarlos a la copia
+        originales, destinos = [], []
+        for feedback in feedbacks:
             for archivo in feedback.attachment_ids:
-                archivo.copy({'res_id': nuevo_feedback.id})
-        
-        # Mostrar el formulario del nuevo proyecto
-        return {
-            'name': 'Proyecto Duplicado',
-            'type': 'ir.actions.act_window',
-            'res_model': 'creativeminds.proyecto',
-            'view_mode': 'form',
-            'res_id': nuevo_proyecto.id,
-            'target': 'current',
-        }
+                originales.append(archivo.id)
+                destinos.append(feedback_nuevo[feedback.id])
+        copias = Adjunto.browse(originales)._copiar_por_referencia([{'res_id': destino} for destino in destinos])
+        if copias:
+            campo = env['creativeminds.feedback']._fields['attachment_ids']
+            env.cr.execute(SQL(
+                "INSERT INTO %s (%s, %s) SELECT unnest(%s::int[]), unnest(%s::int[])",
+                SQL.identifier(campo.relation), SQL.identifier(campo.column1), SQL.identifier(campo.column2), destinos, copias.ids,
+            ))
+            nuevos_feedbacks.invalidate_recordset(['attachment_ids'])
+
+        return nuevos_proyectos
 
-    # Método para verificar que la descripción, cliente y responsable sean válidos antes de hacer cambios.
-    @api.constrains('descripcion', 'cliente', 'responsable_id')
+    # Regla: la descripción, el cliente y el responsable deben ser válidos antes de hacer cambios.
     def _verificar_campos_importantes(self):
-        if self.descripcion and len(self.descripcion.strip()) < 10:
-            raise ValidationError("La descripción del proyecto debe tener al menos 10 caracteres.")
-        if self.estado in ['en_progreso', 'finalizado'] and not self.cliente:
-            raise ValidationError("Debe especificar un cliente antes de cambiar el proyecto a 'En progreso' o 'Finalizado'.")
-        if self.estado not in ['planificacion'] and not self.responsable_id:
-            raise ValidationError("Debe asignar un responsable antes de avanzar con el proyecto.")
-
-    # Método para verificar que los campos de planificación son correctos para proyectos de alta prioridad.
-    @api.constrains('riesgos', 'hitos')
+        errores = []
+        for record in self:
+            if record.descripcion and len(record.descripcion.strip()) < 10:
+                errores.append(self._infraccion(record, "La descripción del proyecto debe tener al menos 10 caracteres."))
+            if record.estado in ['en_progreso', 'finalizado'] and not record.cliente:
+                errores.append(self._infraccion(record, "Debe especificar un cliente antes de cambiar el proyecto a 'En progreso' o 'Finalizado'."))
+            if record.estado not in ['planificacion'] and not record.responsable_id:
+                errores.append(self._infraccion(record, "Debe asignar un responsable antes de avanzar con el proyecto."))
+        return errores
+
+    # Regla: los proyectos de alta prioridad deben definir riesgos e hitos.
     def _verificar_campos_planificacion(self):
-        if self.prioridad == 'alta':  # Si el proyecto es de alta prioridad.
-            if not self.riesgos:  # Los riesgos deben estar definidos.
-                raise ValidationError("Para proyectos de alta prioridad, es obligatorio definir los riesgos.")
-            if not self.hitos:  # Los hitos deben estar definidos.
-                raise ValidationError("Para proyectos de alta prioridad, es obligatorio definir los hitos/entregables.")
-
-    # Método para verificar que haya al menos un recurso asignado antes de cambiar el estado a 'en progreso'.
-    @api.constrains('recursos_ids')
+        errores = []
+        for record in self.filtered(lambda p: p.prioridad == 'alta'):  # Proyectos de alta prioridad.
+            if not record.riesgos:  # Los riesgos deben estar definidos.
+                errores.append(self._infraccion(record, "Para proyectos de alta prioridad, es obligatorio definir los riesgos."))
+            if not record.hitos:  # Los hitos deben estar definidos.
+                errores.append(self._infraccion(record, "Para proyectos de alta prioridad, es obligatorio definir los hitos/entregables."))
+        return errores
+
+    # Regla: debe haber al menos un recurso asignado antes de sacar el proyecto de planificación.
     def _verificar_recursos_minimos(self):
-        if self.estado != 'planificacion' and not self.recursos_ids:  # Si el proyecto no está en planificación y no tiene recursos asignados.
-            raise ValidationError("Debe asignar al menos un recurso antes de iniciar el proyecto.")
+        iniciados = self.filtered(lambda p: p.estado != 'planificacion')
+        if not iniciados:
+            return []
+        num_recursos = iniciados._contar_por_proyecto('creativeminds.recurso')
+        return [
+            self._infraccion(record, "Debe asignar al menos un recurso antes de iniciar el proyecto.")
+            for record in iniciados
+            if not num_recursos[record.id]
+        ]
 
-    # Método para verificar que las fechas de inicio y fin, así como las tareas, sean coherentes.
-    @api.constrains('fecha_inicio', 'fecha_fin', 'estado', 'tareas_ids')
+    # Regla: las fechas de inicio y fin de los proyectos en progreso, así como sus tareas, deben ser coherentes.
+    # Las tareas fuera de la ventana de fechas de cada proyecto se obtienen con una única consulta para todo el lote.
     def _verificar_fechas_y_tareas(self):
-        if self.estado == 'en_progreso':  # Si el proyecto está en progreso.
-            if not self.fecha_inicio:  # La fecha de inicio debe estar definida.
-                raise ValidationError("Debe establecer una fecha de inicio antes de comenzar el proyecto.")
-            if not self.fecha_fin:  # La fecha de fin debe estar definida.
-                raise ValidationError("Debe establecer una fecha de finalización antes de comenzar el proyecto.")
-            if not self.tareas_ids:  # Deben existir al menos una tarea asociada.
-                raise ValidationError("Debe crear al menos una tarea antes de iniciar el proyecto.")
-            for tarea in self.tareas_ids:
-                if tarea.fecha_inicio and tarea.fecha_inicio < self.fecha_inicio:  # La tarea no puede empezar antes de la fecha de inicio del proyecto.
-                    raise ValidationError(f"La tarea '{tarea.nombre}' tiene una fecha de inicio anterior a la fecha de inicio del proyecto.")
-                if tarea.fecha_fin and tarea.fecha_fin > self.fecha_fin:  # La tarea no puede terminar después de la fecha de finalización del proyecto.
-                    raise ValidationError(f"La tarea '{tarea.nombre}' tiene una fecha de finalización posterior a la fecha de fin del proyecto.")
+        en_progreso = self.filtered(lambda p: p.estado == 'en_progreso')  # Proyectos en progreso.
+        if not en_progreso:
+            return []
+        errores = []
+        num_tareas = en_progreso._contar_por_proyecto('creativeminds.tarea')
+        for record in en_progreso:
+            if not record.fecha_inicio:  # La fecha de inicio debe estar definida.
+                errores.append(self._infraccion(record, "Debe establecer una fecha de inicio antes de comenzar el proyecto."))
+            if not record.fecha_fin:  # La fecha de fin debe estar definida.
+                errores.append(self._infraccion(record, "Debe establecer una fecha de finalización antes de comenzar el proyecto."))
+            if not num_tareas[record.id]:  # Deben existir al menos una tarea asociada.
+                errores.append(self._infraccion(record, "Debe crear al menos una tarea antes de iniciar el proyecto."))
+
+        # Tareas que empiezan antes o terminan después de su proyecto
+        self.env['creativeminds.tarea'].flush_model(['proyecto_id', 'nombre', 'fecha_inicio', 'fecha_fin'])
+        en_progreso.flush_recordset(['fecha_inicio', 'fecha_fin'])
+        self.env.cr.execute("""
+            SELECT t.proyecto_id, t.nombre,
+                   t.fecha_inicio < p.fecha_inicio AS empieza_antes,
+                   t.fecha_fin > p.fecha_fin AS termina_despues
+              FROM creativeminds_tarea t
+              JOIN creativeminds_proyecto p ON p.id = t.proyecto_id
+             WHERE t.proyecto_id = ANY(%s)
+               AND (t.fecha_inicio < p.fecha_inicio OR t.fecha_fin > p.fecha_fin)
+          ORDER BY t.proyecto_id, t.id
+        """, [en_progreso.ids])
+        for proyecto_id, nombre, empieza_antes, termina_despues in self.env.cr.fetchall():
+            record = self.browse(proyecto_id)
+            if empieza_antes:  # La tarea no puede empezar antes de la fecha de inicio del proyecto.
+                errores.append(self._infraccion(record, f"La tarea '{nombre}' tiene una fecha de inicio anterior a la fecha de inicio del proyecto."))
+            if termina_despues:  # La tarea no puede terminar después de la fecha de finalización del proyecto.
+                errores.append(self._infraccion(record, f"La tarea '{nombre}' tiene una fecha de finalización posterior a la fecha de fin del proyecto."))
+        return errores
 
     # Función para ver las tareas del proyecto
     def ver_tareas(self):
@@ -422,56 +784,55 @@ class Proyecto(models.Model):
         }
 
     # Método para obtener las métricas
+    # Todas las cifras se obtienen con agregados agrupados en la base de datos (_read_group y search_count),
+    # de modo que el informe no carga en la caché del ORM ningún proyecto, tarea ni empleado.
     def obtener_metricas(self):
-        proyectos = self.env['creativeminds.proyecto'].search([])  # Obtener todos los proyectos
-        tareas = self.env['creativeminds.tarea'].search([])  # Obtener todas las tareas
-        empleados = self.env['creativeminds.empleado'].search([])  # Obtener todos los empleados
-        
-        # Métricas de proyectos
-        total_proyectos = len(proyectos)
-        proyectos_en_progreso = len(proyectos.filtered(lambda p: p.estado == 'en_progreso'))
-        proyectos_finalizados = len(proyectos.filtered(lambda p: p.estado == 'finalizado'))
-        proyectos_retrasados = len(proyectos.filtered(lambda p: p.fecha_fin and p.fecha_fin < fields.Date.today() and p.estado != 'finalizado'))
-        
-        # Métricas de progreso
-        progreso_promedio = sum(proyecto.porcentaje_progreso for proyecto in proyectos) / total_proyectos if total_proyectos > 0 else 0
-        
-        # Cálculo de presupuestos
-        presupuesto_total = sum(proyecto.presupuesto_estimado for proyecto in proyectos)
-        costo_actual_total = sum(proyecto.costo_total_recursos for proyecto in proyectos)
+        Proyecto = self.env['creativeminds.proyecto']
+        Tarea = self.env['creativeminds.tarea']
+        Empleado = self.env['creativeminds.empleado']
+
+        # Métricas de proyectos: una única consulta agrupada por estado con las sumas de progreso y presupuesto
+        proyectos_por_estado = {}
+        suma_progreso = presupuesto_total = costo_actual_total = 0.0
+        for estado, cantidad, progreso, presupuesto, costo in Proyecto._read_group(
+            [], ['estado'],
+            ['__count', 'porcentaje_progreso:sum', 'presupuesto_estimado:sum', 'costo_total_recursos:sum'],
+        ):
+            proyectos_por_estado[estado] = cantidad
+            suma_progreso += progreso or 0.0
+            presupuesto_total += presupuesto or 0.0
+            costo_actual_total += costo or 0.0
+
+        total_proyectos = sum(proyectos_por_estado.values())
+        proyectos_retrasados = Proyecto.search_count(Proyecto._dominio_retrasados())
+        progreso_promedio = suma_progreso / total_proyectos if total_proyectos > 0 else 0
         eficiencia_presupuestaria = (costo_actual_total / presupuesto_total * 100) if presupuesto_total > 0 else 0
-        
-        # Métricas de tareas
-        total_tareas = len(tareas)
-        tareas_completadas = len(tareas.filtered(lambda t: t.estado == 'completada'))
-        tareas_pendientes = len(tareas.filtered(lambda t: t.estado == 'pendiente'))
-        
-        # Métricas de empleados disponibles
-        empleados_disponibles = len(empleados.filtered(lambda e: e.disponibilidad == 'disponible'))
 
-        # Retornar todas las métricas calculadas
+        # Métricas de tareas: recuento agrupado por estado
+        tareas_por_estado = dict(Tarea._read_group([], ['estado'], ['__count']))
+
         return {
             'total_proyectos': total_proyectos,
-            'proyectos_en_progreso': proyectos_en_progreso,
-            'proyectos_finalizados': proyectos_finalizados,
+            'proyectos_en_progreso': proyectos_por_estado.get('en_progreso', 0),
+            'proyectos_finalizados': proyectos_por_estado.get('finalizado', 0),
             'proyectos_retrasados': proyectos_retrasados,
             'progreso_promedio': progreso_promedio,
             'presupuesto_total': presupuesto_total,
             'costo_actual_total': costo_actual_total,
             'eficiencia_presupuestaria': eficiencia_presupuestaria,
-            'total_tareas': total_tareas,
-            'tareas_completadas': tareas_completadas,
-            'tareas_pendientes': tareas_pendientes,
-            'empleados_disponibles': empleados_disponibles
+            'total_tareas': sum(tareas_por_estado.values()),
+            'tareas_completadas': tareas_por_estado.get('completada', 0),
+            'tareas_pendientes': tareas_por_estado.get('pendiente', 0),
+            'empleados_disponibles': Empleado.search_count([('disponibilidad', '=', 'disponible')]),
         }
     
-    # Método para generar el informe
+    # Método para generar el informe. El PDF no se genera en la petición: se encola y lo genera una tarea
+    # programada (o se devuelve al momento si ya existe uno con los mismos datos). Con proyectos seleccionados
+    # y 'agrupacion_informe' en el contexto ('proyecto' o 'cliente') el informe incluye una sección por cada uno.
     def generar_informe_metricas(self):
-        # Obtener las métricas
-        metrics = self.obtener_metricas()
-
-        # Usar el informe de QWeb
-        return self.env.ref('creativeminds.action_report_metricas').report_action(self, data={'metrics': metrics})
+        return self.env['creativeminds.informe.trabajo'].encolar(
+            proyectos=self, agrupacion=self.env.context.get('agrupacion_informe', 'ninguna'),
+        )
 
 class Recurso(models.Model):
     _name = 'creativeminds.recurso'
@@ -480,7 +841,7 @@ class Recurso(models.Model):
     # Campos básicos
     nombre = fields.Char(string='Nombre del Recurso', required=True)  # Nombre del recurso (obligatorio).
     empleado_id = fields.Many2many('creativeminds.empleado', string='Empleado')  # Relación con los empleados asignados al recurso.
-    proyecto_id = fields.Many2one('creativeminds.proyecto', string='Proyecto')  # Relación con el proyecto al que pertenece el recurso.
+    proyecto_id = fields.Many2one('creativeminds.proyecto', string='Proyecto', index=True)  # Relación con el proyecto al que pertenece el recurso.
 
     # Costos y presupuesto
     costo_por_hora = fields.Float(string='Costo por Hora')  # Costo por hora del recurso.
@@ -503,29 +864,129 @@ class Recurso(models.Model):
         ('en_progreso', 'En Progreso'),  # Cuando el recurso está trabajando activamente en el proyecto.
         ('completado', 'Completado')  # Cuando el recurso ha finalizado su tarea.
     ], string='Estado', default='borrador')  # El estado por defecto es 'borrador'.
+
+    # Campos del recurso que alteran la carga semanal de sus empleados.
+    _CAMPOS_CARGA = {'empleado_id', 'horas_asignadas', 'fecha_inicio', 'fecha_fin', 'estado', 'proyecto_id'}
+
+    # Los cambios de coste de los recursos modifican el costo_total_recursos del proyecto, así que se refresca su instantánea.
+    @api.model_create_multi
+    def create(self, vals_list):
+        Proyecto = self.env['creativeminds.proyecto']
+        anteriores = Proyecto.browse({vals['proyecto_id'] for vals in vals_list if vals.get('proyecto_id')})._valores_indicador('costo_total_recursos')
+        recursos = super(Recurso, self).create(vals_list)
+        self.env['creativeminds.metrics.snapshot'].sudo()._refrescar_proyectos(recursos.proyecto_id)
+        Proyecto._registrar_cambios_indicador('costo_total_recursos', anteriores)
+        Carga = self.env['creativeminds.carga.semanal'].sudo()
+        Carga._aplicar_cambio({}, Carga._contribuciones(recursos=recursos))
+        return recursos
+
+    def write(self, vals):
+        Proyecto = self.env['creativeminds.proyecto']
+        costes = bool({'costo_por_hora', 'horas_asignadas', 'proyecto_id'}.intersection(vals))
+        carga = bool(self._CAMPOS_CARGA.intersection(vals))
+        Carga = self.env['creativeminds.carga.semanal'].sudo()
+        proyectos = self.proyecto_id
+        anteriores = (proyectos | Proyecto.browse(vals.get('proyecto_id') or []))._valores_indicador('costo_total_recursos') if costes else {}
+        carga_anterior = Carga._contribuciones(recursos=self) if carga else {}
+        res = super(Recurso, self).write(vals)
+        if costes:
+            self.env['creativeminds.metrics.snapshot'].sudo()._refrescar_proyectos(proyectos | self.proyecto_id)
+            Proyecto._registrar_cambios_indicador('costo_total_recursos', anteriores)
+        if carga:
+            Carga._aplicar_cambio(carga_anterior, Carga._contribuciones(recursos=self))
+        return res
+
+    def unlink(self):
+        proyectos = self.proyecto_id
+        anteriores = proyectos._valores_indicador('costo_total_recursos')
+        Carga = self.env['creativeminds.carga.semanal'].sudo()
+        carga_anterior = Carga._contribuciones(recursos=self)
+        res = super(Recurso, self).unlink()
+        self.env['creativeminds.metrics.snapshot'].sudo()._refrescar_proyectos(proyectos.exists())
+        self.env['creativeminds.proyecto']._registrar_cambios_indicador('costo_total_recursos', anteriores)
+        Carga._aplicar_cambio(carga_anterior, {})
+        return res
     
 class Tarea(models.Model):
     _name = 'creativeminds.tarea'
     _description = 'Tareas del Proyecto'
 
     # Campos básicos
-    proyecto_id = fields.Many2one('creativeminds.proyecto', string='Proyecto')  # Relación con el proyecto al que pertenece la tarea.
+    proyecto_id = fields.Many2one('creativeminds.proyecto', string='Proyecto', index=True)  # Relación con el proyecto al que pertenece la tarea.
     nombre = fields.Char(string='Nombre de la Tarea', required=True)  # Nombre de la tarea (obligatorio).
     descripcion = fields.Text(string='Descripción')  # Descripción opcional de la tarea.
-    responsable_id = fields.Many2one('creativeminds.empleado', string='Responsable')  # Relación con el empleado que es responsable de la tarea.
+    responsable_id = fields.Many2one('creativeminds.empleado', string='Responsable', index=True)  # Relación con el empleado que es responsable de la tarea.
     fecha_inicio = fields.Date(string='Fecha de Inicio')  # Fecha en la que la tarea debería comenzar.
-    fecha_fin = fields.Date(string='Fecha de Finalización')  # Fecha en la que la tarea debe finalizar.
+    fecha_fin = fields.Date(string='Fecha de Finalización', index=True)  # Fecha en la que la tarea debe finalizar.
     estado = fields.Selection([  # Selección de estados de la tarea.
         ('pendiente', 'Por hacer'),  # Estado cuando la tarea aún no se ha comenzado.
         ('en_progreso', 'En progreso'),  # Estado cuando la tarea está siendo trabajada.
         ('completada', 'Completada'),  # Estado cuando la tarea ha sido finalizada.
-    ], string='Estado', default='pendiente')  # El estado inicial es "pendiente" por defecto.
+    ], string='Estado', default='pendiente', index=True)  # El estado inicial es "pendiente" por defecto.
+
+    def init(self):
+        # Índice compuesto para los dominios por proyecto y estado (progreso, tareas pendientes de un proyecto).
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS creativeminds_tarea_proyecto_estado_idx
+                ON creativeminds_tarea (proyecto_id, estado)
+        """)
+        # Las tareas sin proyecto no están en la instantánea de métricas: se cuentan al leer las métricas y su última
+        # modificación forma parte de la versión del panel. Índice parcial, casi vacío.
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS creativeminds_tarea_sin_proyecto_idx
+                ON creativeminds_tarea (write_date) INCLUDE (estado) WHERE proyecto_id IS NULL
+        """)
 
     # Método de validación de fechas
     @api.constrains('fecha_inicio', 'fecha_fin')  # Este decorador valida las fechas de inicio y fin.
     def _verificar_fechas_tarea(self):
-        if self.fecha_inicio and self.fecha_fin and self.fecha_inicio > self.fecha_fin:  # Si la fecha de inicio es mayor que la de fin, lanza un error.
-            raise ValidationError("La fecha de inicio no puede ser posterior a la fecha de finalización.")  # Lanza un error de validación si las fechas no son correctas.
+        for record in self:
+            if record.fecha_inicio and record.fecha_fin and record.fecha_inicio > record.fecha_fin:  # Si la fecha de inicio es mayor que la de fin, lanza un error.
+                raise ValidationError("La fecha de inicio no puede ser posterior a la fecha de finalización.")  # Lanza un error de validación si las fechas no son correctas.
+
+    # Campos de la tarea que alteran la carga semanal de su responsable.
+    _CAMPOS_CARGA = {'responsable_id', 'fecha_inicio', 'fecha_fin', 'estado'}
+
+    # Las altas, bajas y cambios de estado o de proyecto de las tareas se trasladan a la instantánea de métricas.
+    @api.model_create_multi
+    def create(self, vals_list):
+        Proyecto = self.env['creativeminds.proyecto']
+        anteriores = Proyecto.browse({vals['proyecto_id'] for vals in vals_list if vals.get('proyecto_id')})._valores_indicador('porcentaje_progreso')
+        tareas = super(Tarea, self).create(vals_list)
+        self.env['creativeminds.metrics.snapshot'].sudo()._refrescar_proyectos(tareas.proyecto_id)
+        Proyecto._registrar_cambios_indicador('porcentaje_progreso', anteriores)
+        Carga = self.env['creativeminds.carga.semanal'].sudo()
+        Carga._aplicar_cambio({}, Carga._contribuciones(tareas=tareas))
+        return tareas
+
+    def write(self, vals):
+        metricas = 'estado' in vals or 'proyecto_id' in vals
+        carga = bool(self._CAMPOS_CARGA.intersection(vals))
+        if not metricas and not carga:
+            return super(Tarea, self).write(vals)
+        Proyecto = self.env['creativeminds.proyecto']
+        Carga = self.env['creativeminds.carga.semanal'].sudo()
+        proyectos = self.proyecto_id
+        anteriores = (proyectos | Proyecto.browse(vals.get('proyecto_id') or []))._valores_indicador('porcentaje_progreso') if metricas else {}
+        carga_anterior = Carga._contribuciones(tareas=self) if carga else {}
+        res = super(Tarea, self).write(vals)
+        if metricas:
+            self.env['creativeminds.metrics.snapshot'].sudo()._refrescar_proyectos(proyectos | self.proyecto_id)
+            Proyecto._registrar_cambios_indicador('porcentaje_progreso', anteriores)
+        if carga:
+            Carga._aplicar_cambio(carga_anterior, Carga._contribuciones(tareas=self))
+        return res
+
+    def unlink(self):
+        proyectos = self.proyecto_id
+        anteriores = proyectos._valores_indicador('porcentaje_progreso')
+        Carga = self.env['creativeminds.carga.semanal'].sudo()
+        carga_anterior = Carga._contribuciones(tareas=self)
+        res = super(Tarea, self).unlink()
+        self.env['creativeminds.metrics.snapshot'].sudo()._refrescar_proyectos(proyectos.exists())
+        self.env['creativeminds.proyecto']._registrar_cambios_indicador('porcentaje_progreso', anteriores)
+        Carga._aplicar_cambio(carga_anterior, {})
+        return res
 
 #Indicadores de Desempeño
 class KPI(models.Model):
@@ -533,10 +994,19 @@ class KPI(models.Model):
     _description = 'Indicadores Clave de Rendimiento'
 
     # Campos de datos
-    proyecto_id = fields.Many2one('creativeminds.proyecto', string='Proyecto')  # Relación con el proyecto al que pertenece el KPI.
+    proyecto_id = fields.Many2one('creativeminds.proyecto', string='Proyecto', index=True)  # Relación con el proyecto al que pertenece el KPI.
     nombre = fields.Char(string='Nombre del KPI', required=True)  # Nombre del KPI, que es obligatorio.
     valor = fields.Float(string='Valor')  # Valor actual del KPI, que puede ser un número decimal.
     objetivo = fields.Float(string='Objetivo')  # Objetivo o meta del KPI, también como número decimal.
+    metrica = fields.Selection([  # Campo del proyecto que alimenta el KPI automáticamente (vacío en los KPI manuales).
+        ('porcentaje_progreso', 'Progreso del Proyecto'),
+        ('costo_total_recursos', 'Costo Total de Recursos'),
+    ], string='Métrica Automática', readonly=True, copy=False)
+
+    # Un solo indicador automático por proyecto y métrica.
+    _sql_constraints = [
+        ('metrica_unica', 'UNIQUE(proyecto_id, metrica)', "El proyecto ya tiene un indicador automático para esa métrica."),
+    ]
 
 class Empleado(models.Model):
     _name = 'creativeminds.empleado'
@@ -558,11 +1028,15 @@ class Empleado(models.Model):
     phone = fields.Char(string='Teléfono')
     email = fields.Char(string='Correo Electrónico')
     tareas_ids = fields.One2many('creativeminds.tarea', 'responsable_id',string='Tareas')  # Tareas asociadas al empleado
+    n_equipos = fields.Integer(string='Número de Equipos', compute='_compute_pertenencias', store=True)  # Equipos a los que pertenece el empleado
+    n_proyectos = fields.Integer(string='Número de Proyectos', compute='_compute_pertenencias', store=True)  # Proyectos a los que está asignado el empleado
     
     
     
     
-    # Estado de disponibilidad
+    capacidad_semanal = fields.Float(string='Capacidad Semanal (horas)', default=40.0)  # Horas de trabajo disponibles por semana
+    
+    # Estado de disponibilidad (se deriva de la carga semanal si está activo creativeminds.capacidad.sincronizar_disponibilidad)
     disponibilidad = fields.Selection([  # Campo para gestionar la disponibilidad del empleado.
         ('disponible', 'Disponible'),  # El empleado está disponible para trabajar.
         ('asignado', 'Asignado'),  # El empleado está asignado a un proyecto.
@@ -595,6 +1069,52 @@ class Empleado(models.Model):
         ('DNI_unico', 'UNIQUE(dni)', "El DNI debe ser único")  # Restricción de unicidad en el campo DNI.
     ]
 
+    # Recuentos de equipos y proyectos del lote con una consulta agrupada por tabla de relación.
+    @api.depends('equipo_id', 'proyecto_id')
+    def _compute_pertenencias(self):
+        equipos = _contar_relacion(self, 'equipo_id')
+        proyectos = _contar_relacion(self, 'proyecto_id')
+        for empleado in self:
+            if isinstance(empleado.id, int):
+                empleado.n_equipos = equipos.get(empleado.id, 0)
+                empleado.n_proyectos = proyectos.get(empleado.id, 0)
+            else:  # Empleado en edición: contamos las relaciones en memoria.
+                empleado.n_equipos = len(empleado.equipo_id)
+                empleado.n_proyectos = len(empleado.proyecto_id)
+
+    # Marca los recuentos para recalcular cuando las filas de relación se han borrado por la cascada
+    # de un equipo o proyecto eliminado.
+    def _recalcular_pertenencias(self, campos):
+        self.invalidate_recordset(['equipo_id', 'proyecto_id'])
+        for campo in campos:
+            self.env.add_to_compute(self._fields[campo], self)
+
+    # Consulta inversa: equipos y proyectos de cada empleado, con sus recuentos. Los recuentos salen de los
+    # campos guardados y los listados de una consulta por tabla de relación. Devuelve {empleado_id: {...}}.
+    def obtener_pertenencias(self):
+        pertenencias = {
+            empleado['id']: {
+                'n_equipos': empleado['n_equipos'],
+                'n_proyectos': empleado['n_proyectos'],
+                'equipos': [],
+                'proyectos': [],
+            }
+            for empleado in self.read(['n_equipos', 'n_proyectos'])
+        }
+        if not pertenencias:
+            return pertenencias
+        for clave, nombre_campo, tabla in (('equipos', 'equipo_id', 'creativeminds_equipo'), ('proyectos', 'proyecto_id', 'creativeminds_proyecto')):
+            campo = self._fields[nombre_campo]
+            self.flush_model([nombre_campo])
+            self.env.cr.execute(SQL(
+                "SELECT r.%s, t.id, t.nombre FROM %s r JOIN %s t ON t.id = r.%s WHERE r.%s = ANY(%s) ORDER BY t.nombre, t.id",
+                SQL.identifier(campo.column1), SQL.identifier(campo.relation), SQL.identifier(tabla),
+                SQL.identifier(campo.column2), SQL.identifier(campo.column1), list(pertenencias),
+            ))
+            for empleado_id, registro_id, nombre in self.env.cr.fetchall():
+                pertenencias[empleado_id][clave].append({'id': registro_id, 'nombre': nombre})
+        return pertenencias
+
     @api.model
     def create(self, vals):
         record = super(Empleado, self).create(vals)
@@ -605,7 +1125,35 @@ class Empleado(models.Model):
             subject="Nuevo Empleado",
             partner_ids=[record.partner_id.id]  # Enviamos el mensaje al partner (empleado) creado
         )
+        if record.disponibilidad == 'disponible':  # Actualizamos el recuento de empleados disponibles de la instantánea
+            self.env['creativeminds.metrics.snapshot'].sudo()._aplicar_delta_global({'empleados_disponibles': 1})
         return record
+
+    def write(self, vals):
+        if 'disponibilidad' not in vals and 'capacidad_semanal' not in vals:
+            return super(Empleado, self).write(vals)
+        antes = len(self.filtered(lambda e: e.disponibilidad == 'disponible'))
+        res = super(Empleado, self).write(vals)
+        despues = len(self.filtered(lambda e: e.disponibilidad == 'disponible'))
+        if despues != antes:
+            self.env['creativeminds.metrics.snapshot'].sudo()._aplicar_delta_global({'empleados_disponibles': despues - antes})
+        # La ocupación depende de la capacidad: con la sincronización activa, la disponibilidad se deriva de nuevo
+        # (la llamada vuelve a este write con 'disponibilidad' y actualiza las métricas).
+        Carga = self.env['creativeminds.carga.semanal'].sudo()
+        if 'capacidad_semanal' in vals and Carga._sincronizar_disponibilidad_activa():
+            Carga._sincronizar_disponibilidad(self)
+        return res
+
+    def unlink(self):
+        disponibles = len(self.filtered(lambda e: e.disponibilidad == 'disponible'))
+        equipos = self.equipo_id
+        res = super(Empleado, self).unlink()
+        self.env['creativeminds.metrics.snapshot'].sudo()._aplicar_delta_global({'empleados_disponibles': -disponibles})
+        # Las filas de relación con los equipos se borran por cascada: recalculamos su número de miembros.
+        equipos = equipos.exists()
+        equipos.invalidate_recordset(['empleado_id'])
+        self.env.add_to_compute(equipos._fields['n_miembros'], equipos)
+        return res
     
 class Equipo(models.Model):
     _name = 'creativeminds.equipo'
@@ -618,12 +1166,27 @@ class Equipo(models.Model):
     descripcion = fields.Text(string='Descripcion del equipo')  # Descripción del equipo, opcional.
     
     # Campo calculado: número de miembros en el equipo
-    n_miembros = fields.Integer(string='Número de Miembros', compute='_compute_n_miembros')  # Número de miembros calculado dinámicamente.
+    n_miembros = fields.Integer(string='Número de Miembros', compute='_compute_n_miembros', store=True)  # Número de miembros, guardado para las listas.
 
-    # Método para calcular el número de miembros en el equipo
+    # Método para calcular el número de miembros en el equipo: una consulta agrupada sobre la tabla de relación
+    # para todo el lote, sin cargar los empleados.
+    @api.depends('empleado_id')
     def _compute_n_miembros(self):
+        recuentos = _contar_relacion(self, 'empleado_id')
         for equipo in self:
-            equipo.n_miembros = len(equipo.empleado_id)  # Asigna el número de miembros en función de la cantidad de empleados asociados al equipo.
+            if isinstance(equipo.id, int):
+                equipo.n_miembros = recuentos.get(equipo.id, 0)
+            else:  # Equipo en edición: contamos los empleados en memoria.
+                equipo.n_miembros = len(equipo.empleado_id)
+
+    # Empleado.equipo_id comparte la tabla de relación con empleado_id, así que el ORM los trata como inversos y
+    # las altas y bajas de miembros recalculan n_equipos. Al borrar el equipo las filas desaparecen por la cascada
+    # de la clave foránea, sin pasar por el ORM, y hay que recalcular a mano.
+    def unlink(self):
+        empleados = self.empleado_id
+        res = super(Equipo, self).unlink()
+        empleados.exists()._recalcular_pertenencias(['n_equipos'])
+        return res
 
 class IdeaEvaluation(models.Model):
     _name = 'creativeminds.idea'
@@ -636,7 +1199,8 @@ class IdeaEvaluation(models.Model):
     pros = fields.Text('Pros')
     cons = fields.Text('Contras')
     vote_ids = fields.One2many('creativeminds.idea.vote', 'idea_id', 'Votos')
-    score = fields.Float('Puntuación', compute='_compute_score')
+    score = fields.Float('Puntuación', compute='_compute_score', store=True, group_operator='avg')  # Media de los votos
+    vote_count = fields.Integer('Número de Votos', compute='_compute_score', store=True)
     feasibility = fields.Selection([
         ('1', 'Muy difícil'),
         ('2', 'Difícil'),
@@ -651,35 +1215,110 @@ class IdeaEvaluation(models.Model):
         ('4', 'Alto'),
         ('5', 'Muy alto')
     ], string='Impacto')
+    # Puntuación ponderada con la que se ordenan las ideas; se guarda para que el ranking salga de un índice.
+    ranking = fields.Float('Ranking', compute='_compute_ranking', store=True, group_operator='avg')
 
+    # Pesos del ranking: media de votos, viabilidad (1-5) e impacto (1-5).
+    _PESOS_RANKING = {'score': 0.5, 'feasibility': 0.25, 'impact': 0.25}
+
+    def init(self):
+        # Índices del ranking global y por proyecto (el id desempata y hace el orden estable).
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS creativeminds_idea_ranking_idx
+                ON creativeminds_idea (ranking DESC NULLS LAST, id)
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS creativeminds_idea_proyecto_ranking_idx
+                ON creativeminds_idea (proyecto_id, ranking DESC NULLS LAST, id)
+        """)
+
+    # La media y el número de votos de todas las ideas del lote salen de una sola consulta agrupada,
+    # que se repite cada vez que se crean, modifican o eliminan votos.
     @api.depends('vote_ids.score')
     def _compute_score(self):
+        guardadas = self.filtered(lambda idea: isinstance(idea.id, int))
+        medias = {}
+        if guardadas:
+            medias = {
+                idea.id: (media, cantidad)
+                for idea, media, cantidad in self.env['creativeminds.idea.vote']._read_group(
+                    [('idea_id', 'in', guardadas.ids)], ['idea_id'], ['score:avg', '__count'],
+                )
+            }
         for record in self:
-            # Get all the votes related to the current IdeaEvaluation record
-            votes = record.vote_ids
-            if votes:
-                # Calculate the average score
-                total_score = sum(vote.score for vote in votes)
-                num_votes = len(votes)
-                record.score = total_score / num_votes if num_votes > 0 else 0
-            else:
-                # No votes yet, score is 0
-                record.score = 0
+            if record in guardadas:
+                media, cantidad = medias.get(record.id, (0.0, 0))
+            else:  # Idea en edición: calculamos con los votos en memoria.
+                cantidad = len(record.vote_ids)
+                media = sum(record.vote_ids.mapped('score')) / cantidad if cantidad else 0.0
+            record.score = media or 0.0
+            record.vote_count = cantidad
+
+    @api.depends('score', 'feasibility', 'impact')
+    def _compute_ranking(self):
+        pesos = self._PESOS_RANKING
+        for record in self:
+            record.ranking = (
+                pesos['score'] * record.score
+                + pesos['feasibility'] * int(record.feasibility or 0)
+                + pesos['impact'] * int(record.impact or 0)
+            )
+
+    # Devuelve las mejores ideas, globalmente o de un proyecto, ya ordenadas por la base de datos.
+    @api.model
+    def obtener_ranking(self, limite=10, proyecto_id=None):
+        dominio = [('proyecto_id', '=', proyecto_id)] if proyecto_id else []
+        return self.search_read(
+            dominio, ['name', 'proyecto_id', 'score', 'vote_count', 'feasibility', 'impact', 'ranking'],
+            order='ranking DESC NULLS LAST, id', limit=limite,
+        )
+
+    # Devuelve las 'limite' mejores ideas de cada proyecto: {proyecto_id: [ideas]}.
+    # El LATERAL recorre el índice (proyecto_id, ranking) y lee solo las primeras filas de cada proyecto.
+    @api.model
+    def obtener_ranking_por_proyecto(self, limite=3, proyecto_ids=None):
+        self.flush_model(['proyecto_id', 'ranking', 'score', 'vote_count', 'name'])
+        self.env.cr.execute("""
+            SELECT p.id, i.id, i.name, i.score, i.vote_count, i.ranking
+              FROM creativeminds_proyecto p
+              CROSS JOIN LATERAL (
+                    SELECT id, name, score, vote_count, ranking
+                      FROM creativeminds_idea
+                     WHERE proyecto_id = p.id
+                  ORDER BY ranking DESC NULLS LAST, id
+                     LIMIT %(limite)s
+              ) i
+             WHERE %(todos)s OR p.id = ANY(%(proyectos)s)
+          ORDER BY p.id, i.ranking DESC NULLS LAST, i.id
+        """, {'limite': limite, 'todos': proyecto_ids is None, 'proyectos': list(proyecto_ids or [])})
+        ranking = defaultdict(list)
+        for proyecto_id, idea_id, nombre, puntuacion, votos, valor in self.env.cr.fetchall():
+            ranking[proyecto_id].append({
+                'id': idea_id, 'name': nombre, 'score': puntuacion, 'vote_count': votos, 'ranking': valor,
+            })
+        return dict(ranking)
 
 class IdeaVote(models.Model):
     _name = 'creativeminds.idea.vote'
     _description = 'Votos para Evaluación de Ideas'
     
-    idea_id = fields.Many2one('creativeminds.idea', string='Idea', required=True)
+    idea_id = fields.Many2one('creativeminds.idea', string='Idea', required=True, index=True)
     empleado_id = fields.Many2one('creativeminds.empleado', string='Empleado', required=True)
     score = fields.Float('Puntuación', required=True)
     comment = fields.Text('Comentario')
 
+    def init(self):
+        # Índice de cobertura: la media de votos por idea se resuelve con un index-only scan.
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS creativeminds_idea_vote_idea_score_idx
+                ON creativeminds_idea_vote (idea_id, score)
+        """)
+
 class ClientFeedback(models.Model):
     _name = 'creativeminds.feedback'
     _description = 'Retroalimentación del Cliente'
     
-    proyecto_id = fields.Many2one('creativeminds.proyecto', string='Proyecto', required=True)  # Relación con el proyecto al que pertenece.
+    proyecto_id = fields.Many2one('creativeminds.proyecto', string='Proyecto', required=True, index=True)  # Relación con el proyecto al que pertenece.
     date = fields.Date('Fecha', default=fields.Date.today)
     cliente = fields.Char(string='Cliente')  # Cliente asociado al feedback
     feedback_text = fields.Html('Comentarios')
@@ -699,21 +1338,29 @@ class FeedbackAction(models.Model):
     _name = 'creativeminds.feedback.action'
     _description = 'Acción a Realizar para Feedback'
 
-    feedback_id = fields.Many2one('creativeminds.feedback', string='Retroalimentación', readonly=False,required=True)
+    feedback_id = fields.Many2one('creativeminds.feedback', string='Retroalimentación', readonly=False, required=True, index=True)
     action_text = fields.Text('Descripción de la Acción')
     assigned_to = fields.Many2one('creativeminds.empleado', string='Asignado a')
-    due_date = fields.Date(string="Fecha Límite")
+    due_date = fields.Date(string="Fecha Límite", index=True)
     status = fields.Selection([
         ('pending', 'Pendiente'),
         ('in_progress', 'En Progreso'),
         ('done', 'Hecho')
     ], string='Estado', default='pending')
+
+    def init(self):
+        # Índice compuesto para las acciones abiertas ordenadas o filtradas por fecha límite.
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS creativeminds_feedback_action_status_due_date_idx
+                ON creativeminds_feedback_action (status, due_date)
+        """)
     
-    @api.model
-    def create(self, vals):
+    @api.model_create_multi
+    def create(self, vals_list):
         if 'default_feedback_id' in self.env.context:
-            vals['feedback_id'] = self.env.context['default_feedback_id']
-        return super(FeedbackAction, self).create(vals)
+            for vals in vals_list:
+                vals['feedback_id'] = self.env.context['default_feedback_id']
+        return super(FeedbackAction, self).create(vals_list)
     
     @api.constrains('due_date')
     def _check_due_date(self):
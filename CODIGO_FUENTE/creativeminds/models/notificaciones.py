@@ -0,0 +1,130 @@
+from odoo import models, fields, api  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
+from collections import defaultdict  # Para agrupar los eventos por proyecto y por mensaje.
+from datetime import timedelta  # Para calcular la ventana de agrupación de eventos.
+from markupsafe import Markup, escape  # Para construir el HTML del resumen escapando los nombres.
+import logging  # Para registrar información y errores en el log de Odoo.
+
+_logger = logging.getLogger(__name__)
+
+
+class Notificacion(models.Model):
+    _name = 'creativeminds.notificacion'
+    _description = 'Eventos de Notificación de Proyectos'
+    _order = 'id'
+
+    proyecto_id = fields.Many2one('creativeminds.proyecto', string='Proyecto', required=True, ondelete='cascade', index=True)
+    tipo = fields.Selection([
+        ('estado', 'Cambio de Estado'),
+        ('progreso', 'Actualización de Progreso'),
+    ], string='Tipo', required=True)
+    valor_anterior = fields.Char(string='Valor Anterior')
+    valor_nuevo = fields.Char(string='Valor Nuevo')
+    estado = fields.Selection([
+        ('pendiente', 'Pendiente'),
+        ('enviado', 'Enviado'),
+    ], string='Estado', default='pendiente', required=True, index=True)
+    mensaje_id = fields.Many2one('mail.message', string='Resumen', ondelete='set null')  # Mensaje de resumen que incluyó el evento
+
+    # Días que se conservan los eventos ya enviados (sirven para los contadores).
+    _DIAS_CONSERVACION = 30
+
+    # Guarda los eventos de cambio. cambios es una lista de tuplas (proyecto, valor_anterior, valor_nuevo).
+    @api.model
+    def _registrar(self, tipo, cambios):
+        if not cambios:
+            return self.browse()
+        return self.create([{
+            'proyecto_id': proyecto.id,
+            'tipo': tipo,
+            'valor_anterior': str(anterior) if anterior is not False else False,
+            'valor_nuevo': str(nuevo) if nuevo is not False else False,
+        } for proyecto, anterior, nuevo in cambios])
+
+    # Tarea programada: para cada proyecto cuyo primer evento pendiente ha superado la ventana configurada,
+    # calcula el cambio neto de estado y progreso y publica un único resumen por responsable.
+    @api.model
+    def _cron_enviar_resumenes(self):
+        ventana = int(self.env['ir.config_parameter'].sudo().get_param('creativeminds.notificaciones.ventana_minutos', 15))
+        limite = fields.Datetime.now() - timedelta(minutes=ventana)
+        proyectos = self.env['creativeminds.proyecto'].browse([
+            proyecto.id
+            for proyecto, primero in self._read_group([('estado', '=', 'pendiente')], ['proyecto_id'], ['create_date:min'])
+            if primero <= limite
+        ])
+        if proyectos:
+            eventos = self.search([('estado', '=', 'pendiente'), ('proyecto_id', 'in', proyectos.ids)])
+            eventos._enviar_resumenes()
+        # Limpieza de eventos antiguos ya resumidos
+        self.search([
+            ('estado', '=', 'enviado'),
+            ('create_date', '<', fields.Datetime.now() - timedelta(days=self._DIAS_CONSERVACION)),
+        ]).unlink()
+
+    # Agrupa los eventos de self por responsable y publica un mensaje de resumen para cada uno.
+    def _enviar_resumenes(self):
+        # Cambio neto por proyecto y tipo: primer valor anterior y último valor nuevo
+        netos = {}
+        eventos_proyecto = defaultdict(list)
+        for evento in self:  # Ordenados por id, es decir, cronológicamente
+            eventos_proyecto[evento.proyecto_id].append(evento.id)
+            clave = (evento.proyecto_id, evento.tipo)
+            anterior = netos[clave][0] if clave in netos else evento.valor_anterior
+            netos[clave] = (anterior, evento.valor_nuevo)
+
+        por_responsable = {}
+        for (proyecto, tipo), (anterior, nuevo) in netos.items():
+            if anterior == nuevo or not proyecto.responsable_id:
+                continue  # Sin cambio neto o sin destinatario
+            por_responsable.setdefault(proyecto.responsable_id, {}).setdefault(proyecto, {})[tipo] = (anterior, nuevo)
+
+        mensajes = {}
+        for responsable, cambios in por_responsable.items():
+            mensaje = responsable.message_post(
+                body=self._cuerpo_resumen(responsable, cambios),
+                subject=f"Resumen de cambios en {len(cambios)} proyecto(s)",
+                partner_ids=[responsable.partner_id.id],  # Enviamos el resumen al partner del responsable.
+            )
+            for proyecto in cambios:
+                mensajes[proyecto] = mensaje
+
+        # Una escritura por mensaje (los proyectos sin cambio neto comparten la de mensaje_id vacío)
+        eventos_mensaje = defaultdict(list)
+        for proyecto, ids in eventos_proyecto.items():
+            eventos_mensaje[mensajes[proyecto].id if proyecto in mensajes else False].extend(ids)
+        for mensaje_id, ids in eventos_mensaje.items():
+            self.browse(ids).write({'estado': 'enviado', 'mensaje_id': mensaje_id})
+        _logger.info("Notificaciones: %s eventos resumidos en %s mensajes", len(self), len(por_responsable))
+
+    @api.model
+    def _cuerpo_resumen(self, responsable, cambios):
+        estados = dict(self.env['creativeminds.proyecto']._fields['estado'].selection)
+        lineas = []
+        for proyecto, por_tipo in cambios.items():
+            detalles = []
+            if 'estado' in por_tipo:
+                anterior, nuevo = por_tipo['estado']
+                detalles.append(Markup("estado <b>%s</b> &rarr; <b>%s</b>") % (estados.get(anterior, anterior or '-'), estados.get(nuevo, nuevo or '-')))
+            if 'progreso' in por_tipo:
+                anterior, nuevo = por_tipo['progreso']
+                detalles.append(Markup("progreso %s &rarr; %s") % tuple(
+                    f"{round(float(valor), 2)}%" if valor else '-' for valor in (anterior, nuevo)
+                ))
+            lineas.append(Markup("<li><b>%s</b>: %s</li>") % (proyecto.nombre, Markup(", ").join(detalles)))
+        return (
+            Markup("<p>Hola %s,</p><p>Estos son los cambios en tus proyectos:</p><ul>") % escape(responsable.name)
+            + Markup("").join(lineas)
+            + Markup("</ul>")
+        )
+
+    # Contadores para comprobar el ahorro: eventos registrados frente a mensajes realmente publicados.
+    @api.model
+    def obtener_contadores(self):
+        por_estado = dict(self._read_group([], ['estado'], ['__count']))
+        mensajes = self._read_group([('mensaje_id', '!=', False)], [], ['mensaje_id:count_distinct'])[0][0]
+        resumidos = por_estado.get('enviado', 0)
+        return {
+            'eventos_pendientes': por_estado.get('pendiente', 0),
+            'eventos_resumidos': resumidos,
+            'mensajes_enviados': mensajes,
+            'mensajes_ahorrados': resumidos - mensajes,
+        }
@@ -0,0 +1,179 @@
+from odoo import models, fields, api, tools  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
+from . import (  # Módulos de negocio cuyos métodos se instrumentan.
+    models as modelos_negocio, metricas, ir_attachment, recordatorios, notificaciones, exportacion, importacion,
+    capacidad, planificacion, riesgos, historico_kpi, busqueda, previsiones, informes,
+)
+import functools  # Para conservar los atributos de los métodos envueltos (@api.constrains, @api.model...).
+import inspect  # Para recorrer las clases de los módulos instrumentados.
+import logging  # Para registrar información y errores en el log de Odoo.
+import threading  # Para proteger el búfer de muestras entre hilos del servidor.
+import time  # Para medir el tiempo de cada llamada.
+
+_logger = logging.getLogger(__name__)
+
+# Muestras pendientes de guardar en este proceso: (método, fecha, duración en ms, consultas, registros).
+# Se vuelcan en bloque para no añadir consultas (ni esperas) a cada llamada medida: al llegar a _TAMANO_VOLCADO
+# muestras o, en procesos con poca actividad, en la primera llamada medida tras _SEGUNDOS_VOLCADO segundos.
+# Cada worker tiene su propio búfer y obtener_informe solo vuelca el del worker que lo atiende, así que el informe
+# puede no incluir todavía las últimas muestras de los demás (como mucho _TAMANO_VOLCADO - 1 por worker, o las
+# de un worker que deja de recibir llamadas medidas).
+_BUFER = []
+_BLOQUEO = threading.Lock()
+_TAMANO_VOLCADO = 50
+_SEGUNDOS_VOLCADO = 60
+_ultimo_volcado = time.monotonic()
+
+# Métodos que se están midiendo en cada hilo: las sobrescrituras de un mismo método en varias clases del módulo
+# (create de Proyecto en models, metricas y busqueda...) se miden una sola vez, en la llamada más externa.
+_EN_CURSO = threading.local()
+
+
+# Decorador de perfilado. Con el parámetro creativeminds.perfilado.activo desactivado el coste es una consulta
+# a la caché del registro; activado, mide el tiempo, las consultas SQL y los registros tratados de cada llamada.
+def perfilar(metodo):
+
+    @functools.wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        if 'creativeminds.perf.sample' not in self.env.registry or not self.env['creativeminds.perf.sample']._perfilado_activo():
+            return metodo(self, *args, **kwargs)
+        nombre = f"{self._name}.{metodo.__name__}"
+        en_curso = _EN_CURSO.__dict__.setdefault('metodos', set())
+        if nombre in en_curso:
+            return metodo(self, *args, **kwargs)
+        en_curso.add(nombre)
+        consultas = self.env.cr.sql_log_count
+        inicio = time.perf_counter()
+        resultado = None
+        try:
+            resultado = metodo(self, *args, **kwargs)
+            return resultado
+        finally:
+            en_curso.discard(nombre)
+            duracion = (time.perf_counter() - inicio) * 1000
+            registros = len(resultado) if isinstance(resultado, models.BaseModel) else len(self)
+            _anotar(self.env, nombre, duracion, self.env.cr.sql_log_count - consultas, registros)
+
+    return envoltorio
+
+
+# Métodos privados que también se miden: los del ORM y la validación por reglas (_REGLAS_VALIDACION), que sustituye
+# a las restricciones @api.constrains en Proyecto y no se detectaría por el atributo _constrains.
+_METODOS_PRIVADOS = {'create', 'write', 'unlink', '_validate_fields', '_validar_lote'}
+
+
+# Envuelve los métodos públicos, los de _METODOS_PRIVADOS, las tareas programadas (_cron_*), las restricciones
+# (@api.constrains) y las reglas de _REGLAS_VALIDACION definidos en una clase.
+def instrumentar(clase):
+    reglas = vars(clase).get('_REGLAS_VALIDACION', {})
+    for nombre, metodo in list(vars(clase).items()):
+        if not inspect.isfunction(metodo):
+            continue
+        if (nombre.startswith('_') and not nombre.startswith('_cron_') and nombre not in _METODOS_PRIVADOS
+                and nombre not in reglas and not hasattr(metodo, '_constrains')):
+            continue
+        setattr(clase, nombre, perfilar(metodo))
+
+
+def _anotar(env, metodo, duracion, consultas, registros):
+    global _ultimo_volcado
+    with _BLOQUEO:
+        _BUFER.append((metodo, fields.Datetime.now(), duracion, consultas, registros))
+        if len(_BUFER) < _TAMANO_VOLCADO and time.monotonic() - _ultimo_volcado < _SEGUNDOS_VOLCADO:
+            return
+        pendientes = _BUFER[:]
+        del _BUFER[:]
+        _ultimo_volcado = time.monotonic()
+    # Cursor propio: las muestras sobreviven aunque la transacción medida se deshaga
+    try:
+        with env.registry.cursor() as cr:
+            api.Environment(cr, env.uid, {})['creativeminds.perf.sample']._volcar(pendientes)
+    except Exception:
+        _logger.exception("Perfilado: no se han podido guardar %s muestras", len(pendientes))
+
+
+class PerfSample(models.Model):
+    _name = 'creativeminds.perf.sample'
+    _description = 'Muestras de Rendimiento'
+    _order = 'id desc'
+    _log_access = False  # Tabla de medidas: se escribe por SQL y no necesita columnas de auditoría
+
+    metodo = fields.Char(string='Método', readonly=True, index=True)  # modelo.método
+    fecha = fields.Datetime(string='Fecha', readonly=True)
+    duracion_ms = fields.Float(string='Duración (ms)', readonly=True)
+    consultas = fields.Integer(string='Consultas SQL', readonly=True)
+    registros = fields.Integer(string='Registros', readonly=True)  # Registros recibidos (o creados, en create)
+
+    @api.model
+    @tools.ormcache()
+    def _perfilado_activo(self):
+        return self.env['ir.config_parameter'].sudo().get_param('creativeminds.perfilado.activo') == 'True'
+
+    # Inserta las muestras y recorta la tabla como un búfer circular de creativeminds.perfilado.max_muestras filas.
+    @api.model
+    def _volcar(self, muestras):
+        if not muestras:
+            return
+        maximo = int(self.env['ir.config_parameter'].sudo().get_param('creativeminds.perfilado.max_muestras', 100000))
+        self.env.cr.execute("""
+            INSERT INTO creativeminds_perf_sample (metodo, fecha, duracion_ms, consultas, registros)
+            SELECT * FROM unnest(%s::varchar[], %s::timestamp[], %s::float8[], %s::int[], %s::int[])
+        """, [list(columna) for columna in zip(*muestras)])
+        self.env.cr.execute("""
+            DELETE FROM creativeminds_perf_sample
+             WHERE id <= (SELECT MAX(id) FROM creativeminds_perf_sample) - %s
+        """, [maximo])
+
+    # Guarda las muestras pendientes de este proceso en la transacción actual (antes de consultar el informe).
+    # Los búferes de los demás workers se vuelcan solos (ver _BUFER).
+    @api.model
+    def volcar_pendientes(self):
+        with _BLOQUEO:
+            pendientes = _BUFER[:]
+            del _BUFER[:]
+        self._volcar(pendientes)
+        self.env['creativeminds.perf.informe'].invalidate_model()
+
+    # Los métodos más lentos por percentil 95: [{'metodo', 'llamadas', 'p50_ms', 'p95_ms', ...}].
+    @api.model
+    def obtener_informe(self, limite=20):
+        self.volcar_pendientes()
+        return self.env['creativeminds.perf.informe'].search_read(
+            [], ['metodo', 'llamadas', 'p50_ms', 'p95_ms', 'max_ms', 'consultas_media', 'registros_media'], limit=limite,
+        )
+
+
+class PerfInforme(models.Model):
+    _name = 'creativeminds.perf.informe'
+    _description = 'Informe de Rendimiento por Método'
+    _order = 'p95_ms desc'
+    _auto = False  # Vista SQL sobre las muestras
+
+    metodo = fields.Char(string='Método', readonly=True)
+    llamadas = fields.Integer(string='Llamadas', readonly=True)
+    p50_ms = fields.Float(string='p50 (ms)', readonly=True)
+    p95_ms = fields.Float(string='p95 (ms)', readonly=True)
+    max_ms = fields.Float(string='Máximo (ms)', readonly=True)
+    consultas_media = fields.Float(string='Consultas (media)', readonly=True)
+    registros_media = fields.Float(string='Registros (media)', readonly=True)
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute(f"""
+            CREATE VIEW {self._table} AS
+            SELECT MIN(id) AS id, metodo, COUNT(*) AS llamadas,
+                   percentile_cont(0.5) WITHIN GROUP (ORDER BY duracion_ms) AS p50_ms,
+                   percentile_cont(0.95) WITHIN GROUP (ORDER BY duracion_ms) AS p95_ms,
+                   MAX(duracion_ms) AS max_ms,
+                   AVG(consultas) AS consultas_media,
+                   AVG(registros) AS registros_media
+              FROM creativeminds_perf_sample
+          GROUP BY metodo
+        """)
+
+
+# Instrumentación de los modelos de negocio del módulo (todos salvo este).
+for _modulo in (modelos_negocio, metricas, ir_attachment, recordatorios, notificaciones, exportacion, importacion,
+                capacidad, planificacion, riesgos, historico_kpi, busqueda, previsiones, informes):
+    for _nombre, _clase in inspect.getmembers(_modulo, inspect.isclass):
+        if issubclass(_clase, models.BaseModel) and _clase.__module__ == _modulo.__name__:
+            instrumentar(_clase)
@@ -0,0 +1,225 @@
+from odoo import models, fields, api  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
+from odoo.exceptions import ValidationError  # Para las dependencias inválidas y los ciclos.
+from collections import defaultdict, deque  # Para el grafo de dependencias y el orden topológico.
+import json  # Para guardar el resultado de la planificación en el proyecto.
+import logging  # Para registrar información y errores en el log de Odoo.
+
+_logger = logging.getLogger(__name__)
+
+
+# Las dependencias de un proyecto forman un ciclo; 'tareas' son las que no se han podido ordenar.
+class CicloDependencias(ValueError):
+
+    def __init__(self, tareas):
+        super().__init__(f"Las dependencias forman un ciclo entre {len(tareas)} tareas.")
+        self.tareas = tareas
+
+
+# Ruta crítica de un proyecto en tiempo lineal (O(tareas + dependencias)).
+#
+# duraciones: {tarea_id: días}; dependencias: lista de (predecesora_id, tarea_id, desfase_en_días), de tipo fin-inicio.
+# Devuelve la duración del proyecto y, por tarea, [inicio temprano, fin temprano, inicio tardío, fin tardío, holgura]
+# en días desde el comienzo del proyecto. Lanza CicloDependencias si el grafo no es acíclico.
+def planificar(duraciones, dependencias):
+    sucesoras = defaultdict(list)
+    predecesoras = defaultdict(list)
+    pendientes = dict.fromkeys(duraciones, 0)
+    for predecesora, tarea, desfase in dependencias:
+        sucesoras[predecesora].append((tarea, desfase))
+        predecesoras[tarea].append((predecesora, desfase))
+        pendientes[tarea] += 1
+
+    # Orden topológico (Kahn) con el cálculo hacia delante de los tiempos tempranos
+    cola = deque(tarea for tarea, n in pendientes.items() if n == 0)
+    orden = []
+    inicio_temprano = dict.fromkeys(duraciones, 0)
+    fin_temprano = {}
+    while cola:
+        tarea = cola.popleft()
+        orden.append(tarea)
+        fin_temprano[tarea] = inicio_temprano[tarea] + duraciones[tarea]
+        for sucesora, desfase in sucesoras[tarea]:
+            inicio_temprano[sucesora] = max(inicio_temprano[sucesora], fin_temprano[tarea] + desfase)
+            pendientes[sucesora] -= 1
+            if not pendientes[sucesora]:
+                cola.append(sucesora)
+    if len(orden) != len(duraciones):
+        raise CicloDependencias([tarea for tarea, n in pendientes.items() if n])
+
+    # Cálculo hacia atrás de los tiempos tardíos en orden topológico inverso
+    duracion = max(fin_temprano.values(), default=0)
+    fin_tardio = dict.fromkeys(duraciones, duracion)
+    tiempos = {}
+    for tarea in reversed(orden):
+        inicio_tardio = fin_tardio[tarea] - duraciones[tarea]
+        for predecesora, desfase in predecesoras[tarea]:
+            fin_tardio[predecesora] = min(fin_tardio[predecesora], inicio_tardio - desfase)
+        tiempos[tarea] = [
+            inicio_temprano[tarea], fin_temprano[tarea], inicio_tardio, fin_tardio[tarea],
+            inicio_tardio - inicio_temprano[tarea],
+        ]
+    return {'duracion': duracion, 'tareas': tiempos}
+
+
+class TareaDependencia(models.Model):
+    _name = 'creativeminds.tarea.dependencia'
+    _description = 'Dependencias entre Tareas'
+
+    tarea_id = fields.Many2one('creativeminds.tarea', string='Tarea', required=True, ondelete='cascade', index=True)
+    predecesora_id = fields.Many2one('creativeminds.tarea', string='Depende de', required=True, ondelete='cascade', index=True)
+    proyecto_id = fields.Many2one(related='tarea_id.proyecto_id', store=True, index=True)
+    desfase = fields.Integer(string='Desfase (días)', default=0)  # Días de espera entre el fin de la predecesora y el inicio de la tarea
+
+    _sql_constraints = [
+        ('dependencia_unica', 'UNIQUE(tarea_id, predecesora_id)', "La dependencia ya existe."),
+        ('sin_autodependencia', 'CHECK(tarea_id != predecesora_id)', "Una tarea no puede depender de sí misma."),
+    ]
+
+    # Las dos tareas deben ser del mismo proyecto y el grafo de cada proyecto debe seguir siendo acíclico.
+    @api.constrains('tarea_id', 'predecesora_id')
+    def _verificar_dependencias(self):
+        for dependencia in self:
+            if dependencia.tarea_id.proyecto_id != dependencia.predecesora_id.proyecto_id:
+                raise ValidationError("Solo se pueden enlazar tareas del mismo proyecto.")
+        for proyecto in self.proyecto_id:
+            try:
+                proyecto._calcular_planificacion()
+            except CicloDependencias as e:
+                raise ValidationError(f"Las dependencias del proyecto {proyecto.nombre} forman un ciclo ({len(e.tareas)} tareas afectadas).")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        dependencias = super(TareaDependencia, self).create(vals_list)
+        dependencias.proyecto_id._invalidar_planificacion()
+        return dependencias
+
+    def write(self, vals):
+        proyectos = self.proyecto_id
+        res = super(TareaDependencia, self).write(vals)
+        (proyectos | self.proyecto_id)._invalidar_planificacion()
+        return res
+
+    def unlink(self):
+        proyectos = self.proyecto_id
+        res = super(TareaDependencia, self).unlink()
+        proyectos.exists()._invalidar_planificacion()
+        return res
+
+
+class ProyectoPlanificacion(models.Model):
+    _inherit = 'creativeminds.proyecto'
+
+    # Resultado de la última planificación (JSON). Vacío cuando hay que recalcularla.
+    planificacion_cache = fields.Text(string='Planificación (caché)', copy=False, prefetch=False, readonly=True)
+
+    # Devuelve la planificación de cada proyecto: {proyecto_id: {'duracion', 'criticas', 'tareas'}}.
+    # Usa la caché del proyecto y solo recalcula los proyectos cuyas tareas o dependencias han cambiado.
+    def obtener_planificacion(self):
+        planificaciones = {}
+        for proyecto in self:
+            if proyecto.planificacion_cache:
+                planificacion = json.loads(proyecto.planificacion_cache)
+                planificacion['tareas'] = {int(tarea): tiempos for tarea, tiempos in planificacion['tareas'].items()}
+                planificaciones[proyecto.id] = planificacion
+                continue
+            try:
+                planificacion = proyecto._calcular_planificacion()
+            except CicloDependencias as e:
+                # Las restricciones lo impiden, pero una lectura nunca debe fallar: sin planificación y sin caché
+                _logger.warning("Planificación del proyecto %s no calculable: %s", proyecto.id, e)
+                planificaciones[proyecto.id] = {'duracion': 0, 'criticas': [], 'tareas': {}}
+                continue
+            # Se guarda por SQL: la caché no es un cambio del proyecto (ni write_date, ni reglas, ni notificaciones)
+            self.env.cr.execute(
+                "UPDATE creativeminds_proyecto SET planificacion_cache = %s WHERE id = %s",
+                [json.dumps(planificacion), proyecto.id],
+            )
+            proyecto.invalidate_recordset(['planificacion_cache'])
+            planificaciones[proyecto.id] = planificacion
+        return planificaciones
+
+    # Calcula la ruta crítica de un proyecto leyendo solo las columnas necesarias.
+    def _calcular_planificacion(self):
+        self.ensure_one()
+        self.env['creativeminds.tarea'].flush_model(['proyecto_id', 'fecha_inicio', 'fecha_fin'])
+        self.env['creativeminds.tarea.dependencia'].flush_model()
+        self.env.cr.execute("""
+            SELECT id, GREATEST(COALESCE(fecha_fin - fecha_inicio + 1, 1), 1)
+              FROM creativeminds_tarea
+             WHERE proyecto_id = %s
+        """, [self.id])
+        duraciones = dict(self.env.cr.fetchall())
+        self.env.cr.execute("""
+            SELECT predecesora_id, tarea_id, desfase
+              FROM creativeminds_tarea_dependencia
+             WHERE proyecto_id = %s
+        """, [self.id])
+        planificacion = planificar(duraciones, self.env.cr.fetchall())
+        planificacion['criticas'] = sorted(tarea for tarea, tiempos in planificacion['tareas'].items() if tiempos[4] == 0)
+        return planificacion
+
+    # Vacía la caché de planificación de los proyectos dados.
+    def _invalidar_planificacion(self):
+        proyectos = self.filtered(lambda p: isinstance(p.id, int))
+        if proyectos:
+            self.env.cr.execute(
+                "UPDATE creativeminds_proyecto SET planificacion_cache = NULL WHERE id = ANY(%s) AND planificacion_cache IS NOT NULL",
+                [proyectos.ids],
+            )
+            proyectos.invalidate_recordset(['planificacion_cache'])
+
+
+class TareaPlanificacion(models.Model):
+    _inherit = 'creativeminds.tarea'
+
+    dependencia_ids = fields.One2many('creativeminds.tarea.dependencia', 'tarea_id', string='Dependencias')
+    holgura = fields.Integer(string='Holgura (días)', compute='_compute_planificacion')
+    es_critica = fields.Boolean(string='En la Ruta Crítica', compute='_compute_planificacion')
+
+    # Campos de la tarea que cambian la planificación de su proyecto.
+    _CAMPOS_PLANIFICACION = {'proyecto_id', 'fecha_inicio', 'fecha_fin'}
+
+    # Lee la holgura de la planificación del proyecto (en caché salvo que algo haya cambiado).
+    @api.depends('proyecto_id', 'fecha_inicio', 'fecha_fin', 'dependencia_ids')
+    def _compute_planificacion(self):
+        guardadas = self.filtered(lambda t: isinstance(t.id, int) and t.proyecto_id)
+        planificaciones = guardadas.proyecto_id.obtener_planificacion() if guardadas else {}
+        for tarea in self:
+            tiempos = planificaciones.get(tarea.proyecto_id.id, {}).get('tareas', {}).get(tarea.id) if tarea in guardadas else None
+            tarea.holgura = tiempos[4] if tiempos else 0
+            tarea.es_critica = bool(tiempos) and tiempos[4] == 0
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        tareas = super(TareaPlanificacion, self).create(vals_list)
+        tareas.proyecto_id._invalidar_planificacion()
+        return tareas
+
+    def write(self, vals):
+        if not self._CAMPOS_PLANIFICACION.intersection(vals):
+            return super(TareaPlanificacion, self).write(vals)
+        if 'proyecto_id' in vals:
+            self._verificar_cambio_proyecto(vals['proyecto_id'])
+        proyectos = self.proyecto_id
+        res = super(TareaPlanificacion, self).write(vals)
+        (proyectos | self.proyecto_id)._invalidar_planificacion()
+        return res
+
+    # Una tarea con dependencias (en cualquier sentido) no puede cambiar de proyecto: las dependencias solo
+    # enlazan tareas del mismo proyecto y quedarían fuera del grafo de ambos.
+    def _verificar_cambio_proyecto(self, proyecto_id):
+        movidas = self.filtered(lambda t: t.proyecto_id.id != proyecto_id)
+        if not movidas:
+            return
+        con_dependencias = self.env['creativeminds.tarea.dependencia'].search([
+            '|', ('tarea_id', 'in', movidas.ids), ('predecesora_id', 'in', movidas.ids),
+        ])
+        if con_dependencias:
+            nombres = ', '.join(((con_dependencias.tarea_id | con_dependencias.predecesora_id) & movidas).mapped('nombre'))
+            raise ValidationError(f"No se puede cambiar de proyecto una tarea con dependencias ({nombres}). Elimínalas antes.")
+
+    def unlink(self):
+        proyectos = self.proyecto_id
+        res = super(TareaPlanificacion, self).unlink()
+        proyectos.exists()._invalidar_planificacion()
+        return res
@@ -0,0 +1,170 @@
+from odoo import models, fields, api  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
+import logging  # Para registrar información y errores en el log de Odoo.
+
+_logger = logging.getLogger(__name__)
+
+
+class ProyectoPrevision(models.Model):
+    _inherit = 'creativeminds.proyecto'
+
+    # Previsión presupuestaria. La calcula _recalcular_previsiones por SQL para toda la cartera pendiente a la vez.
+    costo_ejecutado = fields.Float(string='Coste Ejecutado', readonly=True, copy=False)  # Coste de los recursos devengado hasta hoy
+    tasa_gasto_diaria = fields.Float(string='Gasto Diario', readonly=True, copy=False)  # Coste ejecutado por día transcurrido
+    costo_final_previsto = fields.Float(string='Coste Final Previsto', readonly=True, copy=False)
+    fecha_sobrecoste = fields.Date(string='Fecha Prevista de Sobrecoste', readonly=True, copy=False)  # Vacía si no se prevé sobrecoste
+    fecha_prevision = fields.Date(string='Fecha de la Previsión', readonly=True, copy=False)
+    prevision_pendiente = fields.Boolean(string='Previsión Pendiente', default=True, readonly=True, copy=False)
+
+    # Campos del proyecto que cambian su previsión.
+    _CAMPOS_PREVISION = {'presupuesto_estimado', 'fecha_inicio', 'fecha_fin', 'recursos_ids'}
+
+    def init(self):
+        # La tarea programada solo busca los proyectos marcados: índice parcial, casi vacío la mayor parte del tiempo.
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS creativeminds_proyecto_prevision_pendiente_idx
+                ON creativeminds_proyecto (id) WHERE prevision_pendiente
+        """)
+
+    def write(self, vals):
+        res = super(ProyectoPrevision, self).write(vals)
+        if self._CAMPOS_PREVISION.intersection(vals):
+            self._marcar_prevision_pendiente()
+        return res
+
+    # Marca la previsión de los proyectos como pendiente, por SQL: no es un cambio del proyecto (ni write_date, ni reglas).
+    def _marcar_prevision_pendiente(self):
+        proyectos = self.filtered(lambda p: isinstance(p.id, int))
+        if proyectos:
+            self.env.cr.execute(
+                "UPDATE creativeminds_proyecto SET prevision_pendiente = TRUE WHERE id = ANY(%s) AND NOT prevision_pendiente",
+                [proyectos.ids],
+            )
+            proyectos.invalidate_recordset(['prevision_pendiente'])
+
+    # Recalcula en una sola sentencia la previsión de los proyectos dados; por defecto, los marcados como pendientes
+    # (índice parcial) y, con diaria=True, los calculados otro día. El coste de cada recurso se devenga de forma
+    # lineal entre sus fechas (o las del proyecto si no tiene); el gasto diario es lo devengado entre los días
+    # transcurridos desde el primer recurso, y se proyecta hasta la fecha de fin del proyecto para estimar el coste
+    # final y el día en que se supera el presupuesto.
+    @api.model
+    def _recalcular_previsiones(self, proyectos=None, diaria=False):
+        self.env['creativeminds.recurso'].flush_model(['proyecto_id', 'costo_total', 'fecha_inicio', 'fecha_fin'])
+        self.flush_model(['presupuesto_estimado', 'fecha_inicio', 'fecha_fin', 'prevision_pendiente'])
+        hoy = fields.Date.context_today(self)
+        # La condición se elige aquí y no con un CASE en SQL, para que PostgreSQL pueda usar el índice parcial.
+        if proyectos is not None:
+            condicion = 'id = ANY(%(proyectos)s)'
+        elif diaria:
+            condicion = 'prevision_pendiente OR fecha_prevision IS DISTINCT FROM %(hoy)s'
+        else:
+            condicion = 'prevision_pendiente'
+        self.env.cr.execute(f"""
+            WITH objetivo AS (
+                SELECT id, presupuesto_estimado, fecha_inicio, fecha_fin
+                  FROM creativeminds_proyecto
+                 WHERE {condicion}
+            ), asignaciones AS (
+                SELECT o.id AS proyecto_id, COALESCE(r.costo_total, 0) AS coste,
+                       COALESCE(r.fecha_inicio, o.fecha_inicio) AS inicio,
+                       COALESCE(r.fecha_fin, o.fecha_fin) AS fin
+                  FROM objetivo o
+                  JOIN creativeminds_recurso r ON r.proyecto_id = o.id
+            ), gasto AS (
+                SELECT proyecto_id,
+                       SUM(CASE WHEN inicio IS NULL OR fin IS NULL OR fin < inicio THEN 0
+                                ELSE coste * GREATEST(0, LEAST(%(hoy)s::date, fin) - inicio + 1) / (fin - inicio + 1) END) AS ejecutado,
+                       MIN(inicio) AS primer_dia
+                  FROM asignaciones
+              GROUP BY proyecto_id
+            ), tasa AS (
+                SELECT o.id, o.presupuesto_estimado, o.fecha_fin,
+                       COALESCE(g.ejecutado, 0) AS ejecutado,
+                       CASE WHEN g.primer_dia <= %(hoy)s THEN g.ejecutado / (%(hoy)s::date - g.primer_dia + 1) ELSE 0 END AS diaria
+                  FROM objetivo o
+             LEFT JOIN gasto g ON g.proyecto_id = o.id
+            ), prevision AS (
+                SELECT id, presupuesto_estimado, ejecutado, diaria,
+                       ejecutado + diaria * GREATEST(0, COALESCE(fecha_fin, %(hoy)s) - %(hoy)s::date) AS final
+                  FROM tasa
+            )
+            UPDATE creativeminds_proyecto p
+               SET costo_ejecutado = v.ejecutado,
+                   tasa_gasto_diaria = v.diaria,
+                   costo_final_previsto = v.final,
+                   fecha_sobrecoste = CASE
+                       WHEN COALESCE(v.presupuesto_estimado, 0) <= 0 OR v.final <= v.presupuesto_estimado THEN NULL
+                       WHEN v.ejecutado >= v.presupuesto_estimado THEN %(hoy)s::date
+                       ELSE %(hoy)s::date + CEIL((v.presupuesto_estimado - v.ejecutado) / v.diaria)::int
+                   END,
+                   fecha_prevision = %(hoy)s,
+                   prevision_pendiente = FALSE
+              FROM prevision v
+             WHERE p.id = v.id
+        """, {'proyectos': proyectos.ids if proyectos is not None else [], 'hoy': hoy})
+        recalculados = self.env.cr.rowcount
+        self.invalidate_model([
+            'costo_ejecutado', 'tasa_gasto_diaria', 'costo_final_previsto', 'fecha_sobrecoste',
+            'fecha_prevision', 'prevision_pendiente',
+        ])
+        return recalculados
+
+    # Tarea programada cada 15 minutos: recalcula solo las previsiones pendientes.
+    @api.model
+    def _cron_recalcular_previsiones(self):
+        recalculados = self._recalcular_previsiones()
+        if recalculados:
+            _logger.info("Previsiones presupuestarias: %s proyectos recalculados", recalculados)
+
+    # Tarea programada diaria: recalcula las previsiones de otro día, porque dependen de la fecha actual.
+    @api.model
+    def _cron_actualizar_previsiones_diarias(self):
+        recalculados = self._recalcular_previsiones(diaria=True)
+        _logger.info("Previsiones presupuestarias: actualización diaria de %s proyectos", recalculados)
+
+    # Previsión de cada proyecto: {proyecto_id: {...}}. Recalcula antes los que estén pendientes.
+    def obtener_previsiones(self):
+        hoy = fields.Date.context_today(self)
+        pendientes = self.filtered(lambda p: p.prevision_pendiente or p.fecha_prevision != hoy)
+        if pendientes:
+            self._recalcular_previsiones(pendientes)
+        return {
+            proyecto.id: {
+                'presupuesto': proyecto.presupuesto_estimado,
+                'ejecutado': proyecto.costo_ejecutado,
+                'gasto_diario': proyecto.tasa_gasto_diaria,
+                'coste_final_previsto': proyecto.costo_final_previsto,
+                'fecha_sobrecoste': proyecto.fecha_sobrecoste,
+            }
+            for proyecto in self
+        }
+
+    def action_actualizar_prevision(self):
+        self._recalcular_previsiones(self)
+        return True
+
+
+class RecursoPrevision(models.Model):
+    _inherit = 'creativeminds.recurso'
+
+    # Campos del recurso que cambian la previsión de su proyecto.
+    _CAMPOS_PREVISION = {'costo_por_hora', 'horas_asignadas', 'fecha_inicio', 'fecha_fin', 'proyecto_id'}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        recursos = super(RecursoPrevision, self).create(vals_list)
+        recursos.proyecto_id._marcar_prevision_pendiente()
+        return recursos
+
+    def write(self, vals):
+        if not self._CAMPOS_PREVISION.intersection(vals):
+            return super(RecursoPrevision, self).write(vals)
+        proyectos = self.proyecto_id
+        res = super(RecursoPrevision, self).write(vals)
+        (proyectos | self.proyecto_id)._marcar_prevision_pendiente()
+        return res
+
+    def unlink(self):
+        proyectos = self.proyecto_id
+        res = super(RecursoPrevision, self).unlink()
+        proyectos.exists()._marcar_prevision_pendiente()
+        return res
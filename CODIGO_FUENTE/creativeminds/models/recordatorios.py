@@ -0,0 +1,133 @@
+from odoo import models, fields, api  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
+from datetime import timedelta  # Para calcular la ventana de las métricas de rendimiento.
+import logging  # Para registrar información y errores en el log de Odoo.
+import threading  # Para no confirmar transacciones durante los tests.
+import time  # Para medir la duración de cada envío.
+
+_logger = logging.getLogger(__name__)
+
+
+class Recordatorio(models.Model):
+    _name = 'creativeminds.recordatorio'
+    _description = 'Cola de Recordatorios de Proyecto'
+    _order = 'id'
+
+    proyecto_id = fields.Many2one('creativeminds.proyecto', string='Proyecto', required=True, ondelete='cascade', index=True)
+    responsable_id = fields.Many2one('creativeminds.empleado', string='Responsable', required=True, ondelete='cascade')
+    estado = fields.Selection([
+        ('pendiente', 'Pendiente'),
+        ('enviado', 'Enviado'),
+        ('error', 'Error'),
+    ], string='Estado', default='pendiente', required=True, index=True)
+    intentos = fields.Integer(string='Intentos')  # Número de envíos fallidos
+    error = fields.Text(string='Último Error')
+    fecha_envio = fields.Datetime(string='Fecha de Envío')
+    duracion = fields.Float(string='Duración (s)', digits=(16, 4))  # Tiempo empleado en enviar el recordatorio
+
+    # Número máximo de intentos antes de dejar el recordatorio en error.
+    _MAX_INTENTOS = 3
+
+    def init(self):
+        # Como mucho un recordatorio pendiente por proyecto y responsable: los repetidos se descartan al encolar.
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS creativeminds_recordatorio_pendiente_unico
+                ON creativeminds_recordatorio (proyecto_id, responsable_id) WHERE estado = 'pendiente'
+        """)
+
+    # Encola un recordatorio para el responsable de cada proyecto, salvo que ya tenga uno pendiente.
+    # Se inserta por SQL con ON CONFLICT DO NOTHING sobre el índice único parcial: si otra transacción encola a la
+    # vez el mismo recordatorio, el repetido se descarta sin lanzar un IntegrityError en la transacción del usuario.
+    @api.model
+    def _encolar(self, proyectos):
+        proyectos = proyectos.filtered('responsable_id')
+        if not proyectos:
+            return self.browse()
+        nuevos = sorted({(proyecto.id, proyecto.responsable_id.id) for proyecto in proyectos})
+        self.env.cr.execute("""
+            INSERT INTO creativeminds_recordatorio (proyecto_id, responsable_id, estado, intentos,
+                                                    create_uid, create_date, write_uid, write_date)
+            SELECT proyecto_id, responsable_id, 'pendiente', 0,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM unnest(%(proyectos)s::int[], %(responsables)s::int[]) AS n(proyecto_id, responsable_id)
+            ON CONFLICT (proyecto_id, responsable_id) WHERE estado = 'pendiente' DO NOTHING
+         RETURNING id
+        """, {
+            'uid': self.env.uid,
+            'proyectos': [proyecto_id for proyecto_id, _responsable_id in nuevos],
+            'responsables': [responsable_id for _proyecto_id, responsable_id in nuevos],
+        })
+        return self.browse(sorted(fila[0] for fila in self.env.cr.fetchall()))
+
+    # Tarea programada que vacía la cola en lotes. Cada lote se confirma por separado, de modo que un fallo
+    # de envío no deshace el trabajo ya hecho y otro proceso puede repartirse la cola (SKIP LOCKED).
+    @api.model
+    def _cron_procesar_cola(self, tamano_lote=None, max_lotes=None):
+        parametros = self.env['ir.config_parameter'].sudo()
+        tamano_lote = tamano_lote or int(parametros.get_param('creativeminds.recordatorios.tamano_lote', 100))
+        max_lotes = max_lotes or int(parametros.get_param('creativeminds.recordatorios.max_lotes', 50))
+        confirmar = not getattr(threading.current_thread(), 'testing', False)
+
+        enviados = 0
+        inicio = time.perf_counter()
+        for _lote in range(max_lotes):
+            self.env.cr.execute("""
+                SELECT id FROM creativeminds_recordatorio
+                 WHERE estado = 'pendiente'
+              ORDER BY id
+                 LIMIT %s
+                   FOR UPDATE SKIP LOCKED
+            """, [tamano_lote])
+            lote = self.browse([fila[0] for fila in self.env.cr.fetchall()])
+            if not lote:
+                break
+            enviados += lote._enviar()
+            if confirmar:
+                self.env.cr.commit()
+
+        segundos = time.perf_counter() - inicio
+        if enviados:
+            _logger.info(
+                "Recordatorios enviados: %s en %.2f s (%.1f/s), pendientes en cola: %s",
+                enviados, segundos, enviados / segundos if segundos else 0.0, self.search_count([('estado', '=', 'pendiente')]),
+            )
+
+    # Envía los recordatorios de self; devuelve cuántos se han enviado correctamente.
+    def _enviar(self):
+        Proyecto = self.env['creativeminds.proyecto']
+        enviados = 0
+        for recordatorio in self:
+            inicio = time.perf_counter()
+            try:
+                with self.env.cr.savepoint():
+                    Proyecto.enviar_recordatorio(recordatorio.proyecto_id)
+            except Exception as error:
+                _logger.warning("No se pudo enviar el recordatorio %s: %s", recordatorio.id, error)
+                intentos = recordatorio.intentos + 1
+                recordatorio.write({
+                    'intentos': intentos,
+                    'error': str(error),
+                    'estado': 'error' if intentos >= self._MAX_INTENTOS else 'pendiente',
+                })
+                continue
+            recordatorio.write({
+                'estado': 'enviado',
+                'fecha_envio': fields.Datetime.now(),
+                'duracion': time.perf_counter() - inicio,
+            })
+            enviados += 1
+        return enviados
+
+    # Métricas de la cola: profundidad y rendimiento de los envíos de la última hora.
+    @api.model
+    def obtener_metricas_cola(self):
+        por_estado = dict(self._read_group([], ['estado'], ['__count']))
+        enviados, duracion = self._read_group(
+            [('estado', '=', 'enviado'), ('fecha_envio', '>=', fields.Datetime.now() - timedelta(hours=1))],
+            [], ['__count', 'duracion:sum'],
+        )[0]
+        return {
+            'pendientes': por_estado.get('pendiente', 0),
+            'errores': por_estado.get('error', 0),
+            'enviados_ultima_hora': enviados,
+            'recordatorios_por_segundo': enviados / duracion if duracion else 0.0,
+        }
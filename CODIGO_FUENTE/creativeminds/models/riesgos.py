@@ -0,0 +1,146 @@
+from odoo import models, fields, api  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
+from datetime import timedelta  # Para calcular el horizonte de aviso.
+import json  # Para guardar la marca de agua de la última ejecución.
+import logging  # Para registrar información y errores en el log de Odoo.
+
+_logger = logging.getLogger(__name__)
+
+
+class Riesgo(models.Model):
+    _name = 'creativeminds.riesgo'
+    _description = 'Elementos Vencidos o Próximos a Vencer'
+    _order = 'fecha_limite, id'
+    _log_access = False  # Tabla derivada: la mantiene el escáner por SQL
+
+    origen = fields.Selection([
+        ('proyecto', 'Proyecto'),
+        ('tarea', 'Tarea'),
+        ('accion', 'Acción de Feedback'),
+    ], string='Origen', required=True, readonly=True)
+    res_id = fields.Integer(string='ID del Registro', required=True, readonly=True)
+    nombre = fields.Char(string='Nombre', readonly=True)
+    proyecto_id = fields.Many2one('creativeminds.proyecto', string='Proyecto', ondelete='cascade', readonly=True, index=True)
+    fecha_limite = fields.Date(string='Fecha Límite', readonly=True)
+    estado = fields.Selection([
+        ('vencido', 'Vencido'),
+        ('proximo', 'Próximo a Vencer'),
+    ], string='Estado', readonly=True, index=True)
+    dias_restantes = fields.Integer(string='Días Restantes', compute='_compute_dias_restantes')  # Negativo si está vencido
+
+    _sql_constraints = [
+        ('registro_unico', 'UNIQUE(origen, res_id)', "El registro ya figura entre los elementos en riesgo."),
+    ]
+
+    # Fuentes del escáner: tabla, columna de fecha, condición de registro abierto, nombre y proyecto.
+    _FUENTES = {
+        'proyecto': {
+            'tabla': 'creativeminds_proyecto t',
+            'fecha': 't.fecha_fin',
+            'abierto': "t.estado IS DISTINCT FROM 'finalizado'",
+            'nombre': 't.nombre',
+            'proyecto': 't.id',
+        },
+        'tarea': {
+            'tabla': 'creativeminds_tarea t',
+            'fecha': 't.fecha_fin',
+            'abierto': "t.estado IS DISTINCT FROM 'completada'",
+            'nombre': 't.nombre',
+            'proyecto': 't.proyecto_id',
+        },
+        'accion': {
+            'tabla': 'creativeminds_feedback_action t LEFT JOIN creativeminds_feedback f ON f.id = t.feedback_id',
+            'fecha': 't.due_date',
+            'abierto': "t.status IS DISTINCT FROM 'done'",
+            'nombre': 'LEFT(t.action_text, 120)',
+            'proyecto': 'f.proyecto_id',
+        },
+    }
+
+    # write_date es la hora de inicio de la transacción que modificó el registro: el margen cubre las transacciones
+    # que empezaron antes de una pasada y confirmaron después de ella.
+    _MARGEN_EJECUCION = timedelta(minutes=10)
+
+    def init(self):
+        # Las pasadas incrementales buscan por fecha (índices de los campos) o por última modificación.
+        for tabla in ('creativeminds_proyecto', 'creativeminds_tarea', 'creativeminds_feedback_action'):
+            self.env.cr.execute(f"CREATE INDEX IF NOT EXISTS {tabla}_write_date_idx ON {tabla} (write_date)")
+
+    @api.depends('fecha_limite')
+    def _compute_dias_restantes(self):
+        hoy = fields.Date.context_today(self)
+        for riesgo in self:
+            riesgo.dias_restantes = (riesgo.fecha_limite - hoy).days if riesgo.fecha_limite else 0
+
+    # Abre el registro de origen.
+    def action_abrir_origen(self):
+        self.ensure_one()
+        modelos = {'proyecto': 'creativeminds.proyecto', 'tarea': 'creativeminds.tarea', 'accion': 'creativeminds.feedback.action'}
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': modelos[self.origen],
+            'res_id': self.res_id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
+
+    # Tarea programada. La marca de agua guarda el horizonte y el momento de la pasada anterior, así que
+    # cada pasada solo lee los registros cuya fecha ha entrado en la ventana desde entonces o que se han
+    # modificado después; la primera pasada (sin marca) recorre todo lo que vence antes del horizonte.
+    @api.model
+    def _cron_escanear(self):
+        Parametros = self.env['ir.config_parameter'].sudo()
+        dias_aviso = int(Parametros.get_param('creativeminds.riesgos.dias_aviso', 7))
+        marca = json.loads(Parametros.get_param('creativeminds.riesgos.marca') or '{}')
+        ahora = fields.Datetime.now()
+        hoy = fields.Date.context_today(self)
+        horizonte = hoy + timedelta(days=dias_aviso)
+        self.env.flush_all()
+
+        parametros = {
+            'hoy': hoy,
+            'horizonte': horizonte,
+            'completa': not marca,
+            'horizonte_anterior': marca.get('horizonte', '1900-01-01'),
+            'ejecucion_anterior': marca.get('ejecucion', '1900-01-01 00:00:00'),
+        }
+        insertados = 0
+        for origen, fuente in self._FUENTES.items():
+            # Los registros cerrados, borrados o con la fecha movida fuera de la ventana salen de la lista
+            self.env.cr.execute(f"""
+                DELETE FROM creativeminds_riesgo r
+                 WHERE r.origen = %(origen)s
+                   AND NOT EXISTS (SELECT 1 FROM {fuente['tabla']}
+                                    WHERE t.id = r.res_id AND {fuente['abierto']} AND {fuente['fecha']} <= %(horizonte)s)
+            """, dict(parametros, origen=origen))
+            # Altas y cambios: rango de fechas nuevo en la ventana o registros modificados desde la pasada anterior
+            self.env.cr.execute(f"""
+                INSERT INTO creativeminds_riesgo (origen, res_id, nombre, proyecto_id, fecha_limite, estado)
+                SELECT %(origen)s, t.id, {fuente['nombre']}, {fuente['proyecto']}, {fuente['fecha']},
+                       CASE WHEN {fuente['fecha']} < %(hoy)s THEN 'vencido' ELSE 'proximo' END
+                  FROM {fuente['tabla']}
+                 WHERE {fuente['fecha']} <= %(horizonte)s
+                   AND {fuente['abierto']}
+                   AND (%(completa)s OR {fuente['fecha']} > %(horizonte_anterior)s OR t.write_date > %(ejecucion_anterior)s)
+                ON CONFLICT (origen, res_id) DO UPDATE
+                   SET nombre = EXCLUDED.nombre, proyecto_id = EXCLUDED.proyecto_id,
+                       fecha_limite = EXCLUDED.fecha_limite, estado = EXCLUDED.estado
+            """, dict(parametros, origen=origen))
+            insertados += self.env.cr.rowcount
+
+        # Lo que era próximo y ya ha pasado su fecha queda vencido
+        self.env.cr.execute("""
+            UPDATE creativeminds_riesgo SET estado = 'vencido' WHERE estado = 'proximo' AND fecha_limite < %s
+        """, [hoy])
+        vencidos = self.env.cr.rowcount
+        self.invalidate_model()
+
+        Parametros.set_param('creativeminds.riesgos.marca', json.dumps({
+            'horizonte': fields.Date.to_string(horizonte),
+            'ejecucion': fields.Datetime.to_string(ahora - self._MARGEN_EJECUCION),
+        }))
+        _logger.info("Escáner de riesgos: %s altas o cambios, %s pasan a vencidos", insertados, vencidos)
+
+    # Fuerza una pasada completa en la siguiente ejecución (por ejemplo, tras cargar datos directamente por SQL).
+    @api.model
+    def reiniciar_marca(self):
+        self.env['ir.config_parameter'].sudo().set_param('creativeminds.riesgos.marca', False)
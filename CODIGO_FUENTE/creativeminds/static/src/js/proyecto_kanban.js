@@ -0,0 +1,66 @@
+/** @odoo-module **/
+
+import { useEffect, useState, useSubEnv } from "@odoo/owl";
+import { registry } from "@web/core/registry";
+import { useService } from "@web/core/utils/hooks";
+import { formatFloat } from "@web/views/fields/formatters";
+import { KanbanHeader } from "@web/views/kanban/kanban_header";
+import { KanbanRenderer } from "@web/views/kanban/kanban_renderer";
+import { kanbanView } from "@web/views/kanban/kanban_view";
+
+// Cabecera de columna que añade el presupuesto sumado y el progreso medio del estado.
+export class ProyectoKanbanHeader extends KanbanHeader {
+    static template = "creativeminds.ProyectoKanbanHeader";
+
+    get agregados() {
+        return this.env.agregadosKanban[this.props.group.value];
+    }
+
+    formatear(valor) {
+        return formatFloat(valor, { digits: [false, 2] });
+    }
+}
+
+// Los agregados de todas las columnas se piden en una sola llamada (un _read_group agrupado por estado) y se
+// vuelven a pedir cuando cambian el dominio o las tarjetas cargadas.
+export class ProyectoKanbanRenderer extends KanbanRenderer {
+    static components = { ...KanbanRenderer.components, KanbanHeader: ProyectoKanbanHeader };
+
+    setup() {
+        super.setup();
+        this.orm = useService("orm");
+        this.agregados = useState({});
+        useSubEnv({ agregadosKanban: this.agregados });
+        useEffect(
+            () => {
+                this.cargarAgregados();
+            },
+            () => [
+                JSON.stringify(this.props.list.domain),
+                ...this.props.list.groups.map((grupo) => grupo.count),
+                ...this.props.list.groups.flatMap((grupo) =>
+                    grupo.list.records.map((registro) => registro.data.presupuesto_estimado)
+                ),
+            ]
+        );
+    }
+
+    async cargarAgregados() {
+        if (this.props.list.groupByField?.name !== "estado") {
+            return;
+        }
+        const agregados = await this.orm.call("creativeminds.proyecto", "obtener_agregados_kanban", [
+            this.props.list.domain,
+        ]);
+        for (const agregado of agregados) {
+            this.agregados[agregado.estado] = agregado;
+        }
+    }
+}
+
+export const proyectoKanbanView = {
+    ...kanbanView,
+    Renderer: ProyectoKanbanRenderer,
+};
+
+registry.category("views").add("creativeminds_proyecto_kanban", proyectoKanbanView);
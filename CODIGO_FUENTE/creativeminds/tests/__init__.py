@@ -0,0 +1,7 @@
+from . import test_indices
+from . import test_benchmark
+from . import test_planificacion
+from . import test_importacion
+from . import test_historico_kpi
+from . import test_capacidad
+from . import test_proyecto
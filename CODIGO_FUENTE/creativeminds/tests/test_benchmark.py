@@ -0,0 +1,30 @@
+import os  # Para leer la configuración del banco de pruebas desde el entorno.
+
+from odoo.tests import TransactionCase, tagged  # Clase base y etiquetas de los tests de Odoo.
+
+from odoo.addons.creativeminds.benchmarks import ejecutar
+
+
+# Banco de pruebas completo (benchmarks/ejecutar.py) como test opcional: '-standard' lo deja fuera de las
+# ejecuciones normales y se lanza con --test-tags creativeminds_bench. Se configura con variables de entorno:
+#   CREATIVEMINDS_BENCH_TAREAS        tamaño de la cartera sembrada (10000 por defecto)
+#   CREATIVEMINDS_BENCH_REPETICIONES  repeticiones de cada escenario (5 por defecto)
+#   CREATIVEMINDS_BENCH_SALIDA        fichero JSON donde guardar los resultados de este commit
+#   CREATIVEMINDS_BENCH_BASE          resultados de otro commit: el test falla si algún escenario empeora
+@tagged('creativeminds_bench', '-standard')
+class TestBenchmark(TransactionCase):
+
+    def test_benchmark(self):
+        salida = os.environ.get('CREATIVEMINDS_BENCH_SALIDA')
+        base = os.environ.get('CREATIVEMINDS_BENCH_BASE')
+        informe = ejecutar.ejecutar(
+            self.env,
+            n_tareas=int(os.environ.get('CREATIVEMINDS_BENCH_TAREAS', 10000)),
+            repeticiones=int(os.environ.get('CREATIVEMINDS_BENCH_REPETICIONES', 5)),
+            salida=salida,
+        )
+        errores = {nombre: resultado['error'] for nombre, resultado in informe['escenarios'].items() if 'error' in resultado}
+        self.assertFalse(errores, f"Escenarios con error: {errores}")
+        if base and salida:
+            regresiones = ejecutar.comparar(base, salida)
+            self.assertFalse(regresiones, f"Escenarios que empeoran respecto a {base}: {', '.join(regresiones)}")
@@ -0,0 +1,91 @@
+from datetime import timedelta  # Para situar las asignaciones en torno a la semana actual.
+
+from odoo import fields  # Para la fecha de hoy.
+from odoo.tests import TransactionCase  # Clase base de los tests de Odoo.
+
+
+# Los hooks de Recurso, Tarea, Proyecto y Empleado mantienen la carga semanal con deltas; después de cada cambio
+# la tabla debe coincidir con la que construye la reconstrucción completa (_cron_reconstruir).
+class TestCapacidad(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Carga = cls.env['creativeminds.carga.semanal'].sudo()
+        hoy = fields.Date.context_today(cls.Carga)
+        cls.lunes = hoy - timedelta(days=hoy.weekday())
+        cls.empleados = cls.env['creativeminds.empleado'].create({
+            'name': 'Primero',
+            'dni': '10000004D',
+            'partner_id': cls.env['res.partner'].create({'name': 'Primero'}).id,
+        }) | cls.env['creativeminds.empleado'].create({
+            'name': 'Segundo',
+            'dni': '10000005E',
+            'partner_id': cls.env['res.partner'].create({'name': 'Segundo'}).id,
+        })
+        cls.proyecto = cls.env['creativeminds.proyecto'].create({
+            'nombre': 'Proyecto de capacidad',
+            'responsable_id': cls.empleados[0].id,
+            'presupuesto_estimado': 100000,
+            'fecha_inicio': cls.lunes,
+            'fecha_fin': cls.lunes + timedelta(days=27),
+        })
+        # Recurso sin fechas propias (usa las del proyecto) repartido entre los dos empleados, y una tarea abierta
+        cls.recurso = cls.env['creativeminds.recurso'].create({
+            'nombre': 'Diseño',
+            'proyecto_id': cls.proyecto.id,
+            'empleado_id': [(6, 0, cls.empleados.ids)],
+            'horas_asignadas': 80,
+        })
+        cls.tarea = cls.env['creativeminds.tarea'].create({
+            'nombre': 'Maquetación',
+            'proyecto_id': cls.proyecto.id,
+            'responsable_id': cls.empleados[0].id,
+            'fecha_inicio': cls.lunes + timedelta(days=2),
+            'fecha_fin': cls.lunes + timedelta(days=9),
+        })
+
+    # Filas de carga de los empleados del test, redondeadas para comparar.
+    def _carga(self):
+        return sorted(
+            (fila['empleado_id'][0], fila['semana'], round(fila['horas_recursos'], 4), round(fila['horas_tareas'], 4))
+            for fila in self.Carga.search_read([('empleado_id', 'in', self.empleados.ids)], ['empleado_id', 'semana', 'horas_recursos', 'horas_tareas'])
+        )
+
+    def _comprobar_reconstruccion(self):
+        incremental = self._carga()
+        self.Carga._cron_reconstruir()
+        self.assertEqual(incremental, self._carga())
+        return incremental
+
+    def test_crear(self):
+        carga = self._comprobar_reconstruccion()
+        self.assertEqual(len({semana for _empleado, semana, _recursos, _tareas in carga}), 4)
+
+    def test_mover(self):
+        self.recurso.empleado_id = self.empleados[1]
+        self._comprobar_reconstruccion()
+        self.tarea.write({'fecha_inicio': self.lunes + timedelta(days=14), 'fecha_fin': self.lunes + timedelta(days=20)})
+        self._comprobar_reconstruccion()
+        self.proyecto.fecha_fin = self.lunes + timedelta(days=13)
+        self._comprobar_reconstruccion()
+        self.tarea.responsable_id = self.empleados[1]
+        self._comprobar_reconstruccion()
+
+    def test_borrar(self):
+        self.tarea.unlink()
+        self._comprobar_reconstruccion()
+        # El recurso sobrevive sin proyecto ni fechas: deja de cargar a sus empleados
+        self.proyecto.unlink()
+        self.assertTrue(self.recurso.exists())
+        self.assertEqual(self._comprobar_reconstruccion(), [])
+
+    def test_cambio_de_capacidad(self):
+        self.env['ir.config_parameter'].sudo().set_param('creativeminds.capacidad.sincronizar_disponibilidad', 'True')
+        primero = self.empleados[0]
+        self.Carga._sincronizar_disponibilidad(primero)
+        self.assertEqual(primero.disponibilidad, 'parcial')
+        primero.capacidad_semanal = 1
+        self.assertEqual(primero.disponibilidad, 'asignado')
+        primero.capacidad_semanal = 1000
+        self.assertEqual(primero.disponibilidad, 'parcial')
@@ -0,0 +1,47 @@
+from odoo.tests import TransactionCase  # Clase base de los tests de Odoo.
+
+
+class TestHistoricoKPI(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.responsable = cls.env['creativeminds.empleado'].create({
+            'name': 'Responsable',
+            'dni': '10000003C',
+            'partner_id': cls.env['res.partner'].create({'name': 'Responsable'}).id,
+        })
+        cls.proyecto = cls.env['creativeminds.proyecto'].create({
+            'nombre': 'Proyecto con histórico',
+            'responsable_id': cls.responsable.id,
+            'presupuesto_estimado': 100000,
+        })
+
+    def _indicador(self, metrica):
+        return self.proyecto.indicadores_ids.filtered(lambda indicador: indicador.metrica == metrica)
+
+    def _valores_muestras(self, indicador):
+        return self.env['creativeminds.kpi.muestra'].search([('kpi_id', '=', indicador.id)], order='id').mapped('valor')
+
+    def test_indicadores_automaticos(self):
+        self.assertEqual(sorted(self.proyecto.indicadores_ids.mapped('metrica')), ['costo_total_recursos', 'porcentaje_progreso'])
+        progreso = self._indicador('porcentaje_progreso')
+        self.assertEqual(self._valores_muestras(progreso), [0.0])
+
+        # El histórico no depende del nombre del indicador
+        progreso.nombre = 'Avance'
+        tareas = self.env['creativeminds.tarea'].create([
+            {'nombre': 'Hecha', 'proyecto_id': self.proyecto.id, 'estado': 'completada'},
+            {'nombre': 'Pendiente', 'proyecto_id': self.proyecto.id},
+        ])
+        self.assertEqual(progreso.valor, 50.0)
+        tareas[1].estado = 'completada'
+        self.assertEqual(progreso.valor, 100.0)
+        self.assertEqual(self._valores_muestras(progreso), [0.0, 50.0, 100.0])
+
+    def test_indicador_borrado_se_recrea(self):
+        self._indicador('porcentaje_progreso').unlink()
+        self.env['creativeminds.tarea'].create({'nombre': 'Hecha', 'proyecto_id': self.proyecto.id, 'estado': 'completada'})
+        progreso = self._indicador('porcentaje_progreso')
+        self.assertEqual(progreso.valor, 100.0)
+        self.assertEqual(self._valores_muestras(progreso), [100.0])
@@ -0,0 +1,42 @@
+from datetime import date  # Para las fechas de las filas importadas.
+
+from odoo.tests import TransactionCase  # Clase base de los tests de Odoo.
+
+
+class TestImportacion(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.responsable = cls.env['creativeminds.empleado'].create({
+            'name': 'Responsable',
+            'dni': '10000002B',
+            'partner_id': cls.env['res.partner'].create({'name': 'Responsable'}).id,
+        })
+        cls.proyecto = cls.env['creativeminds.proyecto'].create({
+            'responsable_id': cls.responsable.id,
+            'nombre': 'Proyecto importado',
+            'presupuesto_estimado': 100000,
+        })
+
+    def test_fichero_mixto(self):
+        # Filas como las devuelve openpyxl: fechas como date, texto o número (fecha serie de Excel)
+        filas = [
+            {'nombre': 'Válida con fecha', 'proyecto_id': 'Proyecto importado', 'fecha_inicio': date(2026, 1, 1), 'fecha_fin': '2026-01-10'},
+            {'nombre': 'Fecha numérica', 'proyecto_id': 'Proyecto importado', 'fecha_inicio': 45000},
+            {'nombre': 'Fecha decimal', 'fecha_fin': 45000.5},
+            {'nombre': 'Fecha no válida', 'fecha_inicio': '2026-13-40'},
+            {'descripcion': 'Sin nombre'},
+            {'nombre': 'Válida sin fechas', 'proyecto_id': float(self.proyecto.id)},
+        ]
+        resultado = self.env['creativeminds.importacion'].importar('creativeminds.tarea', filas)
+
+        self.assertEqual(resultado['filas'], 6)
+        self.assertEqual(resultado['creados'], 2)
+        self.assertEqual([error['fila'] for error in resultado['errores']], [3, 4, 5, 6])
+        self.assertIn('fecha_inicio', resultado['errores'][0]['mensaje'])
+        self.assertIn('fecha_fin', resultado['errores'][1]['mensaje'])
+        self.assertIn('obligatorio', resultado['errores'][3]['mensaje'])
+        tareas = self.env['creativeminds.tarea'].browse(resultado['ids'])
+        self.assertEqual(sorted(tareas.mapped('nombre')), ['Válida con fecha', 'Válida sin fechas'])
+        self.assertEqual(tareas.proyecto_id, self.proyecto)
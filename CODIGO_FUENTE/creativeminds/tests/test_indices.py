@@ -0,0 +1,22 @@
+import os  # Para leer el tamaño de la cartera sembrada desde el entorno.
+
+from odoo.tests import TransactionCase, tagged  # Clase base y etiquetas de los tests de Odoo.
+
+from odoo.addons.creativeminds.benchmarks import verificar_indices
+
+
+# Control de regresión de los índices: siembra una cartera de 100k tareas y comprueba con EXPLAIN que las consultas
+# de los filtros más usados recorren un índice de su tabla, y que la operación ORM equivalente no supera su
+# presupuesto de consultas. Los datos sembrados se deshacen con la transacción del test.
+# Sembrar y analizar la cartera es caro y con pocas filas el planificador prefiere recorrer la tabla, así que
+# '-standard' lo deja fuera de las ejecuciones normales y se lanza con --test-tags creativeminds_indices.
+# CREATIVEMINDS_INDICES_TAREAS cambia el tamaño de la cartera (100000 por defecto).
+@tagged('post_install', '-at_install', '-standard', 'creativeminds_indices')
+class TestIndices(TransactionCase):
+
+    def test_planes_de_consulta(self):
+        n_tareas = int(os.environ.get('CREATIVEMINDS_INDICES_TAREAS', 100000))
+        for resultado in verificar_indices.comprobar(self.env, n_tareas):
+            with self.subTest(resultado['nombre']):
+                self.assertIsNone(resultado['plan'], f"{resultado['nombre']}: {resultado['plan']}")
+                self.assertLessEqual(resultado['consultas'], resultado['presupuesto'])
@@ -0,0 +1,47 @@
+from datetime import date  # Para las fechas de las tareas.
+
+from odoo.tests import TransactionCase  # Clase base de los tests de Odoo.
+
+
+class TestPlanificacion(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.responsable = cls.env['creativeminds.empleado'].create({
+            'name': 'Responsable',
+            'dni': '10000001A',
+            'partner_id': cls.env['res.partner'].create({'name': 'Responsable'}).id,
+        })
+        cls.proyecto = cls.env['creativeminds.proyecto'].create({
+            'responsable_id': cls.responsable.id,
+            'nombre': 'Proyecto con dependencias',
+            'presupuesto_estimado': 100000,
+        })
+        # Cadena A (5 días) -> B (3 días, 2 de desfase) -> D (1 día), y C (2 días) en paralelo con holgura.
+        cls.tareas = cls.env['creativeminds.tarea'].create([{
+            'nombre': nombre,
+            'proyecto_id': cls.proyecto.id,
+            'fecha_inicio': date(2026, 1, 1),
+            'fecha_fin': date(2026, 1, dias),
+        } for nombre, dias in (('A', 5), ('B', 3), ('C', 2), ('D', 1))])
+        a, b, c, d = cls.tareas
+        cls.env['creativeminds.tarea.dependencia'].create([
+            {'predecesora_id': a.id, 'tarea_id': b.id, 'desfase': 2},
+            {'predecesora_id': b.id, 'tarea_id': d.id},
+            {'predecesora_id': a.id, 'tarea_id': c.id},
+        ])
+
+    # Duración y nombres de las tareas críticas de la planificación de un proyecto.
+    def _ruta_critica(self, proyecto):
+        planificacion = proyecto.obtener_planificacion()[proyecto.id]
+        return planificacion['duracion'], sorted(self.env['creativeminds.tarea'].browse(planificacion['criticas']).mapped('nombre'))
+
+    def test_ruta_critica(self):
+        self.assertEqual(self._ruta_critica(self.proyecto), (11, ['A', 'B', 'D']))
+
+    def test_duplicar_conserva_dependencias(self):
+        copia = self.proyecto._duplicar_en_lote()
+        self.assertEqual(len(copia.tareas_ids.dependencia_ids), 3)
+        self.assertFalse(copia.tareas_ids.dependencia_ids.predecesora_id - copia.tareas_ids, "Las dependencias deben enlazar las tareas de la copia")
+        self.assertEqual(self._ruta_critica(copia), self._ruta_critica(self.proyecto))
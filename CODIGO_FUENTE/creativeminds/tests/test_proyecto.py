@@ -0,0 +1,32 @@
+from datetime import timedelta  # Para las fechas de fin pasadas.
+
+from odoo import fields  # Para la fecha de hoy.
+from odoo.tests import TransactionCase  # Clase base de los tests de Odoo.
+
+
+class TestProyecto(TransactionCase):
+
+    def test_dominio_retrasados(self):
+        responsable = self.env['creativeminds.empleado'].create({
+            'name': 'Responsable',
+            'dni': '10000006F',
+            'partner_id': self.env['res.partner'].create({'name': 'Responsable'}).id,
+        })
+        Proyecto = self.env['creativeminds.proyecto']
+        abierto, sin_estado, finalizado, a_tiempo = Proyecto.create([{
+            'nombre': nombre,
+            'responsable_id': responsable.id,
+            'presupuesto_estimado': 1000,
+            'fecha_fin': fields.Date.today() + timedelta(days=dias),
+        } for nombre, dias in (('Abierto', -1), ('Sin estado', -1), ('Finalizado', -1), ('A tiempo', 1))])
+        # Estados que no se pueden alcanzar desde el formulario sin cumplir sus reglas: se fijan por SQL
+        Proyecto.flush_model()
+        self.env.cr.execute("UPDATE creativeminds_proyecto SET estado = NULL WHERE id = %s", [sin_estado.id])
+        self.env.cr.execute("UPDATE creativeminds_proyecto SET estado = 'finalizado' WHERE id = %s", [finalizado.id])
+        Proyecto.invalidate_model(['estado'])
+
+        retrasados = Proyecto.search(Proyecto._dominio_retrasados())
+        self.assertIn(abierto, retrasados)
+        self.assertIn(sin_estado, retrasados)
+        self.assertNotIn(finalizado, retrasados)
+        self.assertNotIn(a_tiempo, retrasados)
@@ -0,0 +1,2 @@
+from . import exportacion_wizard
+from . import importacion_wizard
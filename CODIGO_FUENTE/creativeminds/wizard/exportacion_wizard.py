@@ -0,0 +1,29 @@
+from odoo import models, fields  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
+from werkzeug.urls import url_encode  # Para construir la URL de descarga con los filtros.
+
+
+class ExportacionWizard(models.TransientModel):
+    _name = 'creativeminds.exportacion.wizard'
+    _description = 'Asistente de Exportación de la Cartera'
+
+    formato = fields.Selection([
+        ('csv', 'CSV'),
+        ('xlsx', 'Excel (XLSX)'),
+    ], string='Formato', default='csv', required=True)
+    estado = fields.Selection(selection=lambda self: self.env['creativeminds.proyecto']._fields['estado'].selection, string='Estado')  # Vacío: todos los estados
+    prioridad = fields.Selection(selection=lambda self: self.env['creativeminds.proyecto']._fields['prioridad'].selection, string='Prioridad')  # Vacío: todas las prioridades
+    fecha_desde = fields.Date(string='Inicio desde')  # Filtra por la fecha de inicio del proyecto
+    fecha_hasta = fields.Date(string='Inicio hasta')
+
+    # Lanza la descarga: el controlador escribe el fichero por lotes y lo envía en streaming.
+    def action_exportar(self):
+        self.ensure_one()
+        parametros = {'formato': self.formato}
+        for campo in ('estado', 'prioridad', 'fecha_desde', 'fecha_hasta'):
+            if self[campo]:
+                parametros[campo] = fields.Date.to_string(self[campo]) if campo.startswith('fecha') else self[campo]
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/creativeminds/exportar/proyectos?{url_encode(parametros)}',
+            'target': 'self',
+        }
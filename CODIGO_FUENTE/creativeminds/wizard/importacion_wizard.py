@@ -0,0 +1,45 @@
+from odoo import models, fields  # Importa los módulos necesarios de Odoo para la creación de modelos y campos.
+from odoo.exceptions import UserError  # Para generar errores personalizados en Odoo.
+import base64  # Para decodificar el fichero subido.
+
+
+class ImportacionWizard(models.TransientModel):
+    _name = 'creativeminds.importacion.wizard'
+    _description = 'Asistente de Importación Masiva'
+
+    modelo = fields.Selection([
+        ('creativeminds.tarea', 'Tareas'),
+        ('creativeminds.recurso', 'Recursos'),
+    ], string='Importar', default='creativeminds.tarea', required=True)
+    fichero = fields.Binary(string='Fichero (CSV o XLSX)', required=True)
+    nombre_fichero = fields.Char(string='Nombre del fichero')
+    tamano_lote = fields.Integer(string='Filas por lote', default=500)
+    estado = fields.Selection([
+        ('borrador', 'Borrador'),
+        ('hecho', 'Hecho'),
+    ], default='borrador')
+    resultado = fields.Text(string='Resultado', readonly=True)
+
+    def action_importar(self):
+        self.ensure_one()
+        if self.tamano_lote <= 0:
+            raise UserError("El número de filas por lote debe ser mayor que cero.")
+        resultado = self.env['creativeminds.importacion'].importar_fichero(
+            self.modelo, base64.b64decode(self.fichero), self.nombre_fichero, tamano_lote=self.tamano_lote,
+        )
+        lineas = [
+            f"Filas leídas: {resultado['filas']}",
+            f"Registros creados: {resultado['creados']}",
+            f"Errores: {len(resultado['errores'])}",
+            f"Rendimiento: {resultado['filas_por_segundo']} filas/s ({resultado['segundos']} s)",
+        ]
+        lineas += [f"Fila {error['fila']}: {error['mensaje']}" for error in resultado['errores']]
+        self.write({'estado': 'hecho', 'resultado': '\n'.join(lineas)})
+        # Volvemos a abrir el asistente para mostrar el resultado
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }